@@ -25,6 +25,10 @@ if config.config_file_name is not None:
 from app.db.database import Base
 from app.models.person import Person
 from app.models.profession import Profession
+from app.models.person_stats import PersonStatsProfession, PersonStatsBirthDate, PersonStatsMonth
+from app.models.job_run import JobRun
+from app.models.import_job import ImportJob
+from app.models.photo_file import PhotoFile
 
 target_metadata = Base.metadata
 
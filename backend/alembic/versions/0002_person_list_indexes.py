@@ -0,0 +1,37 @@
+"""Composite indexes for filtering and sorting the persons list
+
+Revision ID: 0002_person_list_indexes
+Revises: 0001_initial_setup
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_person_list_indexes'
+down_revision: Union[str, None] = '0001_initial_setup'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Cada índice termina en id para servir tanto el filtro como la paginación keyset
+PERSON_INDEXES = [
+    ('ix_persons_profession_id_id', ['profession_id', 'id']),
+    ('ix_persons_profession_id_created_at', ['profession_id', 'created_at', 'id']),
+    ('ix_persons_profession_id_birth_date', ['profession_id', 'birth_date', 'id']),
+    ('ix_persons_created_at_id', ['created_at', 'id']),
+    ('ix_persons_birth_date_id', ['birth_date', 'id']),
+    ('ix_persons_last_name_id', ['last_name', 'id']),
+    ('ix_persons_first_name_id', ['first_name', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in PERSON_INDEXES:
+        op.create_index(name, 'persons', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(PERSON_INDEXES):
+        op.drop_index(name, table_name='persons')
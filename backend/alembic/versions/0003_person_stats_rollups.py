@@ -0,0 +1,57 @@
+"""Rollup tables for the persons dashboard
+
+Revision ID: 0003_person_stats_rollups
+Revises: 0002_person_list_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_person_stats_rollups'
+down_revision: Union[str, None] = '0002_person_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('person_stats_profession',
+        sa.Column('profession_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['profession_id'], ['professions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('profession_id')
+    )
+    op.create_table('person_stats_birth_date',
+        sa.Column('birth_date', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('birth_date')
+    )
+    op.create_table('person_stats_month',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('month')
+    )
+
+    # Cargar los resúmenes con los datos existentes
+    op.execute("""
+        INSERT INTO person_stats_profession (profession_id, count)
+        SELECT profession_id, count(*) FROM persons GROUP BY profession_id
+    """)
+    op.execute("""
+        INSERT INTO person_stats_birth_date (birth_date, count)
+        SELECT birth_date, count(*) FROM persons GROUP BY birth_date
+    """)
+    op.execute("""
+        INSERT INTO person_stats_month (month, count)
+        SELECT date_trunc('month', created_at)::date, count(*) FROM persons
+        WHERE created_at IS NOT NULL
+        GROUP BY date_trunc('month', created_at)::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('person_stats_month')
+    op.drop_table('person_stats_birth_date')
+    op.drop_table('person_stats_profession')
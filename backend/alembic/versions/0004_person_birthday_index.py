@@ -0,0 +1,36 @@
+"""Birthday index and job_runs table for the daily age recompute
+
+Revision ID: 0004_person_birthday_index
+Revises: 0003_person_stats_rollups
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_person_birthday_index'
+down_revision: Union[str, None] = '0003_person_stats_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Las mismas expresiones que genera extract() en PersonRepository.refresh_birthday_ages
+    op.create_index(
+        'ix_persons_birthday', 'persons',
+        [sa.text('EXTRACT(month FROM birth_date)'), sa.text('EXTRACT(day FROM birth_date)')],
+        unique=False
+    )
+    op.create_table('job_runs',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_run_date', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_runs')
+    op.drop_index('ix_persons_birthday', table_name='persons')
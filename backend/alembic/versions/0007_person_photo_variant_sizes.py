@@ -0,0 +1,25 @@
+"""Photo variant sizes generated for each person's photo
+
+Revision ID: 0007_person_photo_variant_sizes
+Revises: 0006_photo_files
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_person_photo_variant_sizes'
+down_revision: Union[str, None] = '0006_photo_files'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Las fotos existentes quedan en NULL hasta que app.jobs.generate_photo_variants genere sus derivadas
+    op.add_column('persons', sa.Column('photo_variant_sizes', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('persons', 'photo_variant_sizes')
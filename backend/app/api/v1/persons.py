@@ -1,8 +1,15 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+import json
+from datetime import date, datetime
+from typing import Callable, List, Optional, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal, get_async_db, get_async_read_db, get_read_session_factory
+from app.core.streaming import DuplexStreamingResponse
 from app.use_cases.person_use_case import PersonUseCase
+from app.use_cases.person_import_use_case import PersonImportUseCase
 from app.schemas.person_request_response import (
     PersonCreateRequest,
     PersonUpdateRequest,
@@ -10,11 +17,75 @@ from app.schemas.person_request_response import (
     PersonCreateResponse,
     PersonUpdateResponse,
     PersonDeleteResponse,
-    PersonListResponse
+    PersonListResponse,
+    PersonPageResponse,
+    PersonListFilters,
+    PersonImportJobResponse,
+    PersonPatchRequest,
+    PersonBulkUpdateRequest,
+    PersonBulkDeleteRequest,
+    PersonBulkResponse,
+    PERSON_RESPONSE_FIELDS
 )
 
 router = APIRouter()
 person_use_case = PersonUseCase()
+import_use_case = PersonImportUseCase()
+
+
+def get_person_list_filters(
+    profession_id: Optional[int] = Query(None, description="Filtrar por ID de profesión"),
+    min_age: Optional[int] = Query(None, description="Edad mínima"),
+    max_age: Optional[int] = Query(None, description="Edad máxima"),
+    birth_date_from: Optional[date] = Query(None, description="Fecha de nacimiento desde (YYYY-MM-DD)"),
+    birth_date_to: Optional[date] = Query(None, description="Fecha de nacimiento hasta (YYYY-MM-DD)"),
+    created_from: Optional[datetime] = Query(None, description="Fecha de registro desde"),
+    created_to: Optional[datetime] = Query(None, description="Fecha de registro hasta"),
+    sort: str = Query("id", description="Ordenamiento: id, first_name, last_name, birth_date, age, created_at (prefijo '-' para descendente)")
+) -> PersonListFilters:
+    """
+    Construye los filtros del listado de personas a partir de los parámetros de consulta
+    """
+    try:
+        return PersonListFilters(
+            profession_id=profession_id,
+            min_age=min_age,
+            max_age=max_age,
+            birth_date_from=birth_date_from,
+            birth_date_to=birth_date_to,
+            created_from=created_from,
+            created_to=created_to,
+            sort=sort
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# En fields= también se acepta la clave con la que se publica cada campo (p. ej. "profession.name")
+PERSON_FIELD_ALIASES = {
+    PersonResponse.model_fields[field].alias: field
+    for field in PERSON_RESPONSE_FIELDS
+    if PersonResponse.model_fields[field].alias
+}
+
+
+def get_person_fields(
+    fields: Optional[str] = Query(None, description="Campos a retornar separados por coma, ej: first_name,last_name,age")
+) -> Optional[List[str]]:
+    """
+    Valida la lista de campos solicitados (sparse fieldsets)
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    requested = [PERSON_FIELD_ALIASES.get(field, field) for field in requested]
+    invalid = [field for field in requested if field not in PERSON_RESPONSE_FIELDS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no permitidos: {', '.join(invalid)}. Use: {', '.join(PERSON_RESPONSE_FIELDS)}"
+        )
+    return list(dict.fromkeys(requested)) or None
 
 
 @router.post("/", response_model=PersonCreateResponse)
@@ -26,7 +97,7 @@ async def create_person(
     address: str = Form(...),
     phone: str = Form(...),
     photo: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Crear una nueva persona
@@ -41,44 +112,91 @@ async def create_person(
             phone=phone
         )
         
-        created_person = await person_use_case.create_person(db, person_data, photo)
+        person_id = await person_use_case.create_person(db, person_data, photo)
         
         return PersonCreateResponse(
-            id=created_person.id,
+            id=person_id,
             message="Persona creada exitosamente",
             success=True
         )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 
-@router.get("/", response_model=List[PersonResponse])
+@router.get("/", response_model=Union[List[PersonResponse], PersonPageResponse])
 async def get_all_persons(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: bool = Query(False, description="Usar paginación por cursor en lugar de skip/limit"),
+    after: Optional[str] = Query(None, description="Valor next_cursor de la página anterior"),
+    filters: PersonListFilters = Depends(get_person_list_filters),
+    fields: Optional[List[str]] = Depends(get_person_fields),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Obtener todas las personas
+
+    Con cursor=true (o enviando after) se usa paginación keyset y la respuesta
+    incluye next_cursor; skip/limit se mantiene como modo heredado.
+    Con fields solo se consultan y retornan las columnas solicitadas.
     """
     try:
-        persons = person_use_case.get_all_persons(db, skip, limit)
+        if cursor or after:
+            page = await person_use_case.get_persons_page(db, limit, after, filters, fields)
+            return JSONResponse(content=jsonable_encoder(page)) if fields else page
+        persons = await person_use_case.get_all_persons(db, skip, limit, filters, fields)
+        if fields:
+            return JSONResponse(content=jsonable_encoder(persons))
         return persons
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 
+@router.get("/export")
+async def export_persons(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Formato de exportación: csv o ndjson"),
+    gzip: bool = Query(False, description="Comprimir la descarga con gzip"),
+    filters: PersonListFilters = Depends(get_person_list_filters),
+    fields: Optional[List[str]] = Depends(get_person_fields),
+    session_factory: Callable = Depends(get_read_session_factory)
+):
+    """
+    Exportar personas en CSV o NDJSON
+
+    Las filas se leen con un cursor del lado del servidor y se envían por bloques,
+    por lo que la memoria usada no depende del tamaño de la tabla.
+    """
+    export_service = person_use_case.export_service
+    content = person_use_case.export_persons(session_factory, format, filters, fields, gzip)
+    filename = export_service.filename("persons", format, gzip)
+    return StreamingResponse(
+        content,
+        media_type=export_service.media_type(format, gzip),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{person_id}", response_model=PersonResponse)
-async def get_person(person_id: int, db: Session = Depends(get_db)):
+async def get_person(
+    person_id: int,
+    fields: Optional[List[str]] = Depends(get_person_fields),
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Obtener una persona por ID
     """
     try:
-        person = person_use_case.get_person(db, person_id)
+        person = await person_use_case.get_person(db, person_id, fields)
         if not person:
             raise HTTPException(status_code=404, detail="Persona no encontrada")
+        if fields:
+            return JSONResponse(content=jsonable_encoder(person))
         return person
     except HTTPException:
         raise
@@ -96,7 +214,7 @@ async def update_person(
     address: str = Form(...),
     phone: str = Form(...),
     photo: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Actualizar una persona
@@ -111,8 +229,8 @@ async def update_person(
             phone=phone
         )
         
-        updated_person = await person_use_case.update_person(db, person_id, person_data, photo)
-        if not updated_person:
+        updated = await person_use_case.update_person(db, person_id, person_data.model_dump(), photo)
+        if not updated:
             raise HTTPException(status_code=404, detail="Persona no encontrada")
         
         return PersonUpdateResponse(
@@ -127,13 +245,61 @@ async def update_person(
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 
+@router.patch("/{person_id}", response_model=PersonUpdateResponse)
+async def patch_person(
+    person_id: int,
+    first_name: Optional[str] = Form(None),
+    last_name: Optional[str] = Form(None),
+    birth_date: Optional[str] = Form(None),
+    profession_id: Optional[int] = Form(None),
+    address: Optional[str] = Form(None),
+    phone: Optional[str] = Form(None),
+    photo: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualizar solo los campos enviados de una persona
+
+    Solo se escriben las columnas que cambian; si ninguna cambia no se escribe nada.
+    """
+    try:
+        provided = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "birth_date": birth_date,
+            "profession_id": profession_id,
+            "address": address,
+            "phone": phone
+        }
+        # Solo se validan los campos enviados
+        person_data = PersonPatchRequest(**{key: value for key, value in provided.items() if value is not None})
+        values = person_data.model_dump(exclude_none=True)
+        if not values and not photo:
+            raise ValueError("Indique al menos un campo a actualizar")
+
+        updated = await person_use_case.update_person(db, person_id, values, photo)
+        if not updated:
+            raise HTTPException(status_code=404, detail="Persona no encontrada")
+
+        return PersonUpdateResponse(
+            success=True,
+            message="Persona actualizada exitosamente"
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+
 @router.delete("/{person_id}", response_model=PersonDeleteResponse)
-async def delete_person(person_id: int, db: Session = Depends(get_db)):
+async def delete_person(person_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Eliminar una persona
     """
     try:
-        success = person_use_case.delete_person(db, person_id)
+        success = await person_use_case.delete_person(db, person_id)
         if not success:
             raise HTTPException(status_code=404, detail="Persona no encontrada")
         
@@ -151,132 +317,143 @@ async def delete_person(person_id: int, db: Session = Depends(get_db)):
 async def create_multiple_persons(
     persons_data: str = Form(..., description="JSON con los datos de las personas"),
     photos: List[UploadFile] = File(default=[]),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Crear múltiples personas a la vez
+
+    Se validan todas las filas antes de insertar; si alguna es inválida no se crea ninguna.
     """
     try:
-        import json
-        
-        # Parsear los datos JSON
         persons_list = json.loads(persons_data)
-        
-        created_persons = []
-        for i, person_data in enumerate(persons_list):
-            # Crear el request para cada persona
-            person_request = PersonCreateRequest(
-                first_name=person_data["first_name"],
-                last_name=person_data["last_name"],
-                birth_date=person_data["birth_date"],
-                profession_id=person_data["profession_id"],
-                address=person_data["address"],
-                phone=person_data["phone"]
-            )
-            
-            # Obtener la foto correspondiente si existe
-            photo = photos[i] if i < len(photos) else None
-            
-            # Crear la persona
-            created_person = await person_use_case.create_person(db, person_request, photo)
-            created_persons.append(created_person)
-        
-        return created_persons
-        
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Formato JSON inválido en persons_data")
-    except IndexError as e:
-        raise HTTPException(status_code=400, detail="Número de fotos no coincide con número de personas")
+    if not isinstance(persons_list, list):
+        raise HTTPException(status_code=400, detail="persons_data debe ser una lista de personas")
+
+    person_requests = []
+    errors = []
+    for i, person_data in enumerate(persons_list):
+        if not isinstance(person_data, dict):
+            errors.append(f"Persona {i + 1}: debe ser un objeto")
+            continue
+        try:
+            person_requests.append(PersonCreateRequest(**person_data))
+        except ValidationError as e:
+            messages = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+            errors.append(f"Persona {i + 1}: {messages}")
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    try:
+        return await person_use_case.create_persons(db, person_requests, photos)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+
+@router.post("/bulk/update", response_model=PersonBulkResponse)
+async def bulk_update_persons(bulk_data: PersonBulkUpdateRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Actualizar varias personas a la vez
+
+    Los campos de values se asignan a las personas de ids o a las que cumplen filters
+    (mismos filtros del listado) con un solo UPDATE en una transacción.
+    """
+    try:
+        affected = await person_use_case.update_persons(db, bulk_data)
+        return PersonBulkResponse(affected=affected, message=f"{affected} personas actualizadas")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+
+@router.post("/bulk/delete", response_model=PersonBulkResponse)
+async def bulk_delete_persons(bulk_data: PersonBulkDeleteRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)):
+    """
+    Eliminar varias personas por ID con un solo DELETE; las fotos se borran en segundo plano
+    """
+    try:
+        affected = await person_use_case.delete_persons(db, bulk_data.ids, background_tasks)
+        return PersonBulkResponse(affected=affected, message=f"{affected} personas eliminadas")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+
+@router.post("/import", response_model=PersonImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_persons(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Archivo CSV o XLSX con encabezado"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Importar personas desde un archivo CSV o XLSX
+
+    Columnas: first_name, last_name, birth_date, address, phone y profession_name
+    (o profession_id). El archivo se procesa en segundo plano; la respuesta trae el
+    job_id para consultar el avance en /persons/import/{job_id}.
+    """
+    try:
+        return await import_use_case.start_import(db, file, background_tasks)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 
+@router.post("/ingest")
+async def ingest_persons(
+    request: Request,
+    report: str = Query("all", pattern="^(all|errors)$", description="all: una línea por persona; errors: solo errores y avance por bloque")
+):
+    """
+    Ingerir personas desde un cuerpo NDJSON (una persona por línea, mismos campos que /batch)
+
+    El cuerpo se lee como stream y cada bloque de INGEST_COMMIT_ROWS líneas se valida, se
+    inserta con un solo INSERT y se confirma; los resultados se envían como NDJSON a medida
+    que avanza, por lo que la memoria no depende del tamaño del envío. Con report=all el
+    cliente debe leer la respuesta mientras envía el cuerpo.
+    """
+    content = import_use_case.ingest_ndjson(AsyncSessionLocal, request.stream(), report_created=report == "all")
+    return DuplexStreamingResponse(content, media_type="application/x-ndjson")
+
+
+@router.get("/import/{job_id}", response_model=PersonImportJobResponse)
+async def get_import_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Consultar el avance de una importación: filas procesadas, throughput y errores por fila
+    """
+    try:
+        job = await import_use_case.get_import_job(db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Importación no encontrada")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
+
 @router.get("/stats/dashboard")
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Obtener estadísticas para el dashboard
+
+    Responde con ETag; si el cliente envía If-None-Match con el mismo valor se retorna 304.
+    La caché es compartida por todos los clientes, así que se llena desde el primario: una
+    réplica atrasada dejaría estadísticas viejas hasta que venza STATS_CACHE_TTL_SECONDS.
     """
     try:
-        from sqlalchemy import func, extract
-        from app.models.person import Person
-        from app.models.profession import Profession
-        from datetime import datetime, timedelta
-        import calendar
-        
-        # Total de personas
-        total_persons = db.query(Person).count()
-        total_professions = db.query(Profession).count()
-        
-        # Distribución por profesiones
-        profession_stats = db.query(
-            Profession.name.label('profession_name'),
-            func.count(Person.id).label('count')
-        ).outerjoin(Person).group_by(Profession.id, Profession.name).all()
-        
-        profession_distribution = [
-            {"profession_name": stat.profession_name, "count": stat.count}
-            for stat in profession_stats
-        ]
-        
-        # Distribución por rangos de edad
-        today = datetime.now().date()
-        age_ranges = []
-        
-        # Obtener todas las personas con sus fechas de nacimiento
-        persons = db.query(Person.birth_date).all()
-        
-        ranges = {"0-18": 0, "19-35": 0, "36-60": 0, "60+": 0}
-        
-        for person in persons:
-            if person.birth_date:
-                age = today.year - person.birth_date.year
-                if today < person.birth_date.replace(year=today.year):
-                    age -= 1
-                
-                if age <= 18:
-                    ranges["0-18"] += 1
-                elif age <= 35:
-                    ranges["19-35"] += 1
-                elif age <= 60:
-                    ranges["36-60"] += 1
-                else:
-                    ranges["60+"] += 1
-        
-        age_distribution = [
-            {"range": range_name, "count": count}
-            for range_name, count in ranges.items()
-        ]
-        
-        # Registros por mes (últimos 12 meses)
-        monthly_stats = []
-        current_date = datetime.now()
-        
-        for i in range(12):
-            month_date = current_date - timedelta(days=30 * i)
-            month_name = calendar.month_name[month_date.month]
-            year = month_date.year
-            
-            count = db.query(Person).filter(
-                extract('month', Person.created_at) == month_date.month,
-                extract('year', Person.created_at) == year
-            ).count()
-            
-            monthly_stats.append({
-                "month": f"{month_name} {year}",
-                "count": count
-            })
-        
-        monthly_stats.reverse()  # Mostrar en orden cronológico
-        
-        return {
-            "total_persons": total_persons,
-            "total_professions": total_professions,
-            "profession_distribution": profession_distribution,
-            "age_distribution": age_distribution,
-            "monthly_registrations": monthly_stats
-        }
-        
+        entry = await person_use_case.get_dashboard_stats(db)
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in [tag.strip() for tag in if_none_match.split(",")]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return JSONResponse(content=entry.value, headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
+
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db, get_async_read_db
 from app.use_cases.profession_use_case import ProfessionUseCase
 from app.schemas.profession_request_response import (
     ProfessionCreate,
@@ -17,7 +17,7 @@ router = APIRouter()
 async def get_professions(
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(50, ge=1, le=100, description="Tamaño de página"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Obtener lista de profesiones con paginación."""
     profession_use_case = ProfessionUseCase(db)
@@ -25,7 +25,7 @@ async def get_professions(
 
 @router.get("/all", response_model=List[ProfessionResponse])
 async def get_all_professions(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Obtener todas las profesiones para selectores."""
     profession_use_case = ProfessionUseCase(db)
@@ -34,7 +34,7 @@ async def get_all_professions(
 @router.get("/search", response_model=List[ProfessionResponse])
 async def search_professions(
     query: str = Query(..., min_length=1, description="Término de búsqueda"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Buscar profesiones por nombre."""
     profession_use_case = ProfessionUseCase(db)
@@ -43,7 +43,7 @@ async def search_professions(
 @router.post("/", response_model=ProfessionResponse, status_code=201)
 async def create_profession(
     profession_data: ProfessionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Crear una nueva profesión."""
     profession_use_case = ProfessionUseCase(db)
@@ -55,7 +55,7 @@ async def create_profession(
 @router.get("/{profession_id}", response_model=ProfessionResponse)
 async def get_profession(
     profession_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Obtener una profesión por ID."""
     profession_use_case = ProfessionUseCase(db)
@@ -68,7 +68,7 @@ async def get_profession(
 async def update_profession(
     profession_id: int,
     profession_data: ProfessionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Actualizar una profesión."""
     profession_use_case = ProfessionUseCase(db)
@@ -82,7 +82,7 @@ async def update_profession(
 @router.delete("/{profession_id}", status_code=204)
 async def delete_profession(
     profession_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Eliminar una profesión."""
     profession_use_case = ProfessionUseCase(db)
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+from app.core.config import settings
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    etag: str
+    generation: int
+    expires_at: float
+
+
+def compute_etag(value: Any) -> str:
+    """
+    ETag fuerte a partir del contenido, igual en todos los workers para los mismos datos
+    """
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8")
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+class GenerationCache:
+    """
+    Caché en memoria con TTL e invalidación por generación
+
+    Cada escritura llama a invalidate(), que incrementa la generación: las entradas
+    guardadas con una generación anterior dejan de servirse aunque no haya vencido
+    su TTL. Quien calcula un valor debe leer `generation` antes de calcularlo, así una
+    escritura concurrente invalida también ese resultado. Entre procesos (varios
+    workers) no se comparte la generación y el TTL acota cuánto puede atrasarse.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._generation = 0
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.generation != self._generation or entry.expires_at <= time.monotonic():
+            return None
+        return entry
+
+    def set(self, key: str, value: Any, generation: int) -> CacheEntry:
+        entry = CacheEntry(value, compute_etag(value), generation, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            if self.ttl_seconds > 0 and generation == self._generation:
+                self._entries[key] = entry
+        return entry
+
+
+# Estadísticas del dashboard; las escrituras de personas y profesiones la invalidan
+DASHBOARD_STATS_KEY = "persons:dashboard"
+stats_cache = GenerationCache(settings.stats_cache_ttl_seconds)
@@ -18,6 +18,30 @@ class Settings(BaseSettings):
     postgres_host: str = os.getenv("POSTGRES_HOST", "localhost")
     postgres_port: int = int(os.getenv("POSTGRES_PORT", "5432"))
 
+    # Optional read replica; reads stay on the primary for a short window after a write
+    database_read_url: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    read_your_writes_seconds: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+
+    # Connection pool (per worker process)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # segundos esperando una conexión libre
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # segundos antes de reciclar una conexión
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 = sin límite
+
+    # In-process cache for dashboard stats
+    stats_cache_ttl_seconds: int = int(os.getenv("STATS_CACHE_TTL_SECONDS", "30"))  # 0 = sin caché
+
+    # Person imports from CSV/XLSX (background jobs)
+    import_chunk_size: int = int(os.getenv("IMPORT_CHUNK_SIZE", "2000"))  # filas por bloque de validación
+    import_workers: int = int(os.getenv("IMPORT_WORKERS", "0"))  # procesos de validación, 0 = núcleos disponibles
+    import_max_file_size: int = int(os.getenv("IMPORT_MAX_FILE_SIZE", "52428800"))  # 50MB
+
+    # NDJSON ingestion (streamed request body)
+    ingest_commit_rows: int = int(os.getenv("INGEST_COMMIT_ROWS", "1000"))  # filas por INSERT y commit
+    ingest_max_line_bytes: int = int(os.getenv("INGEST_MAX_LINE_BYTES", "65536"))
+
     # JWT configuration
     secret_key: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-in-production")
     algorithm: str = os.getenv("ALGORITHM", "HS256")
@@ -27,6 +51,11 @@ class Settings(BaseSettings):
     upload_dir: str = os.getenv("UPLOAD_DIR", "./uploads")
     max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "5242880"))  # 5MB
 
+    # Photo derivatives (resized WebP copies generated at upload time)
+    photo_variant_sizes_raw: str = os.getenv("PHOTO_VARIANT_SIZES", "64,256,1024")  # lado máximo en px
+    photo_variant_quality: int = int(os.getenv("PHOTO_VARIANT_QUALITY", "80"))
+    image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))  # procesos para generar las derivadas
+
     # CORS configuration
     allowed_origins_raw: Optional[str] = os.getenv(
         "ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000,http://localhost:5173,http://localhost:5174,http://localhost:4173"
@@ -36,6 +65,11 @@ class Settings(BaseSettings):
     environment: str = os.getenv("ENVIRONMENT", "development")
     log_level: Optional[str] = os.getenv("LOG_LEVEL", None)
 
+    # Event loop monitoring (opt-in)
+    loop_monitor_enabled: bool = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() in ("1", "true", "yes")
+    loop_monitor_interval_ms: int = int(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+    loop_block_threshold_ms: int = int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+
     # Pydantic v2 settings config; fall back to v1-style Config for older versions
     if SettingsConfigDict is not None:  # pydantic-settings v2
         model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -44,6 +78,10 @@ class Settings(BaseSettings):
             env_file = ".env"
             extra = "ignore"
 
+    @property
+    def photo_variant_sizes(self) -> List[int]:
+        return sorted({int(size) for size in self.photo_variant_sizes_raw.split(",") if size.strip()})
+
     @property
     def allowed_origins_list(self) -> List[str]:
         v = self.allowed_origins_raw
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger("app.loop_monitor")
+
+
+class EventLoopMonitor:
+    """
+    Mide el retraso (lag) del event loop y detecta callbacks que lo bloquean
+
+    Una tarea asíncrona duerme `interval` segundos y registra cuánto tarde despierta.
+    Un hilo vigilante revisa que esa tarea siga despertando a tiempo: si el loop lleva
+    más de `threshold` segundos sin atenderla, registra la ruta en curso y el stack del
+    hilo del loop, que apunta directamente al código que lo está bloqueando.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, max_samples: int = 1000):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = deque(maxlen=max_samples)
+        self.max_lag = 0.0
+        self.blocked_total = 0
+        self.max_blocked = 0.0
+        self._routes = weakref.WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Inicia el muestreo; debe llamarse desde el event loop (por ejemplo en el lifespan)
+        """
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def track_request(self, route: str) -> None:
+        """
+        Asocia la tarea actual con la ruta que atiende, para reportarla si bloquea el loop
+        """
+        task = asyncio.current_task()
+        if task is not None:
+            self._routes[task] = route
+
+    def snapshot(self) -> dict:
+        samples = sorted(self.samples)
+        count = len(samples)
+        return {
+            "enabled": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "threshold_ms": round(self.threshold * 1000, 3),
+            "samples": count,
+            "lag_ms_last": round(self.samples[-1] * 1000, 3) if count else 0.0,
+            "lag_ms_avg": round(sum(samples) / count * 1000, 3) if count else 0.0,
+            "lag_ms_p99": round(samples[min(count - 1, int(count * 0.99))] * 1000, 3) if count else 0.0,
+            "lag_ms_max": round(self.max_lag * 1000, 3),
+            "blocked_total": self.blocked_total,
+            "blocked_ms_max": round(self.max_blocked * 1000, 3),
+        }
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            self._last_beat = expected
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.max_blocked = max(self.max_blocked, lag)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat
+            if overdue > self.threshold and beat != reported_beat:
+                reported_beat = beat
+                self.blocked_total += 1
+                self._report(overdue)
+
+    def _report(self, overdue: float) -> None:
+        route = "sin ruta (tarea de fondo)"
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        if task is not None:
+            route = self._routes.get(task, route)
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "stack no disponible"
+        logger.warning(
+            "Event loop bloqueado por más de %.1f ms en %s\n%s",
+            overdue * 1000, route, stack
+        )
+
+
+class LoopMonitorMiddleware:
+    """
+    Middleware ASGI que registra qué ruta atiende cada tarea del event loop
+
+    Se implementa como middleware ASGI puro para que la ruta corra en la misma tarea.
+    """
+
+    def __init__(self, app, monitor: EventLoopMonitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.monitor.track_request(f"{scope['method']} {scope['path']}")
+        await self.app(scope, receive, send)
@@ -0,0 +1,26 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Codifica la posición de la última fila de una página en un token opaco
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Decodifica un token generado por encode_cursor
+    """
+    padding = "=" * (-len(token) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + padding).decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Cursor de paginación inválido")
+    if not isinstance(data, dict) or not isinstance(data.get("id"), int):
+        raise ValueError("Cursor de paginación inválido")
+    return data
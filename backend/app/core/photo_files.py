@@ -0,0 +1,132 @@
+import os
+import re
+from email.utils import formatdate
+from typing import Optional, Sequence, Tuple
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+# Los nombres de las fotos no cambian de contenido: se guardan por hash o con un uuid
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SHA256_STEM = re.compile(r"^[0-9a-f]{64}$")
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def photo_etag(path: str, stat_result: os.stat_result) -> str:
+    """
+    ETag fuerte: el SHA-256 para las fotos guardadas por contenido, o fecha de modificación y tamaño
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if SHA256_STEM.match(stem):
+        return f'"{stem}"'
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (inicio, fin inclusive) de un Range de un solo intervalo, o None si se debe ignorar
+
+    Varios intervalos o un valor mal formado se ignoran y se responde el archivo completo.
+    Un intervalo que empieza después del final retorna un inicio >= size (416).
+    """
+    match = BYTE_RANGE.match(header.strip())
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        return (max(size - suffix, 0), size - 1) if suffix else (size, size)
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    return start, end
+
+
+class PhotoFileResponse(FileResponse):
+    """
+    FileResponse para un intervalo del archivo que usa envío sin copia cuando el servidor lo ofrece
+
+    Con la extensión ASGI http.response.pathsend o http.response.zerocopy el servidor envía el
+    archivo con sendfile; si no, se lee por bloques igual que FileResponse.
+    """
+
+    def __init__(self, path: str, stat_result: os.stat_result, method: str, headers: dict, byte_range: Optional[Tuple[int, int]] = None):
+        super().__init__(path, status_code=206 if byte_range else 200, headers=headers, stat_result=stat_result, method=method)
+        self.byte_range = byte_range or (0, stat_result.st_size - 1)
+        start, end = self.byte_range
+        self.headers["content-length"] = str(end - start + 1)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {start}-{end}/{stat_result.st_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        start, end = self.byte_range
+        count = end - start + 1
+        extensions = scope.get("extensions") or {}
+        if self.send_header_only or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif self.status_code == 200 and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+        elif "http.response.zerocopy" in extensions:
+            with open(self.path, "rb") as file:
+                await send({"type": "http.response.zerocopy", "file": file, "offset": start, "count": count, "more_body": False})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                while count > 0:
+                    chunk = await file.read(min(self.chunk_size, count))
+                    if not chunk:
+                        break
+                    count -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": count > 0})
+                if count > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+
+class PhotoStaticFiles(StaticFiles):
+    """
+    Sirve /uploads con caché inmutable, ETag fuerte, respuestas 304 y peticiones Range
+
+    private_dirs son subdirectorios que no se publican (p. ej. las subidas en curso).
+    """
+
+    def __init__(self, *args, private_dirs: Sequence[str] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.private_dirs = tuple(private_dirs)
+
+    def get_path(self, scope: Scope) -> str:
+        path = super().get_path(scope)
+        if path.replace(os.sep, "/").split("/", 1)[0] in self.private_dirs:
+            raise HTTPException(status_code=404)
+        return path
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        etag = photo_etag(str(full_path), stat_result)
+        headers = {
+            "etag": etag,
+            "cache-control": PHOTO_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        }
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200 and request_headers.get("if-range", etag) == etag:
+            byte_range = parse_byte_range(range_header, stat_result.st_size)
+            if byte_range is not None and byte_range[0] >= stat_result.st_size:
+                headers["content-range"] = f"bytes */{stat_result.st_size}"
+                return Response(status_code=416, headers=headers)
+        return PhotoFileResponse(str(full_path), stat_result, scope["method"], headers, byte_range)
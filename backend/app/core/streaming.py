@@ -0,0 +1,17 @@
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse para rutas que siguen leyendo el cuerpo de la petición mientras responden
+
+    StreamingResponse escucha la desconexión del cliente leyendo receive() en paralelo, lo que
+    le quitaría al generador los bloques del cuerpo. Aquí solo se envía el stream; si el cliente
+    se desconecta, request.stream() lanza ClientDisconnect dentro del generador.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -1,14 +1,80 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from app.db.read_your_writes import has_recent_write
 
-# Ensure UTF-8 client encoding when connecting to PostgreSQL
-engine = create_engine(settings.database_url, connect_args={"client_encoding": "utf8"} if settings.database_url.startswith("postgresql") else {})
+
+def get_async_database_url(url: str) -> str:
+    """
+    Convierte la URL síncrona en su equivalente con driver asíncrono (asyncpg / aiosqlite)
+    """
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def get_engine_options(url: str, use_async: bool = False) -> dict:
+    """
+    Opciones de pool y conexión a partir de Settings
+    """
+    if url.startswith("sqlite"):
+        # SQLite usa su propio pool por defecto; las opciones de tamaño no aplican
+        return {}
+
+    options = {
+        "poolclass": TimedAsyncAdaptedQueuePool if use_async else TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.startswith("postgres"):
+        timeout = settings.db_statement_timeout_ms
+        if use_async:
+            server_settings = {"statement_timeout": str(timeout)} if timeout else {}
+            options["connect_args"] = {"server_settings": server_settings}
+        else:
+            # Ensure UTF-8 client encoding when connecting to PostgreSQL
+            connect_args = {"client_encoding": "utf8"}
+            if timeout:
+                connect_args["options"] = f"-c statement_timeout={timeout}"
+            options["connect_args"] = connect_args
+    return options
+
+
+def create_async_engine_for(url: str):
+    async_url = get_async_database_url(url)
+    return create_async_engine(async_url, **get_engine_options(async_url, use_async=True))
+
+
+engine = create_engine(settings.database_url, **get_engine_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Motor asíncrono para las rutas: las esperas a la base de datos no bloquean el event loop
+async_engine = create_async_engine_for(settings.database_url)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Réplica de lectura opcional; sin DATABASE_READ_URL las lecturas usan el primario
+if settings.database_read_url:
+    read_engine = create_engine(settings.database_read_url, **get_engine_options(settings.database_read_url))
+    async_read_engine = create_async_engine_for(settings.database_read_url)
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     db = SessionLocal()
@@ -16,3 +82,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """
+    Sesión de solo lectura: usa la réplica salvo que el cliente haya escrito hace poco
+    """
+    session_factory = AsyncReadSessionLocal
+    if read_engine is engine or has_recent_write(request):
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+def get_read_session_factory(request: Request):
+    """
+    Fábrica de sesiones síncronas de lectura (para procesos que abren su propia sesión, como la exportación)
+    """
+    if read_engine is engine or has_recent_write(request):
+        return SessionLocal
+    return ReadSessionLocal
@@ -0,0 +1,48 @@
+import time
+from fastapi import Request
+from app.core.config import settings
+
+# Cookie con el instante (epoch) de la última escritura del cliente
+LAST_WRITE_COOKIE = "db_last_write"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def has_recent_write(request: Request) -> bool:
+    """
+    Indica si el cliente escribió dentro de la ventana read-your-writes
+    """
+    value = request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return False
+    try:
+        return time.time() - float(value) < settings.read_your_writes_seconds
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que marca con una cookie a los clientes que acaban de escribir
+
+    Mientras la cookie esté vigente, sus lecturas van al primario y no a la réplica,
+    de modo que una persona recién creada aparece en el listado aunque la réplica
+    todavía no la haya replicado.
+    """
+
+    def __init__(self, app, path_prefix: str = "/api/"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.read_your_writes_seconds
+                cookie = f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,90 @@
+"""
+Genera las derivadas WebP de las fotos subidas antes de que existieran (o tras cambiar PHOTO_VARIANT_SIZES)
+
+Al terminar registra los tamaños generados en las personas de cada foto, que desde entonces
+publican photo_variants.
+
+    python -m app.jobs.generate_photo_variants
+    python -m app.jobs.generate_photo_variants --force     # regenerar también las existentes
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from typing import List
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.repositories.person_repository import PersonRepository
+from app.services.file_service import TEMP_DIR
+from app.services.image_service import VARIANTS_DIR, generate_variants, get_image_pool, missing_variants, shutdown_image_pool, variant_paths
+
+UPLOAD_DIR = "uploads"
+
+
+def stored_photos(upload_dir: str) -> List[str]:
+    """
+    Fotos originales de upload_dir (nombres relativos, p. ej. "ab/cd/<hash>.jpg")
+    """
+    photos = []
+    for directory, subdirectories, filenames in os.walk(upload_dir):
+        if directory == upload_dir:
+            subdirectories[:] = [name for name in subdirectories if name not in (VARIANTS_DIR, TEMP_DIR)]
+        for filename in filenames:
+            photos.append(os.path.relpath(os.path.join(directory, filename), upload_dir).replace(os.sep, "/"))
+    return sorted(photos)
+
+
+def generate_photo_variants(db: Session, upload_dir: str = UPLOAD_DIR, force: bool = False) -> dict:
+    start = time.perf_counter()
+    sizes = settings.photo_variant_sizes
+    photos = stored_photos(upload_dir)
+    pending = [name for name in photos if force or missing_variants(upload_dir, name, sizes)]
+    pool = get_image_pool()
+    futures = {
+        pool.submit(
+            generate_variants,
+            os.path.join(upload_dir, name),
+            variant_paths(upload_dir, name, sizes) if force else missing_variants(upload_dir, name, sizes),
+            settings.photo_variant_quality
+        ): name
+        for name in pending
+    }
+    failed = []
+    for future in as_completed(futures):
+        if future.exception() is not None:
+            failed.append(futures[future])
+
+    # Las personas publican las derivadas solo de las fotos que ya las tienen todas
+    ready = sorted(set(photos) - set(failed))
+    PersonRepository().set_photo_variant_sizes(db, [f"/uploads/{name}" for name in ready], sizes)
+    return {
+        "photos": len(pending),
+        "generated": len(pending) - len(failed),
+        "failed": sorted(failed),
+        "ready": len(ready),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generar las derivadas WebP de las fotos existentes")
+    parser.add_argument("--upload-dir", default=UPLOAD_DIR, help="Directorio de las fotos originales")
+    parser.add_argument("--force", action="store_true", help="Regenerar también las derivadas existentes")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = generate_photo_variants(db, args.upload_dir, args.force)
+    finally:
+        db.close()
+        shutdown_image_pool()
+    print(f"Derivadas generadas para {result['generated']} de {result['photos']} fotos en {result['seconds']} s")
+    for filename in result["failed"]:
+        print(f"No se pudo procesar: {filename}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Reconstruye las tablas de resumen de personas desde la tabla persons
+
+Uso:
+    python -m app.jobs.rebuild_person_stats           # reporta diferencias y reconstruye
+    python -m app.jobs.rebuild_person_stats --check   # solo reporta diferencias (código 1 si hay)
+"""
+import argparse
+import json
+import sys
+from datetime import date
+from typing import List
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.repositories.person_repository import PersonRepository
+
+
+def find_drift(db: Session, repository: PersonRepository) -> List[str]:
+    """
+    Compara las estadísticas servidas desde el resumen con las calculadas sobre persons
+    """
+    today = date.today()
+    expected = repository.compute_stats(db, today)
+    actual = repository.get_stats(db, today)
+    return [
+        f"{key}: resumen={json.dumps(actual[key], ensure_ascii=False)} real={json.dumps(expected[key], ensure_ascii=False)}"
+        for key in expected
+        if expected[key] != actual[key]
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reconstruir las tablas de resumen del dashboard")
+    parser.add_argument("--check", action="store_true", help="Solo reportar diferencias, sin reconstruir")
+    args = parser.parse_args()
+
+    repository = PersonRepository()
+    db = SessionLocal()
+    try:
+        drift = find_drift(db, repository)
+        for line in drift:
+            print(f"Diferencia en {line}")
+        if args.check:
+            print("Resumen consistente" if not drift else f"{len(drift)} diferencias encontradas")
+            return 1 if drift else 0
+        db.rollback()
+        rows = repository.stats_repository.rebuild(db)
+        print(f"Resumen reconstruido: {json.dumps(rows)}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
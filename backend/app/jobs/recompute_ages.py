@@ -0,0 +1,100 @@
+"""
+Recalcula la columna age de las personas que cumplieron años desde la última ejecución
+
+Pensada para correr una vez al día (cron o un scheduler):
+    python -m app.jobs.recompute_ages
+    python -m app.jobs.recompute_ages --full          # todas las fechas del año, p. ej. tras una carga masiva
+    python -m app.jobs.recompute_ages --chunk-size 10000
+"""
+import argparse
+import calendar
+import sys
+import time
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.job_run import JobRun
+from app.repositories.person_repository import PersonRepository
+
+JOB_NAME = "recompute_ages"
+
+
+def birthday_windows(last_run: Optional[date], today: date) -> List[Tuple[int, int, int]]:
+    """
+    (mes, día, año de referencia) de cada cumpleaños ocurrido en (last_run, today]
+
+    El año de referencia es el del último cumpleaños ya cumplido a `today`, de modo que
+    la edad de todo el grupo es ese año menos el año de nacimiento. Quienes nacieron un
+    29 de febrero cumplen el 1 de marzo en años no bisiestos (igual que calculate_age).
+    Sin ejecución previa o tras más de un año se recorren todas las fechas.
+    """
+    full_year = last_run is None or (today - last_run).days >= 366
+    if full_year:
+        days = [today - timedelta(days=offset) for offset in range(366)]
+    else:
+        days = [last_run + timedelta(days=offset) for offset in range(1, (today - last_run).days + 1)]
+
+    birthdays = set()
+    for day in days:
+        birthdays.add((day.month, day.day))
+        if (day.month, day.day) == (3, 1) and not calendar.isleap(day.year):
+            birthdays.add((2, 29))
+    if full_year:
+        birthdays.add((2, 29))
+
+    windows = {
+        month_day: today.year if month_day <= (today.month, today.day) else today.year - 1
+        for month_day in birthdays
+    }
+    return [(month, day, year) for (month, day), year in sorted(windows.items())]
+
+
+def recompute_ages(db: Session, today: Optional[date] = None, chunk_size: int = 5000, full: bool = False) -> dict:
+    today = today or date.today()
+    repository = PersonRepository()
+    job_run = db.get(JobRun, JOB_NAME)
+    last_run = None if full or job_run is None else job_run.last_run_date
+
+    start = time.perf_counter()
+    updated = 0
+    windows = birthday_windows(last_run, today)
+    for month, day, reference_year in windows:
+        updated += repository.refresh_birthday_ages(db, month, day, reference_year, chunk_size)
+
+    # Registrar la ejecución solo al terminar: si falla, la siguiente retoma las mismas fechas
+    job_run = db.get(JobRun, JOB_NAME)
+    if job_run is None:
+        db.add(JobRun(name=JOB_NAME, last_run_date=today))
+    else:
+        job_run.last_run_date = today
+    db.commit()
+    return {
+        "since": last_run.isoformat() if last_run else None,
+        "today": today.isoformat(),
+        "birthday_windows": len(windows),
+        "updated": updated,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recalcular edades de quienes cumplieron años")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Filas por UPDATE (un commit por bloque)")
+    parser.add_argument("--full", action="store_true", help="Ignorar la última ejecución y revisar todas las fechas")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = recompute_ages(db, chunk_size=args.chunk_size, full=args.full)
+        print(
+            f"Edades actualizadas: {result['updated']} en {result['birthday_windows']} fechas de cumpleaños "
+            f"(desde {result['since'] or 'el inicio'}) en {result['seconds']} s"
+        )
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
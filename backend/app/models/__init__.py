@@ -1,4 +1,8 @@
 from .person import Person
 from .profession import Profession
+from .person_stats import PersonStatsProfession, PersonStatsBirthDate, PersonStatsMonth
+from .job_run import JobRun
+from .import_job import ImportJob
+from .photo_file import PhotoFile
 
-__all__ = ["Person", "Profession"]
+__all__ = ["Person", "Profession", "PersonStatsProfession", "PersonStatsBirthDate", "PersonStatsMonth", "JobRun", "ImportJob", "PhotoFile"]
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ImportJob(Base):
+    """
+    Estado y progreso de una importación de personas desde CSV/XLSX
+    """
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True)
+    filename = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    inserted_rows = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(Text, nullable=False, default="[]")  # JSON con los errores por fila reportados
+    message = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Date, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class JobRun(Base):
+    """
+    Última ejecución exitosa de cada tarea programada (app/jobs)
+    """
+    __tablename__ = "job_runs"
+
+    name = Column(String(100), primary_key=True)
+    last_run_date = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
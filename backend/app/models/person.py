@@ -1,11 +1,29 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, Index, JSON, extract
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# SQLite guarda CURRENT_TIMESTAMP como texto 'YYYY-MM-DD HH:MM:SS'; los valores enlazados (filtros,
+# cursores) deben usar el mismo formato para que las comparaciones de texto sean correctas
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 
 class Person(Base):
     __tablename__ = "persons"
+    __table_args__ = (
+        # Índices compuestos para filtros y ordenamientos del listado (ver 0002_person_list_indexes)
+        Index("ix_persons_profession_id_id", "profession_id", "id"),
+        Index("ix_persons_profession_id_created_at", "profession_id", "created_at", "id"),
+        Index("ix_persons_profession_id_birth_date", "profession_id", "birth_date", "id"),
+        Index("ix_persons_created_at_id", "created_at", "id"),
+        Index("ix_persons_birth_date_id", "birth_date", "id"),
+        Index("ix_persons_last_name_id", "last_name", "id"),
+        Index("ix_persons_first_name_id", "first_name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     first_name = Column(String(100), nullable=False)
@@ -16,8 +34,14 @@ class Person(Base):
     address = Column(Text, nullable=False)
     phone = Column(String(20), nullable=False)
     photo_url = Column(String(255), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Tamaños de las derivadas WebP que existen para photo_url; NULL si aún no se generaron
+    photo_variant_sizes = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
     
     # Relación con Profession
     profession = relationship("Profession", back_populates="persons")
+
+
+# Cumpleaños (mes, día) para el recálculo diario de edades (ver 0004_person_birthday_index)
+Index("ix_persons_birthday", extract("month", Person.birth_date), extract("day", Person.birth_date))
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from app.db.database import Base
+
+
+class PersonStatsProfession(Base):
+    """
+    Personas por profesión, mantenido por PersonRepository en cada escritura
+    """
+    __tablename__ = "person_stats_profession"
+
+    profession_id = Column(Integer, ForeignKey("professions.id", ondelete="CASCADE"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class PersonStatsBirthDate(Base):
+    """
+    Personas por fecha de nacimiento; los rangos de edad se derivan de aquí con la fecha del día
+    """
+    __tablename__ = "person_stats_birth_date"
+
+    birth_date = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class PersonStatsMonth(Base):
+    """
+    Personas registradas por mes (primer día del mes de created_at)
+    """
+    __tablename__ = "person_stats_month"
+
+    month = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
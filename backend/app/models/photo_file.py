@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class PhotoFile(Base):
+    """
+    Foto guardada por contenido (SHA-256) y cuántas personas la referencian
+
+    El archivo vive en uploads/<hash[:2]>/<hash[2:4]>/<hash><extension> y se elimina
+    cuando ref_count llega a cero.
+    """
+    __tablename__ = "photo_files"
+
+    sha256 = Column(String(64), primary_key=True)
+    extension = Column(String(10), nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.person import Person
+from app.schemas.person_request_response import PersonCreateRequest, PersonListFilters
+from app.repositories.person_repository import PersonRepository
+
+
+class AsyncPersonRepository:
+    """
+    Repositorio de personas sobre AsyncSession
+
+    Cada operación ejecuta la consulta de PersonRepository con AsyncSession.run_sync,
+    que corre sobre el driver asíncrono: el event loop queda libre mientras se espera
+    a la base de datos y la construcción de consultas no se duplica.
+    """
+
+    def __init__(self):
+        self._repository = PersonRepository()
+
+    async def create(self, db: AsyncSession, person_data: PersonCreateRequest, photo_url: Optional[str] = None) -> int:
+        return await db.run_sync(self._repository.create, person_data, photo_url)
+
+    async def create_many(self, db: AsyncSession, persons_data: List[PersonCreateRequest], photo_urls: Optional[List[Optional[str]]] = None) -> List[Person]:
+        return await db.run_sync(self._repository.create_many, persons_data, photo_urls)
+
+    async def insert_rows(self, db: AsyncSession, rows: List[dict]) -> List[int]:
+        return await db.run_sync(self._repository.insert_rows, rows)
+
+    async def profession_ids_by_name(self, db: AsyncSession) -> Dict[str, int]:
+        return await db.run_sync(self._repository.profession_ids_by_name)
+
+    async def get_by_id(self, db: AsyncSession, person_id: int, fields: Optional[List[str]] = None) -> Optional[Any]:
+        return await db.run_sync(self._repository.get_by_id, person_id, fields)
+
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> List[Any]:
+        return await db.run_sync(self._repository.get_all, skip, limit, filters, fields)
+
+    async def get_page(self, db: AsyncSession, limit: int = 100, after: Optional[str] = None, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        return await db.run_sync(self._repository.get_page, limit, after, filters, fields)
+
+    async def update(self, db: AsyncSession, person_id: int, values: dict, photo_url: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        return await db.run_sync(self._repository.update, person_id, values, photo_url)
+
+    async def delete(self, db: AsyncSession, person_id: int) -> Tuple[bool, Optional[str]]:
+        return await db.run_sync(self._repository.delete, person_id)
+
+    async def update_many(self, db: AsyncSession, values: dict, ids: Optional[List[int]] = None, filters: Optional[PersonListFilters] = None) -> int:
+        return await db.run_sync(self._repository.update_many, values, ids, filters)
+
+    async def delete_many(self, db: AsyncSession, ids: List[int]) -> List[Optional[str]]:
+        return await db.run_sync(self._repository.delete_many, ids)
+
+    async def get_stats(self, db: AsyncSession) -> dict:
+        return await db.run_sync(self._repository.get_stats)
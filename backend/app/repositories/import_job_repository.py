@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.import_job import ImportJob
+
+# Errores por fila que se guardan para el reporte de una importación
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportJobRepository:
+    """
+    Persistencia del estado de las importaciones, para consultarlo desde cualquier worker
+    """
+
+    def create(self, db: Session, job_id: str, filename: str) -> ImportJob:
+        job = ImportJob(id=job_id, filename=filename, status="pending", processed_rows=0,
+                        inserted_rows=0, error_count=0, errors="[]")
+        db.add(job)
+        db.commit()
+        return job
+
+    def get(self, db: Session, job_id: str) -> Optional[ImportJob]:
+        return db.get(ImportJob, job_id)
+
+    def start(self, db: Session, job_id: str, total_rows: Optional[int] = None) -> None:
+        db.execute(update(ImportJob).where(ImportJob.id == job_id).values(
+            status="running", total_rows=total_rows, started_at=datetime.now(timezone.utc)))
+        db.commit()
+
+    def record_chunk(self, db: Session, job_id: str, processed: int, inserted: int, error_count: int, reported_errors: Optional[List[dict]] = None) -> None:
+        """
+        Suma el progreso de un bloque con un solo UPDATE; reported_errors reemplaza la lista guardada
+        """
+        values = {
+            "processed_rows": ImportJob.processed_rows + processed,
+            "inserted_rows": ImportJob.inserted_rows + inserted,
+            "error_count": ImportJob.error_count + error_count,
+        }
+        if reported_errors is not None:
+            values["errors"] = json.dumps(reported_errors, ensure_ascii=False)
+        db.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+        db.commit()
+
+    def finish(self, db: Session, job_id: str, status: str, message: Optional[str] = None) -> None:
+        values = {"status": status, "message": message, "finished_at": datetime.now(timezone.utc)}
+        if status == "completed":
+            # El conteo inicial es una estimación (filas en blanco en XLSX); al terminar se deja el exacto
+            values["total_rows"] = ImportJob.processed_rows
+        db.execute(update(ImportJob).where(ImportJob.id == job_id).values(**values))
+        db.commit()
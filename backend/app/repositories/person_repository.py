@@ -1,115 +1,595 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import DateTime, and_, bindparam, case, cast, delete, extract, func, insert, literal, literal_column, or_, select, tuple_, update
+from app.core.config import settings
 from app.models.person import Person
 from app.models.profession import Profession
-from app.schemas.person_request_response import PersonCreateRequest, PersonUpdateRequest
+from app.schemas.person_request_response import PersonCreateRequest, PersonListFilters
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.cache import stats_cache, DASHBOARD_STATS_KEY
 from app.repositories.person_repository_interface import PersonRepositoryInterface
+from app.repositories.person_stats_repository import PersonStatsKey, PersonStatsRepository, AGE_RANGES, stats_key, years_before, last_month_starts, month_label
+
+
+# Columnas que se seleccionan para cada campo en lecturas parciales (fields=...)
+PERSON_FIELD_COLUMNS = {
+    "id": Person.id,
+    "first_name": Person.first_name,
+    "last_name": Person.last_name,
+    "birth_date": Person.birth_date,
+    "age": Person.age,
+    "profession_id": Person.profession_id,
+    "profession_name": Profession.name.label("profession_name"),
+    "address": Person.address,
+    "phone": Person.phone,
+    "photo_url": Person.photo_url,
+    "created_at": Person.created_at,
+    "updated_at": Person.updated_at,
+}
+
+
+# Columnas que identifican a una persona en el resumen del dashboard (ver PersonStatsKey)
+STATS_KEY_COLUMNS = (Person.profession_id, Person.birth_date, Person.created_at)
+STATS_FIELDS = ("profession_id", "birth_date")
 
 
 class PersonRepository(PersonRepositoryInterface):
-    def create(self, db: Session, person_data: PersonCreateRequest, photo_url: Optional[str] = None) -> Person:
-        # Calcular edad
-        today = date.today()
+    def __init__(self):
+        self.stats_repository = PersonStatsRepository()
+
+    def create(self, db: Session, person_data: PersonCreateRequest, photo_url: Optional[str] = None) -> int:
+        """
+        Inserta la persona con un solo INSERT ... RETURNING y retorna su id
+
+        RETURNING trae created_at para ubicar el mes de registro en el resumen del dashboard.
+        """
         birth_date = datetime.strptime(person_data.birth_date, '%Y-%m-%d').date()
-        age = today.year - birth_date.year - (
-            (today.month, today.day) < (birth_date.month, birth_date.day)
-        )
-        
-        db_person = Person(
-            first_name=person_data.first_name,
-            last_name=person_data.last_name,
-            birth_date=birth_date,
-            age=age,
-            profession_id=person_data.profession_id,
-            address=person_data.address,
-            phone=person_data.phone,
-            photo_url=photo_url
-        )
-        db.add(db_person)
-        db.commit()
-        db.refresh(db_person)
-        return db_person
+        try:
+            row = db.execute(insert(Person).values(
+                first_name=person_data.first_name,
+                last_name=person_data.last_name,
+                birth_date=birth_date,
+                age=self.calculate_age(birth_date),
+                profession_id=person_data.profession_id,
+                address=person_data.address,
+                phone=person_data.phone,
+                photo_url=photo_url,
+                photo_variant_sizes=self._variant_sizes(photo_url)
+            ).returning(Person.id, *STATS_KEY_COLUMNS)).one()
+            self.stats_repository.apply(db, added=[PersonStatsKey(*row[1:])])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        stats_cache.invalidate()
+        return row.id
 
-    def get_by_id(self, db: Session, person_id: int) -> Optional[Person]:
-        return db.query(Person).options(joinedload(Person.profession)).filter(Person.id == person_id).first()
+    def create_many(self, db: Session, persons_data: List[PersonCreateRequest], photo_urls: Optional[List[Optional[str]]] = None) -> List[Person]:
+        """
+        Inserta todas las personas en una sola transacción con INSERT ... RETURNING de varias filas
 
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Person]:
-        return db.query(Person).options(joinedload(Person.profession)).offset(skip).limit(limit).all()
+        Las profesiones se validan y cargan con una consulta y se asignan a cada persona
+        sin consultas adicionales.
+        Si alguna profesión no existe se lanza ValueError y no se inserta nada.
+        """
+        if not persons_data:
+            return []
+        profession_ids = {person_data.profession_id for person_data in persons_data}
+        professions = db.scalars(select(Profession).where(Profession.id.in_(profession_ids))).all()
+        missing = sorted(profession_ids - {profession.id for profession in professions})
+        if missing:
+            raise ValueError(f"Profesión no encontrada: {', '.join(str(profession_id) for profession_id in missing)}")
 
-    def update(self, db: Session, person_id: int, person_data: PersonUpdateRequest, photo_url: Optional[str] = None) -> Optional[Person]:
-        db_person = self.get_by_id(db, person_id)
-        if db_person:
-            # Calcular nueva edad si cambió la fecha de nacimiento
-            today = date.today()
+        photo_urls = photo_urls or []
+        today = date.today()
+        rows = []
+        for i, person_data in enumerate(persons_data):
             birth_date = datetime.strptime(person_data.birth_date, '%Y-%m-%d').date()
-            age = today.year - birth_date.year - (
-                (today.month, today.day) < (birth_date.month, birth_date.day)
-            )
-            
-            # Actualizar campos
-            db_person.first_name = person_data.first_name
-            db_person.last_name = person_data.last_name
-            db_person.birth_date = birth_date
-            db_person.age = age
-            db_person.profession_id = person_data.profession_id
-            db_person.address = person_data.address
-            db_person.phone = person_data.phone
-            
-            if photo_url:
-                db_person.photo_url = photo_url
-            
+            photo_url = photo_urls[i] if i < len(photo_urls) else None
+            rows.append({
+                "first_name": person_data.first_name,
+                "last_name": person_data.last_name,
+                "birth_date": birth_date,
+                "age": self.calculate_age(birth_date, today),
+                "profession_id": person_data.profession_id,
+                "address": person_data.address,
+                "phone": person_data.phone,
+                "photo_url": photo_url,
+                "photo_variant_sizes": self._variant_sizes(photo_url),
+            })
+
+        professions_by_id = {profession.id: profession for profession in professions}
+        try:
+            # Sin sort_by_parameter_order el INSERT va en una sola sentencia también en SQLite;
+            # los ids se asignan en el orden de VALUES, así que ordenar por id respeta el del lote
+            persons = sorted(db.scalars(insert(Person).returning(Person), rows), key=lambda person: person.id)
+            for person in persons:
+                set_committed_value(person, "profession", professions_by_id[person.profession_id])
+            self.stats_repository.apply(db, added=[stats_key(person) for person in persons])
             db.commit()
-            db.refresh(db_person)
-        return db_person
+        except Exception:
+            db.rollback()
+            raise
+        stats_cache.invalidate()
+        return persons
 
-    def delete(self, db: Session, person_id: int) -> bool:
-        db_person = self.get_by_id(db, person_id)
-        if db_person:
-            db.delete(db_person)
+    def insert_rows(self, db: Session, rows: List[dict]) -> List[int]:
+        """
+        Inserta filas ya validadas (importaciones) y confirma la transacción
+
+        Solo se traen con RETURNING el id y las columnas que necesita el resumen del dashboard.
+        Retorna los ids en el orden de rows (se asignan en el orden de VALUES, como en create_many).
+        """
+        if not rows:
+            return []
+        try:
+            inserted = db.execute(
+                insert(Person.__table__).returning(Person.id, Person.profession_id, Person.birth_date, Person.created_at), rows
+            ).all()
+            self.stats_repository.apply(db, added=[PersonStatsKey(*row[1:]) for row in inserted])
             db.commit()
-            return True
-        return False
-
-    def get_stats(self, db: Session) -> dict:
-        # Total de personas
-        total_persons = db.query(Person).count()
-        
-        # Conteo por profesión
-        professions_count = dict(
-            db.query(Person.profession, func.count(Person.id))
-            .group_by(Person.profession)
-            .all()
+        except Exception:
+            db.rollback()
+            raise
+        stats_cache.invalidate()
+        return sorted(row[0] for row in inserted)
+
+    def profession_ids_by_name(self, db: Session) -> Dict[str, int]:
+        """
+        Mapa nombre (en mayúsculas, como se guardan) -> id de todas las profesiones
+        """
+        return {name: profession_id for profession_id, name in db.execute(select(Profession.id, Profession.name))}
+
+    def get_by_id(self, db: Session, person_id: int, fields: Optional[List[str]] = None) -> Optional[Person]:
+        if fields:
+            return self._projection_query(db, fields).filter(Person.id == person_id).first()
+        return db.query(Person).options(joinedload(Person.profession)).filter(Person.id == person_id).first()
+
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> List[Person]:
+        filters = filters or PersonListFilters()
+        column, descending = self._sort_column(filters.sort)
+        query = self._filtered_query(db, filters, fields, column)
+        query = query.order_by(*self._ordering(column, descending))
+        return query.offset(skip).limit(limit).all()
+
+    def get_page(self, db: Session, limit: int = 100, after: Optional[str] = None, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> Tuple[List[Person], Optional[str]]:
+        # Paginación keyset: se continúa desde la última fila vista en lugar de usar OFFSET
+        filters = filters or PersonListFilters()
+        column, descending = self._sort_column(filters.sort)
+        query = self._filtered_query(db, filters, fields, column)
+        if after:
+            cursor = decode_cursor(after)
+            if cursor.get("sort", "id") != filters.sort:
+                raise ValueError("El cursor no corresponde al ordenamiento solicitado")
+            query = query.filter(self._after_condition(column, descending, cursor))
+        query = query.order_by(*self._ordering(column, descending))
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        persons = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(persons) > limit:
+            persons = persons[:limit]
+            last = persons[-1]
+            position = {"id": last.id, "sort": filters.sort}
+            if column is not Person.id:
+                value = getattr(last, column.key)
+                position["value"] = value.isoformat() if isinstance(value, (date, datetime)) else value
+            next_cursor = encode_cursor(position)
+        return persons, next_cursor
+
+    def _projection_query(self, db: Session, fields: List[str], sort_column=None):
+        # Solo se seleccionan las columnas pedidas; id y la columna de orden se agregan para el cursor
+        names = list(dict.fromkeys(["id", *fields]))
+        columns = [PERSON_FIELD_COLUMNS[name] for name in names]
+        if sort_column is not None and sort_column.key not in names:
+            columns.append(sort_column)
+        query = db.query(*columns).select_from(Person)
+        if "profession_name" in names:
+            query = query.join(Profession, Person.profession_id == Profession.id)
+        return query
+
+    def _filtered_query(self, db: Session, filters: PersonListFilters, fields: Optional[List[str]] = None, sort_column=None):
+        if fields:
+            query = self._projection_query(db, fields, sort_column)
+        else:
+            query = db.query(Person).options(joinedload(Person.profession))
+        return query.filter(*self._filter_conditions(filters))
+
+    @staticmethod
+    def _variant_sizes(photo_url: Optional[str]) -> Optional[List[int]]:
+        # Las fotos nuevas llegan de FileService.save_photo, que deja generadas las derivadas de los tamaños configurados
+        return settings.photo_variant_sizes if photo_url else None
+
+    def _prepare_values(self, values: dict) -> dict:
+        # birth_date llega como texto validado; la edad se recalcula junto con ella
+        values = dict(values)
+        if "birth_date" in values:
+            values["birth_date"] = datetime.strptime(values["birth_date"], '%Y-%m-%d').date()
+            values["age"] = self.calculate_age(values["birth_date"])
+        return values
+
+    @staticmethod
+    def _filter_conditions(filters: PersonListFilters) -> list:
+        conditions = []
+        if filters.profession_id is not None:
+            conditions.append(Person.profession_id == filters.profession_id)
+
+        # Los rangos de edad se traducen a rangos de birth_date para usar los índices
+        today = date.today()
+        if filters.min_age is not None:
+            conditions.append(Person.birth_date <= years_before(today, filters.min_age))
+        if filters.max_age is not None:
+            conditions.append(Person.birth_date > years_before(today, filters.max_age + 1))
+        if filters.birth_date_from is not None:
+            conditions.append(Person.birth_date >= filters.birth_date_from)
+        if filters.birth_date_to is not None:
+            conditions.append(Person.birth_date <= filters.birth_date_to)
+        if filters.created_from is not None:
+            conditions.append(Person.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            conditions.append(Person.created_at < filters.created_to)
+        return conditions
+
+    @staticmethod
+    def _sort_column(sort: str):
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        # Ordenar por edad equivale a ordenar por fecha de nacimiento en sentido inverso
+        if field == "age":
+            return Person.birth_date, not descending
+        return getattr(Person, field), descending
+
+    @staticmethod
+    def _ordering(column, descending: bool):
+        if column is Person.id:
+            return [Person.id.desc() if descending else Person.id.asc()]
+        # NULL (solo posible en created_at) se ordena como el valor más grande, igual que en PostgreSQL
+        if descending:
+            ordered = column.desc().nulls_first() if column.nullable else column.desc()
+            return [ordered, Person.id.desc()]
+        ordered = column.asc().nulls_last() if column.nullable else column.asc()
+        return [ordered, Person.id.asc()]
+
+    @staticmethod
+    def _after_condition(column, descending: bool, cursor: dict):
+        id_after = Person.id < cursor["id"] if descending else Person.id > cursor["id"]
+        if column is Person.id:
+            return id_after
+
+        value = cursor.get("value")
+        if value is None and column.nullable:
+            # La última fila vista tenía NULL: en orden ascendente solo quedan NULL, en descendente
+            # quedan los NULL siguientes y luego todas las filas con valor
+            after_nulls = and_(column.is_(None), id_after)
+            return or_(after_nulls, column.isnot(None)) if descending else after_nulls
+        try:
+            if column is Person.birth_date:
+                value = date.fromisoformat(value)
+            elif column is Person.created_at:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, str):
+                raise TypeError
+        except (TypeError, ValueError):
+            raise ValueError("Cursor de paginación inválido")
+
+        # El valor se enlaza con el tipo de la columna para que use el mismo formato que lo guardado
+        key = tuple_(column, Person.id)
+        bound = tuple_(literal(value, type_=column.type), cursor["id"])
+        if descending:
+            return key < bound
+        condition = key > bound
+        return or_(condition, column.is_(None)) if column.nullable else condition
+
+    @staticmethod
+    def calculate_age(birth_date: date, today: Optional[date] = None) -> int:
+        """
+        Edad en años cumplidos a la fecha indicada (hoy por defecto)
+        """
+        today = today or date.today()
+        return today.year - birth_date.year - (
+            (today.month, today.day) < (birth_date.month, birth_date.day)
         )
-        
-        # Distribución por rangos de edad
-        age_ranges = {
-            "0-18": db.query(Person).filter(Person.age <= 18).count(),
-            "19-35": db.query(Person).filter(Person.age.between(19, 35)).count(),
-            "36-60": db.query(Person).filter(Person.age.between(36, 60)).count(),
-            "60+": db.query(Person).filter(Person.age > 60).count(),
-        }
-        
-        # Registros por mes
-        monthly_registrations = {}
-        monthly_data = (
-            db.query(
-                extract('year', Person.created_at).label('year'),
-                extract('month', Person.created_at).label('month'),
-                func.count(Person.id).label('count')
+
+    def set_photo_variant_sizes(self, db: Session, photo_urls: List[str], sizes: List[int]) -> None:
+        """
+        Registra los tamaños de derivadas generados para las personas con alguna de esas fotos
+
+        Un solo UPDATE ejecutado por lotes (executemany) y sin cambiar updated_at.
+        """
+        if not photo_urls:
+            return
+        persons = Person.__table__
+        try:
+            db.execute(
+                update(persons)
+                .where(persons.c.photo_url == bindparam("target_url"))
+                .values(photo_variant_sizes=sizes, updated_at=persons.c.updated_at),
+                [{"target_url": photo_url} for photo_url in photo_urls]
             )
-            .group_by(extract('year', Person.created_at), extract('month', Person.created_at))
-            .all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    def refresh_birthday_ages(self, db: Session, month: int, day: int, reference_year: int, chunk_size: int = 5000) -> int:
+        """
+        Actualiza la edad de quienes cumplen años el `month`/`day` indicado
+
+        La edad de todo ese grupo es `reference_year - año de nacimiento`, así que basta
+        un UPDATE por bloques de `chunk_size` filas, con commit por bloque. Solo se tocan
+        filas cuya edad guardada es distinta, por lo que repetir la tarea no escribe nada.
+        Retorna cuántas filas se actualizaron.
+        """
+        expected_age = reference_year - extract("year", Person.birth_date)
+        stale = (
+            select(Person.id)
+            .where(
+                extract("month", Person.birth_date) == month,
+                extract("day", Person.birth_date) == day,
+                Person.age != expected_age
+            )
+            .order_by(Person.id)
+            .limit(chunk_size)
         )
-        
-        for year, month, count in monthly_data:
-            key = f"{int(year)}-{int(month):02d}"
-            monthly_registrations[key] = count
-        
+        updated = 0
+        while True:
+            result = db.execute(
+                update(Person)
+                .where(Person.id.in_(stale.scalar_subquery()))
+                # No es una edición del usuario: se conserva updated_at
+                .values(age=expected_age, updated_at=Person.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            updated += result.rowcount
+            if result.rowcount < chunk_size:
+                return updated
+
+    def stream(self, db: Session, fields: List[str], filters: Optional[PersonListFilters] = None, batch_size: int = 1000) -> Iterator[Any]:
+        # yield_per usa un cursor del lado del servidor (stream_results) y trae las filas por lotes
+        filters = filters or PersonListFilters()
+        column, descending = self._sort_column(filters.sort)
+        query = self._filtered_query(db, filters, fields, column)
+        query = query.order_by(*self._ordering(column, descending))
+        return iter(query.yield_per(batch_size))
+
+    def update(self, db: Session, person_id: int, values: dict, photo_url: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Actualiza solo las columnas de values (y la foto, si se indica)
+
+        Sin foto nueva se intenta primero un único UPDATE condicionado a que profesión y fecha de
+        nacimiento no cambien y a que algún valor sí cambie. Si no aplica, se lee la fila con
+        bloqueo, se escriben solo las columnas que cambiaron (o nada) y se ajusta el resumen.
+        Retorna (existe, foto cuya referencia se debe liberar): la reemplazada, o la nueva si
+        es la misma que ya tenía la persona.
+        """
+        values = self._prepare_values(values)
+        try:
+            if photo_url is None and values:
+                conditions = [Person.id == person_id, or_(*(getattr(Person, key).is_distinct_from(value) for key, value in values.items()))]
+                conditions += [getattr(Person, key) == values[key] for key in STATS_FIELDS if key in values]
+                if db.execute(update(Person).where(*conditions).values(**values).returning(Person.id)).first() is not None:
+                    db.commit()
+                    return True, None
+
+            if photo_url is not None:
+                values["photo_url"] = photo_url
+                values["photo_variant_sizes"] = self._variant_sizes(photo_url)
+            columns = dict.fromkeys(["profession_id", "birth_date", "created_at", "photo_url", *values])
+            previous = db.execute(
+                select(*(getattr(Person, column) for column in columns)).where(Person.id == person_id).with_for_update()
+            ).first()
+            if previous is None:
+                db.rollback()
+                return False, None
+            changes = {key: value for key, value in values.items() if getattr(previous, key) != value}
+            if not changes:
+                db.rollback()
+                return True, photo_url
+            if "profession_id" in changes and db.get(Profession, changes["profession_id"]) is None:
+                raise ValueError(f"Profesión no encontrada: {changes['profession_id']}")
+
+            db.execute(update(Person).where(Person.id == person_id).values(**changes))
+            previous_key = PersonStatsKey(previous.profession_id, previous.birth_date, previous.created_at)
+            current_key = previous_key._replace(**{key: changes[key] for key in STATS_FIELDS if key in changes})
+            # Si no cambiaron profesión ni fecha de nacimiento, los deltas se anulan y no hay escritura
+            self.stats_repository.apply(db, added=[current_key], removed=[previous_key])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if current_key != previous_key:
+            stats_cache.invalidate()
+        return True, previous.photo_url if "photo_url" in changes else photo_url
+
+    def delete(self, db: Session, person_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        Elimina la persona con un solo DELETE ... RETURNING
+
+        Retorna (existía, foto que se debe eliminar).
+        """
+        try:
+            row = db.execute(
+                delete(Person).where(Person.id == person_id).returning(*STATS_KEY_COLUMNS, Person.photo_url)
+            ).first()
+            if row is None:
+                db.rollback()
+                return False, None
+            self.stats_repository.apply(db, removed=[PersonStatsKey(*row[:3])])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        stats_cache.invalidate()
+        return True, row.photo_url
+
+    def update_many(self, db: Session, values: dict, ids: Optional[List[int]] = None, filters: Optional[PersonListFilters] = None) -> int:
+        """
+        Asigna values a las personas de ids (o a las que cumplen filters) con un solo UPDATE
+
+        Si cambian profesión o fecha de nacimiento, las personas afectadas se bloquean y se
+        cuentan por grupo antes del UPDATE para mover esos conteos en el resumen del dashboard.
+        Todo ocurre en una transacción; retorna la cantidad de personas actualizadas.
+        Sin ids ni algún filtro se lanza ValueError en lugar de actualizar a todas las personas.
+        """
+        conditions = [Person.id.in_(ids)] if ids is not None else self._filter_conditions(filters or PersonListFilters())
+        if not conditions:
+            raise ValueError("Indique al menos un filtro en filters")
+        values = self._prepare_values(values)
+        try:
+            if "profession_id" in values and db.get(Profession, values["profession_id"]) is None:
+                raise ValueError(f"Profesión no encontrada: {values['profession_id']}")
+
+            groups = []
+            if "profession_id" in values or "birth_date" in values:
+                locked = select(Person.id, Person.profession_id, Person.birth_date).where(*conditions).with_for_update().subquery()
+                groups = db.execute(
+                    select(locked.c.profession_id, locked.c.birth_date, func.count(), func.max(locked.c.id))
+                    .group_by(locked.c.profession_id, locked.c.birth_date)
+                ).all()
+                if not groups:
+                    db.rollback()
+                    return 0
+                # Las filas insertadas después del bloqueo tienen ids mayores y quedan fuera del UPDATE
+                conditions.append(Person.id <= max(group[3] for group in groups))
+
+            result = db.execute(
+                update(Person).where(*conditions).values(**values).execution_options(synchronize_session=False)
+            )
+            by_profession, by_birth_date = Counter(), Counter()
+            for profession_id, birth_date, count, _ in groups:
+                if "profession_id" in values:
+                    by_profession[profession_id] -= count
+                    by_profession[values["profession_id"]] += count
+                if "birth_date" in values:
+                    by_birth_date[birth_date] -= count
+                    by_birth_date[values["birth_date"]] += count
+            self.stats_repository.apply_counts(db, by_profession=by_profession, by_birth_date=by_birth_date)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if result.rowcount:
+            stats_cache.invalidate()
+        return result.rowcount
+
+    def delete_many(self, db: Session, ids: List[int]) -> List[Optional[str]]:
+        """
+        Elimina las personas de ids con un solo DELETE ... RETURNING en una transacción
+
+        Retorna la foto (o None) de cada persona eliminada para limpiar los archivos después.
+        """
+        try:
+            deleted = db.execute(
+                delete(Person).where(Person.id.in_(ids))
+                .returning(Person.profession_id, Person.birth_date, Person.created_at, Person.photo_url)
+                .execution_options(synchronize_session=False)
+            ).all()
+            self.stats_repository.apply(db, removed=[PersonStatsKey(*row[:3]) for row in deleted])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if deleted:
+            stats_cache.invalidate()
+        return [row[3] for row in deleted]
+
+    def get_stats(self, db: Session, today: Optional[date] = None) -> dict:
+        """
+        Estadísticas del dashboard desde las tablas de resumen (costo O(grupos))
+
+        Sin fecha explícita el resultado se guarda en stats_cache hasta que venza el TTL
+        o una escritura de personas lo invalide.
+        """
+        if today is not None:
+            return self.stats_repository.get_stats(db, today)
+        entry = stats_cache.get(DASHBOARD_STATS_KEY)
+        if entry is not None:
+            return entry.value
+        generation = stats_cache.generation
+        stats = self.stats_repository.get_stats(db)
+        stats_cache.set(DASHBOARD_STATS_KEY, stats, generation)
+        return stats
+
+    def compute_stats(self, db: Session, today: Optional[date] = None) -> dict:
+        """
+        Mismas estadísticas calculadas directamente sobre persons, sin cargar filas en Python
+
+        Sirve para verificar las tablas de resumen antes de reconstruirlas.
+        Los rangos de edad se calculan desde birth_date (no desde la columna age, que
+        solo se actualiza al guardar) comparando contra fechas límite precalculadas.
+        """
+        today = today or date.today()
+        born_after_18 = years_before(today, 19)
+        born_after_35 = years_before(today, 36)
+        born_after_60 = years_before(today, 61)
+
+        # Totales y rangos de edad en un solo recorrido de persons
+        totals = db.query(
+            func.count(Person.id).label("total_persons"),
+            func.count(case((Person.birth_date > born_after_18, 1))).label("0-18"),
+            func.count(case((and_(Person.birth_date <= born_after_18, Person.birth_date > born_after_35), 1))).label("19-35"),
+            func.count(case((and_(Person.birth_date <= born_after_35, Person.birth_date > born_after_60), 1))).label("36-60"),
+            func.count(case((Person.birth_date <= born_after_60, 1))).label("60+"),
+            select(func.count(Profession.id)).scalar_subquery().label("total_professions"),
+        ).one()
+
+        profession_stats = db.query(
+            Profession.name.label("profession_name"),
+            func.count(Person.id).label("count")
+        ).outerjoin(Person).group_by(Profession.id, Profession.name).order_by(Profession.id).all()
+
         return {
-            "total_persons": total_persons,
-            "professions_count": professions_count,
-            "age_ranges": age_ranges,
-            "monthly_registrations": monthly_registrations
+            "total_persons": totals.total_persons,
+            "total_professions": totals.total_professions,
+            "profession_distribution": [
+                {"profession_name": stat.profession_name, "count": stat.count}
+                for stat in profession_stats
+            ],
+            "age_distribution": [
+                {"range": range_name, "count": totals._mapping[range_name]}
+                for range_name in AGE_RANGES
+            ],
+            "monthly_registrations": self._monthly_registrations(db, today)
         }
+
+    def _monthly_registrations(self, db: Session, today: date, months: int = 12) -> List[dict]:
+        """
+        Registros por mes calendario de los últimos `months` meses, en orden cronológico
+        """
+        month_starts = last_month_starts(today, months)
+
+        if db.get_bind().dialect.name == "postgresql":
+            # generate_series produce todos los meses, incluso los que no tienen registros
+            series = select(
+                func.generate_series(
+                    cast(month_starts[0], DateTime), cast(month_starts[-1], DateTime),
+                    literal_column("interval '1 month'"), type_=DateTime
+                ).label("month")
+            ).subquery()
+            next_month = series.c.month + literal_column("interval '1 month'")
+            rows = db.execute(
+                select(series.c.month, func.count(Person.id))
+                .select_from(series)
+                .outerjoin(Person, and_(Person.created_at >= series.c.month, Person.created_at < next_month))
+                .group_by(series.c.month)
+            ).all()
+            counts = {(row[0].year, row[0].month): row[1] for row in rows}
+        else:
+            year_column = extract("year", Person.created_at)
+            month_column = extract("month", Person.created_at)
+            rows = db.query(year_column, month_column, func.count(Person.id)).filter(
+                Person.created_at >= month_starts[0]
+            ).group_by(year_column, month_column).all()
+            counts = {(int(row[0]), int(row[1])): row[2] for row in rows}
+
+        return [
+            {
+                "month": month_label(start),
+                "count": counts.get((start.year, start.month), 0)
+            }
+            for start in month_starts
+        ]
@@ -1,31 +1,73 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.person import Person
-from app.schemas.person import PersonCreate, PersonUpdate
+from app.schemas.person import PersonCreate
+from app.schemas.person_request_response import PersonListFilters
 
 
 class PersonRepositoryInterface(ABC):
     @abstractmethod
-    def create(self, db: Session, person_data: PersonCreate) -> Person:
+    def create(self, db: Session, person_data: PersonCreate) -> int:
         pass
 
     @abstractmethod
-    def get_by_id(self, db: Session, person_id: int) -> Optional[Person]:
+    def create_many(self, db: Session, persons_data: List[PersonCreate], photo_urls: Optional[List[Optional[str]]] = None) -> List[Person]:
         pass
 
     @abstractmethod
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Person]:
+    def insert_rows(self, db: Session, rows: List[dict]) -> List[int]:
         pass
 
     @abstractmethod
-    def update(self, db: Session, person_id: int, person_data: PersonUpdate) -> Optional[Person]:
+    def profession_ids_by_name(self, db: Session) -> Dict[str, int]:
         pass
 
     @abstractmethod
-    def delete(self, db: Session, person_id: int) -> bool:
+    def get_by_id(self, db: Session, person_id: int, fields: Optional[List[str]] = None) -> Optional[Person]:
         pass
 
     @abstractmethod
-    def get_stats(self, db: Session) -> dict:
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> List[Person]:
+        pass
+
+    @abstractmethod
+    def get_page(self, db: Session, limit: int = 100, after: Optional[str] = None, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> Tuple[List[Person], Optional[str]]:
+        pass
+
+    @abstractmethod
+    def stream(self, db: Session, fields: List[str], filters: Optional[PersonListFilters] = None, batch_size: int = 1000) -> Iterator[Any]:
+        pass
+
+    @abstractmethod
+    def update(self, db: Session, person_id: int, values: dict, photo_url: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        pass
+
+    @abstractmethod
+    def delete(self, db: Session, person_id: int) -> Tuple[bool, Optional[str]]:
+        pass
+
+    @abstractmethod
+    def update_many(self, db: Session, values: dict, ids: Optional[List[int]] = None, filters: Optional[PersonListFilters] = None) -> int:
+        pass
+
+    @abstractmethod
+    def delete_many(self, db: Session, ids: List[int]) -> List[Optional[str]]:
+        pass
+
+    @abstractmethod
+    def set_photo_variant_sizes(self, db: Session, photo_urls: List[str], sizes: List[int]) -> None:
+        pass
+
+    @abstractmethod
+    def refresh_birthday_ages(self, db: Session, month: int, day: int, reference_year: int, chunk_size: int = 5000) -> int:
+        pass
+
+    @abstractmethod
+    def get_stats(self, db: Session, today: Optional[date] = None) -> dict:
+        pass
+
+    @abstractmethod
+    def compute_stats(self, db: Session, today: Optional[date] = None) -> dict:
         pass
@@ -0,0 +1,187 @@
+import calendar
+from collections import Counter, namedtuple
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import and_, case, extract, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.person import Person
+from app.models.profession import Profession
+from app.models.person_stats import PersonStatsProfession, PersonStatsBirthDate, PersonStatsMonth
+
+
+# Lo que una persona aporta a las tablas de resumen
+PersonStatsKey = namedtuple("PersonStatsKey", ["profession_id", "birth_date", "created_at"])
+
+# Rangos de edad del dashboard, en el orden en que se muestran
+AGE_RANGES = ("0-18", "19-35", "36-60", "60+")
+
+ROLLUP_MODELS = (PersonStatsProfession, PersonStatsBirthDate, PersonStatsMonth)
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def stats_key(person) -> PersonStatsKey:
+    return PersonStatsKey(person.profession_id, person.birth_date, person.created_at)
+
+
+def years_before(today: date, years: int) -> date:
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        # 29 de febrero en un año no bisiesto
+        return today.replace(year=today.year - years, day=28)
+
+
+def month_start(value: Optional[datetime]) -> date:
+    value = value or datetime.now()
+    return date(value.year, value.month, 1)
+
+
+def last_month_starts(today: date, months: int = 12) -> List[date]:
+    """
+    Primer día de cada uno de los últimos `months` meses calendario, en orden cronológico
+    """
+    month_starts = []
+    year, month = today.year, today.month
+    for _ in range(months):
+        month_starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    month_starts.reverse()
+    return month_starts
+
+
+def month_label(start: date) -> str:
+    return f"{calendar.month_name[start.month]} {start.year}"
+
+
+class PersonStatsRepository:
+    """
+    Tablas de resumen del dashboard: personas por profesión, por fecha de nacimiento y por mes de registro
+
+    PersonRepository aplica los cambios en la misma transacción que la escritura de la persona,
+    así el dashboard cuesta O(grupos) y no O(personas). Los rangos de edad no se guardan porque
+    cambian con la fecha: se suman sobre los conteos por fecha de nacimiento.
+    """
+
+    def apply(self, db: Session, added: Iterable[PersonStatsKey] = (), removed: Iterable[PersonStatsKey] = ()) -> None:
+        """
+        Suma las personas agregadas y resta las eliminadas (no hace commit)
+        """
+        by_profession, by_birth_date, by_month = Counter(), Counter(), Counter()
+        for sign, keys in ((1, added), (-1, removed)):
+            for key in keys:
+                by_profession[key.profession_id] += sign
+                by_birth_date[key.birth_date] += sign
+                by_month[month_start(key.created_at)] += sign
+        self.apply_counts(db, by_profession, by_birth_date, by_month)
+
+    def apply_counts(self, db: Session, by_profession: Optional[Counter] = None, by_birth_date: Optional[Counter] = None, by_month: Optional[Counter] = None) -> None:
+        """
+        Aplica deltas ya agrupados por profesión, fecha de nacimiento y mes (no hace commit)
+        """
+        self._increment(db, PersonStatsProfession, "profession_id", by_profession or Counter())
+        self._increment(db, PersonStatsBirthDate, "birth_date", by_birth_date or Counter())
+        self._increment(db, PersonStatsMonth, "month", by_month or Counter())
+
+    def _increment(self, db: Session, model, key: str, deltas: Counter) -> None:
+        # Orden fijo de llaves para que transacciones concurrentes bloqueen filas en el mismo orden
+        rows = [{key: value, "count": delta} for value, delta in sorted(deltas.items()) if delta]
+        if not rows:
+            return
+        table = model.__table__
+        dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[key], set_={"count": table.c.count + statement.excluded["count"]}
+            )
+            db.execute(statement)
+            return
+        for row in rows:
+            result = db.execute(update(table).where(table.c[key] == row[key]).values(count=table.c.count + row["count"]))
+            if result.rowcount == 0:
+                db.execute(insert(table).values(**row))
+
+    def get_stats(self, db: Session, today: Optional[date] = None) -> dict:
+        """
+        Estadísticas del dashboard leídas de las tablas de resumen (tres consultas)
+        """
+        today = today or date.today()
+        profession_stats = db.query(
+            Profession.name.label("profession_name"),
+            func.coalesce(PersonStatsProfession.count, 0).label("count")
+        ).outerjoin(PersonStatsProfession, PersonStatsProfession.profession_id == Profession.id).order_by(Profession.id).all()
+
+        born_after_18 = years_before(today, 19)
+        born_after_35 = years_before(today, 36)
+        born_after_60 = years_before(today, 61)
+        birth_date, count = PersonStatsBirthDate.birth_date, PersonStatsBirthDate.count
+        ages = db.query(
+            func.coalesce(func.sum(case((birth_date > born_after_18, count), else_=0)), 0),
+            func.coalesce(func.sum(case((and_(birth_date <= born_after_18, birth_date > born_after_35), count), else_=0)), 0),
+            func.coalesce(func.sum(case((and_(birth_date <= born_after_35, birth_date > born_after_60), count), else_=0)), 0),
+            func.coalesce(func.sum(case((birth_date <= born_after_60, count), else_=0)), 0),
+        ).one()
+
+        month_starts = last_month_starts(today)
+        monthly = dict(
+            db.query(PersonStatsMonth.month, PersonStatsMonth.count)
+            .filter(PersonStatsMonth.month >= month_starts[0])
+            .all()
+        )
+
+        return {
+            "total_persons": sum(stat.count for stat in profession_stats),
+            "total_professions": len(profession_stats),
+            "profession_distribution": [
+                {"profession_name": stat.profession_name, "count": stat.count}
+                for stat in profession_stats
+            ],
+            "age_distribution": [
+                {"range": range_name, "count": int(value)}
+                for range_name, value in zip(AGE_RANGES, ages)
+            ],
+            "monthly_registrations": [
+                {"month": month_label(start), "count": monthly.get(start, 0)}
+                for start in month_starts
+            ]
+        }
+
+    def rebuild(self, db: Session) -> dict:
+        """
+        Recalcula las tablas de resumen desde persons y hace commit
+
+        En PostgreSQL bloquea las tablas de resumen mientras tanto: las escrituras concurrentes
+        esperan y aplican su cambio sobre el resultado ya recalculado.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            tables = ", ".join(model.__tablename__ for model in ROLLUP_MODELS)
+            db.execute(text(f"LOCK TABLE {tables} IN EXCLUSIVE MODE"))
+        for model in ROLLUP_MODELS:
+            db.query(model).delete(synchronize_session=False)
+
+        db.execute(insert(PersonStatsProfession).from_select(
+            ["profession_id", "count"],
+            select(Person.profession_id, func.count(Person.id)).group_by(Person.profession_id)
+        ))
+        db.execute(insert(PersonStatsBirthDate).from_select(
+            ["birth_date", "count"],
+            select(Person.birth_date, func.count(Person.id)).group_by(Person.birth_date)
+        ))
+        year_column = extract("year", Person.created_at)
+        month_column = extract("month", Person.created_at)
+        months = [
+            {"month": date(int(year), int(month), 1), "count": count}
+            for year, month, count in db.query(year_column, month_column, func.count(Person.id))
+            .filter(Person.created_at.isnot(None))
+            .group_by(year_column, month_column)
+        ]
+        if months:
+            db.execute(insert(PersonStatsMonth), months)
+        db.commit()
+
+        return {model.__tablename__: db.query(model).count() for model in ROLLUP_MODELS}
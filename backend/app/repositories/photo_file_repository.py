@@ -0,0 +1,53 @@
+from typing import Optional
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.photo_file import PhotoFile
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class PhotoFileRepository:
+    """
+    Conteo de referencias de las fotos guardadas por contenido
+
+    Los métodos no confirman: el llamador mueve o elimina el archivo mientras la fila sigue
+    bloqueada y luego hace commit, así una subida y un borrado de la misma foto no se cruzan.
+    """
+
+    def acquire(self, db: Session, sha256: str, extension: str, size: int) -> int:
+        """
+        Suma una referencia a la foto (creándola si no existe) y retorna el nuevo conteo
+        """
+        table = PhotoFile.__table__
+        dialect_insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(sha256=sha256, extension=extension, size=size, ref_count=1)
+            statement = statement.on_conflict_do_update(
+                index_elements=["sha256"], set_={"ref_count": table.c.ref_count + 1}
+            ).returning(table.c.ref_count)
+            return db.execute(statement).scalar_one()
+        ref_count = db.execute(
+            update(table).where(table.c.sha256 == sha256).values(ref_count=table.c.ref_count + 1).returning(table.c.ref_count)
+        ).scalar()
+        if ref_count is None:
+            db.execute(insert(table).values(sha256=sha256, extension=extension, size=size, ref_count=1))
+            ref_count = 1
+        return ref_count
+
+    def release(self, db: Session, sha256: str) -> Optional[int]:
+        """
+        Resta una referencia y retorna las que quedan (None si la foto no estaba registrada)
+
+        Al llegar a cero se elimina la fila; el llamador elimina el archivo.
+        """
+        ref_count = db.execute(
+            update(PhotoFile).where(PhotoFile.sha256 == sha256).values(ref_count=PhotoFile.ref_count - 1).returning(PhotoFile.ref_count)
+        ).scalar()
+        if ref_count is not None and ref_count <= 0:
+            db.execute(delete(PhotoFile).where(PhotoFile.sha256 == sha256))
+            ref_count = 0
+        return ref_count
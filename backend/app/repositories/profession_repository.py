@@ -1,25 +1,40 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from typing import List, Optional
+from app.core.cache import stats_cache
 from app.models.profession import Profession
 from app.schemas.profession_request_response import ProfessionCreate, ProfessionUpdate
 from app.repositories.profession_repository_interface import ProfessionRepositoryInterface
 
 class ProfessionRepository(ProfessionRepositoryInterface):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     async def get_by_id(self, profession_id: int) -> Optional[Profession]:
-        return self.db.query(Profession).filter(Profession.id == profession_id).first()
+        return await self.db.get(Profession, profession_id)
     
     async def get_by_name(self, name: str) -> Optional[Profession]:
         # Buscar por nombre en mayúsculas
-        return self.db.query(Profession).filter(
-            func.upper(Profession.name) == name.upper()
-        ).first()
+        result = await self.db.execute(
+            select(Profession).where(func.upper(Profession.name) == name.upper())
+        )
+        return result.scalars().first()
     
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Profession]:
-        return self.db.query(Profession).order_by(Profession.name).offset(skip).limit(limit).all()
+        result = await self.db.execute(
+            select(Profession).order_by(Profession.name).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def search(self, query: str, limit: int = 100) -> List[Profession]:
+        # El filtro se resuelve en la base de datos en lugar de traer todo el catálogo
+        result = await self.db.execute(
+            select(Profession)
+            .where(func.upper(Profession.name).contains(query.upper(), autoescape=True))
+            .order_by(Profession.name)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
     
     async def create(self, profession_data: ProfessionCreate) -> Profession:
         # Verificar si ya existe
@@ -29,8 +44,10 @@ class ProfessionRepository(ProfessionRepositoryInterface):
         
         profession = Profession(**profession_data.model_dump())
         self.db.add(profession)
-        self.db.commit()
-        self.db.refresh(profession)
+        await self.db.commit()
+        # total_professions y los nombres de la distribución del dashboard cambian
+        stats_cache.invalidate()
+        await self.db.refresh(profession)
         return profession
     
     async def update(self, profession_id: int, profession_data: ProfessionUpdate) -> Optional[Profession]:
@@ -48,8 +65,9 @@ class ProfessionRepository(ProfessionRepositoryInterface):
         for field, value in update_data.items():
             setattr(profession, field, value)
         
-        self.db.commit()
-        self.db.refresh(profession)
+        await self.db.commit()
+        stats_cache.invalidate()
+        await self.db.refresh(profession)
         return profession
     
     async def delete(self, profession_id: int) -> bool:
@@ -57,9 +75,10 @@ class ProfessionRepository(ProfessionRepositoryInterface):
         if not profession:
             return False
         
-        self.db.delete(profession)
-        self.db.commit()
+        await self.db.delete(profession)
+        await self.db.commit()
+        stats_cache.invalidate()
         return True
     
     async def count(self) -> int:
-        return self.db.query(Profession).count()
+        return await self.db.scalar(select(func.count()).select_from(Profession))
@@ -16,6 +16,10 @@ class ProfessionRepositoryInterface(ABC):
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[Profession]:
         pass
     
+    @abstractmethod
+    async def search(self, query: str, limit: int = 100) -> List[Profession]:
+        pass
+    
     @abstractmethod
     async def create(self, profession_data: ProfessionCreate) -> Profession:
         pass
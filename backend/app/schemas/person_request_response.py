@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, validator
 
 
@@ -79,7 +79,9 @@ class PersonResponse(BaseModel):
     address: str
     phone: str
     photo_url: Optional[str] = None
-    created_at: datetime
+    # Derivadas WebP de la foto por tamaño en px ({"64": url, "256": url, ...})
+    photo_variants: Optional[Dict[str, str]] = None
+    created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     class Config:
@@ -87,6 +89,10 @@ class PersonResponse(BaseModel):
         populate_by_name = True
 
 
+# Campos que se pueden solicitar con el parámetro fields= (photo_variants se deriva de photo_url y sus tamaños generados)
+PERSON_RESPONSE_FIELDS = tuple(field for field in PersonResponse.model_fields if field != "photo_variants")
+
+
 class PersonListResponse(BaseModel):
     data: list[PersonResponse]
     total: int
@@ -95,9 +101,113 @@ class PersonListResponse(BaseModel):
     success: bool = True
 
 
+# Campos por los que se permite ordenar el listado ("-campo" para orden descendente)
+PERSON_SORT_FIELDS = ("id", "first_name", "last_name", "birth_date", "age", "created_at")
+
+
+class PersonListFilters(BaseModel):
+    profession_id: Optional[int] = Field(None, description="ID de la profesión")
+    min_age: Optional[int] = Field(None, ge=0, description="Edad mínima")
+    max_age: Optional[int] = Field(None, ge=0, description="Edad máxima")
+    birth_date_from: Optional[date] = Field(None, description="Fecha de nacimiento desde (inclusive)")
+    birth_date_to: Optional[date] = Field(None, description="Fecha de nacimiento hasta (inclusive)")
+    created_from: Optional[datetime] = Field(None, description="Fecha de registro desde (inclusive)")
+    created_to: Optional[datetime] = Field(None, description="Fecha de registro hasta (exclusive)")
+    sort: str = Field("id", description="Campo de ordenamiento, con prefijo '-' para descendente")
+
+    @validator('sort')
+    def validate_sort(cls, v):
+        if v.lstrip('-') not in PERSON_SORT_FIELDS:
+            raise ValueError(f"Ordenamiento no permitido. Use uno de: {', '.join(PERSON_SORT_FIELDS)}")
+        return v
+
+    @validator('max_age')
+    def validate_age_range(cls, v, values):
+        min_age = values.get('min_age')
+        if v is not None and min_age is not None and v < min_age:
+            raise ValueError('La edad máxima no puede ser menor que la edad mínima')
+        return v
+
+
+class PersonPageResponse(BaseModel):
+    data: list[PersonResponse]
+    next_cursor: Optional[str] = None
+    limit: int
+    success: bool = True
+
+
 class PersonStatsResponse(BaseModel):
     total_persons: int
     professions_count: dict
     age_ranges: dict
     monthly_registrations: dict
     success: bool = True
+
+
+# Máximo de ids por petición en las operaciones masivas
+BULK_MAX_IDS = 10000
+
+
+class PersonPatchRequest(BaseModel):
+    first_name: Optional[str] = Field(None, min_length=2, max_length=100)
+    last_name: Optional[str] = Field(None, min_length=2, max_length=100)
+    birth_date: Optional[str] = Field(None, description="Fecha de nacimiento en formato YYYY-MM-DD")
+    profession_id: Optional[int] = None
+    address: Optional[str] = Field(None, min_length=5, max_length=500)
+    phone: Optional[str] = Field(None, min_length=10, max_length=15, pattern=r'^\d{10,15}$')
+
+    # Mismas reglas que al crear una persona
+    _validate_names = validator('first_name', 'last_name', allow_reuse=True)(PersonCreateRequest.validate_names.__func__)
+    _validate_phone = validator('phone', allow_reuse=True)(PersonCreateRequest.validate_phone.__func__)
+    _validate_address = validator('address', allow_reuse=True)(PersonCreateRequest.validate_address.__func__)
+    _validate_birth_date = validator('birth_date', allow_reuse=True)(PersonCreateRequest.validate_birth_date.__func__)
+
+
+class PersonBulkUpdateRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=BULK_MAX_IDS, description="IDs de las personas a actualizar")
+    filters: Optional[PersonListFilters] = Field(None, description="Filtros del listado que seleccionan las personas")
+    values: PersonPatchRequest
+
+    @validator('values')
+    def validate_target(cls, v, values):
+        if (values.get('ids') is None) == (values.get('filters') is None):
+            raise ValueError('Indique ids o filters, pero no ambos')
+        # Unos filtros vacíos seleccionarían a todas las personas
+        filters = values.get('filters')
+        if filters is not None and not filters.model_dump(exclude_none=True, exclude={'sort'}):
+            raise ValueError('Indique al menos un filtro en filters')
+        if not v.model_dump(exclude_none=True):
+            raise ValueError('Indique al menos un campo a actualizar')
+        return v
+
+
+class PersonBulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_IDS, description="IDs de las personas a eliminar")
+
+
+class PersonBulkResponse(BaseModel):
+    affected: int
+    message: str
+    success: bool = True
+
+
+class PersonImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class PersonImportJobResponse(BaseModel):
+    job_id: str
+    filename: str
+    status: str
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    inserted_rows: int = 0
+    error_count: int = 0
+    errors: list[PersonImportRowError] = []
+    rows_per_second: Optional[float] = None
+    message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    success: bool = True
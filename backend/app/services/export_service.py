@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List
+
+
+class ExportService:
+    """
+    Serializa filas a CSV o NDJSON por bloques para enviarlas como stream
+    """
+
+    FORMATS = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+    }
+
+    def __init__(self, chunk_rows: int = 1000):
+        self.chunk_rows = chunk_rows
+
+    def media_type(self, export_format: str, compress: bool = False) -> str:
+        return "application/gzip" if compress else self.FORMATS[export_format]
+
+    def filename(self, name: str, export_format: str, compress: bool = False) -> str:
+        return f"{name}.{export_format}.gz" if compress else f"{name}.{export_format}"
+
+    def stream(self, rows: Iterable[Any], fields: List[str], export_format: str, compress: bool = False) -> Iterator[bytes]:
+        """
+        Genera el archivo por bloques de chunk_rows filas, opcionalmente comprimido con gzip
+        """
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Formato no soportado. Use uno de: {', '.join(self.FORMATS)}")
+
+        chunks = self._csv_chunks(rows, fields) if export_format == "csv" else self._ndjson_chunks(rows, fields)
+        if not compress:
+            for chunk in chunks:
+                yield chunk.encode("utf-8")
+            return
+
+        # wbits=31 produce un stream con cabecera gzip
+        compressor = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def _csv_chunks(self, rows: Iterable[Any], fields: List[str]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        count = 0
+        for row in rows:
+            writer.writerow([self._value(getattr(row, field)) for field in fields])
+            count += 1
+            if count % self.chunk_rows == 0:
+                yield self._drain(buffer)
+        yield self._drain(buffer)
+
+    def _ndjson_chunks(self, rows: Iterable[Any], fields: List[str]) -> Iterator[str]:
+        lines = []
+        for row in rows:
+            record = {field: self._value(getattr(row, field)) for field in fields}
+            lines.append(json.dumps(record, ensure_ascii=False))
+            if len(lines) >= self.chunk_rows:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> str:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    @staticmethod
+    def _value(value: Any) -> Any:
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
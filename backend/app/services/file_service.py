@@ -1,76 +1,182 @@
+import asyncio
+import hashlib
 import os
-import shutil
+import re
 import uuid
 from typing import Optional
+import aiofiles
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.metrics import photo_uploads_total, photo_upload_bytes_total
+from app.db.database import SessionLocal
+from app.repositories.photo_file_repository import PhotoFileRepository
+from app.services.image_service import delete_variants, generate_variants, get_image_pool, missing_variants
+
+# Tipos de imagen aceptados según sus primeros bytes: extensión -> partes (desplazamiento, bytes) de la firma
+PHOTO_SIGNATURES = {
+    ".jpg": ((0, b"\xff\xd8\xff"),),
+    ".png": ((0, b"\x89PNG\r\n\x1a\n"),),
+    ".webp": ((0, b"RIFF"), (8, b"WEBP")),
+}
+ALLOWED_CONTENT_TYPES = ("image/jpeg", "image/png", "image/jpg", "image/webp")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Las subidas se escriben primero aquí (mismo sistema de archivos, para moverlas de forma atómica)
+TEMP_DIR = "tmp"
+# Fotos guardadas por contenido: ab/cd/<sha256><ext>
+PHOTO_NAME_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.[a-z]+$")
+
+
+def detect_photo_extension(head: bytes) -> Optional[str]:
+    """
+    Extensión de la imagen según sus primeros bytes, o None si no es un tipo aceptado
+    """
+    for extension, parts in PHOTO_SIGNATURES.items():
+        if all(head[offset:offset + len(signature)] == signature for offset, signature in parts):
+            return extension
+    return None
+
+
+def photo_name(sha256: str, extension: str) -> str:
+    """
+    Ruta relativa a uploads de una foto guardada por contenido; dos niveles de directorios
+    para no acumular cientos de miles de archivos en uno solo
+    """
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
 
 
 class FileService:
     def __init__(self):
         self.upload_dir = "uploads"
-        os.makedirs(self.upload_dir, exist_ok=True)
+        self.photo_repository = PhotoFileRepository()
+        os.makedirs(os.path.join(self.upload_dir, TEMP_DIR), exist_ok=True)
 
     async def save_photo(self, file: UploadFile) -> Optional[str]:
         """
         Guarda una foto de persona y retorna la URL del archivo
+
+        El archivo se escribe por bloques con E/S asíncrona: el tipo se valida con los primeros
+        bytes y el tamaño máximo mientras se copia, sin esperar a tener el archivo completo.
+        La foto se guarda por su SHA-256 en uploads/ab/cd/<hash><ext>: si ya existe solo se
+        suma una referencia. Las derivadas WebP que falten se generan en el pool de imágenes,
+        de modo que al retornar existen todas las de settings.photo_variant_sizes.
         """
+        max_size = settings.max_file_size
+        temp_path = None
         try:
-            # Validar tipo de archivo
-            allowed_types = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
-            if file.content_type not in allowed_types:
+            # Validar tipo declarado y, si se conoce de antemano, el tamaño
+            if file.content_type not in ALLOWED_CONTENT_TYPES:
                 raise HTTPException(status_code=400, detail="Tipo de archivo no permitido. Solo se permiten imágenes.")
-
-            # Validar tamaño del archivo (5MB máximo)
-            max_size = 5 * 1024 * 1024  # 5MB
             if file.size and file.size > max_size:
-                raise HTTPException(status_code=400, detail="El archivo es muy grande. Máximo 5MB.")
+                raise HTTPException(status_code=400, detail=f"El archivo es muy grande. Máximo {max_size // (1024 * 1024)}MB.")
+
+            # El contenido real se valida con la firma del primer bloque
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            file_extension = detect_photo_extension(chunk)
+            if file_extension is None:
+                raise HTTPException(status_code=400, detail="El contenido del archivo no es una imagen válida.")
 
-            # Generar nombre único para el archivo
-            file_extension = os.path.splitext(file.filename)[1] if file.filename else ".jpg"
-            filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = os.path.join(self.upload_dir, filename)
+            # Copiar a un temporal calculando el hash mientras se escribe
+            temp_path = os.path.join(self.upload_dir, TEMP_DIR, uuid.uuid4().hex)
+            digest = hashlib.sha256()
+            written = 0
+            async with aiofiles.open(temp_path, "wb") as buffer:
+                while chunk:
+                    written += len(chunk)
+                    if written > max_size:
+                        raise HTTPException(status_code=400, detail=f"El archivo es muy grande. Máximo {max_size // (1024 * 1024)}MB.")
+                    digest.update(chunk)
+                    await buffer.write(chunk)
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
 
-            # Guardar archivo
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            sha256 = digest.hexdigest()
+            name = photo_name(sha256, file_extension)
+            # Foto nueva, o ya guardada sin alguna derivada de los tamaños configurados
+            await self._generate_variants(temp_path, name)
+            stored = await run_in_threadpool(self._store, temp_path, sha256, file_extension, written, name)
+            temp_path = None
+            # Si la copia existente se eliminó mientras tanto, sus derivadas se borraron con ella
+            if stored:
+                await self._generate_variants(os.path.join(self.upload_dir, name), name)
+
+            photo_uploads_total.inc()
+            if stored:
+                photo_upload_bytes_total.inc(amount=written)
 
             # Retornar URL relativa
-            return f"/uploads/{filename}"
+            return f"/uploads/{name}"
 
         except Exception as e:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            if isinstance(e, HTTPException):
+                raise
             raise HTTPException(status_code=500, detail=f"Error al guardar el archivo: {str(e)}")
 
     def delete_photo(self, photo_url: str) -> bool:
         """
-        Elimina una foto del sistema de archivos
+        Libera una referencia a la foto; el archivo y sus derivadas se eliminan con la última
+
+        Las fotos anteriores al almacenamiento por contenido (uploads/<uuid><ext>) tienen una
+        sola referencia y se eliminan directamente.
         """
         try:
-            if photo_url and photo_url.startswith("/uploads/"):
-                filename = photo_url.replace("/uploads/", "")
-                file_path = os.path.join(self.upload_dir, filename)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    return True
-            return False
+            if not photo_url or not photo_url.startswith("/uploads/"):
+                return False
+            name = photo_url[len("/uploads/"):]
+            match = PHOTO_NAME_PATTERN.match(name)
+            if match is None:
+                return self._remove(name)
+            db = SessionLocal()
+            try:
+                remaining = self.photo_repository.release(db, match.group(1))
+                removed = self._remove(name) if not remaining else False
+                db.commit()
+                return removed
+            finally:
+                db.close()
         except Exception:
             return False
 
-            return f"/uploads/{filename}"
-
-        except Exception as e:
-            raise ValueError(f"Error al guardar el archivo: {str(e)}")
+    def _store(self, temp_path: str, sha256: str, extension: str, size: int, name: str) -> bool:
+        # El archivo se mueve a su lugar con la fila de photo_files bloqueada; retorna si se guardó
+        path = os.path.join(self.upload_dir, name)
+        db = SessionLocal()
+        stored = False
+        try:
+            self.photo_repository.acquire(db, sha256, extension, size)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+                stored = True
+            db.commit()
+        except Exception:
+            db.rollback()
+            if stored:
+                os.remove(path)
+            raise
+        finally:
+            db.close()
+            if not stored and os.path.exists(temp_path):
+                os.remove(temp_path)
+        return stored
 
-    def delete_file(self, file_path: str) -> bool:
-        """
-        Elimina un archivo del sistema
-        """
+    async def _generate_variants(self, source: str, name: str) -> None:
+        targets = missing_variants(self.upload_dir, name, settings.photo_variant_sizes)
+        if not targets:
+            return
         try:
-            if file_path.startswith("/uploads/"):
-                full_path = os.path.join(self.upload_dir, file_path.replace("/uploads/", ""))
-                if os.path.exists(full_path):
-                    os.remove(full_path)
-                    return True
-            return False
+            await asyncio.wrap_future(get_image_pool().submit(generate_variants, source, targets, settings.photo_variant_quality))
         except Exception:
-            return False
+            if not os.path.exists(os.path.join(self.upload_dir, name)):
+                delete_variants(self.upload_dir, name)
+            raise HTTPException(status_code=400, detail="La imagen no se pudo procesar.")
+
+    def _remove(self, name: str) -> bool:
+        delete_variants(self.upload_dir, name)
+        file_path = os.path.join(self.upload_dir, name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            return True
+        return False
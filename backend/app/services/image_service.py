@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from PIL import Image, ImageOps
+from app.core.config import settings
+
+# Las derivadas se guardan en un árbol paralelo dentro de uploads: variants/<nombre>_<tamaño>.webp
+VARIANTS_DIR = "variants"
+
+_image_pool: Optional[ProcessPoolExecutor] = None
+_image_pool_lock = threading.Lock()
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """
+    Pool de procesos acotado (IMAGE_WORKERS) para generar derivadas sin ocupar los workers de la API
+    """
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is None:
+            _image_pool = ProcessPoolExecutor(
+                max_workers=max(settings.image_workers, 1),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _image_pool
+
+
+def shutdown_image_pool() -> None:
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is not None:
+            _image_pool.shutdown(wait=False, cancel_futures=True)
+            _image_pool = None
+
+
+def variant_name(name: str, size: int) -> str:
+    """
+    Nombre relativo a uploads de una derivada; name es el de la foto original (p. ej. "ab/cd/<hash>.jpg")
+    """
+    return f"{VARIANTS_DIR}/{os.path.splitext(name)[0]}_{size}.webp"
+
+
+def variant_paths(upload_dir: str, name: str, sizes: Sequence[int]) -> Dict[int, str]:
+    return {size: os.path.join(upload_dir, variant_name(name, size)) for size in sizes}
+
+
+def missing_variants(upload_dir: str, name: str, sizes: Sequence[int]) -> Dict[int, str]:
+    """
+    Derivadas de la foto que todavía no existen en disco (tamaño -> ruta)
+    """
+    return {size: path for size, path in variant_paths(upload_dir, name, sizes).items() if not os.path.exists(path)}
+
+
+def photo_variant_urls(photo_url: Optional[str], sizes: Optional[Sequence[int]]) -> Optional[Dict[str, str]]:
+    """
+    URLs de las derivadas WebP de una foto, por tamaño ({"64": "/uploads/variants/..."})
+
+    sizes son los tamaños que se guardaron con la persona al generarlas; sin ellos no se
+    publica ninguna URL y el cliente usa photo_url.
+    """
+    if not photo_url or not photo_url.startswith("/uploads/") or not sizes:
+        return None
+    name = photo_url[len("/uploads/"):]
+    return {str(size): f"/uploads/{variant_name(name, size)}" for size in sizes}
+
+
+def generate_variants(source: str, targets: Dict[int, str], quality: int) -> List[str]:
+    """
+    Genera las copias WebP reducidas de una foto (corre en el pool de procesos)
+
+    targets es tamaño -> ruta de destino. Cada derivada conserva la proporción y su lado
+    mayor no supera el tamaño indicado; la orientación EXIF se aplica antes de reducir.
+    Retorna las rutas generadas.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        # De mayor a menor: cada derivada se reduce desde la anterior, que ya es más liviana
+        for size, path in sorted(targets.items(), reverse=True):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.thumbnail((size, size), Image.LANCZOS)
+            image.save(path, "WEBP", quality=quality, method=4)
+    return list(targets.values())
+
+
+def delete_variants(upload_dir: str, name: str) -> None:
+    for path in variant_paths(upload_dir, name, settings.photo_variant_sizes).values():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,296 @@
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.schemas.person_request_response import PersonCreateRequest
+from app.repositories.person_repository import PersonRepository
+
+# Extensiones aceptadas y el formato con que se leen
+IMPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+# Columnas obligatorias; la profesión se indica con profession_name o profession_id
+REQUIRED_COLUMNS = ("first_name", "last_name", "birth_date", "address", "phone")
+HEADER_ALIASES = {"profession": "profession_name"}
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Pool de procesos compartido por las importaciones del worker (se crea en el primer uso)
+
+    Se usa spawn: el proceso del servidor tiene hilos y conexiones abiertas que no deben
+    heredarse con fork.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.import_workers or None,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def normalize_header(header: Sequence[Any]) -> List[str]:
+    columns = []
+    for name in header:
+        column = str(name or "").strip().lower().replace(" ", "_")
+        columns.append(HEADER_ALIASES.get(column, column))
+    return columns
+
+
+def missing_columns(columns: Sequence[str]) -> List[str]:
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if "profession_name" not in columns and "profession_id" not in columns:
+        missing.append("profession_name o profession_id")
+    return missing
+
+
+def _cell(value: Any) -> str:
+    # XLSX entrega fechas y números tipados; CSV siempre texto
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _resolve_profession(data: Dict[str, str], professions: Dict[str, int], profession_ids: set) -> Tuple[Optional[int], Optional[str]]:
+    raw_id = data.get("profession_id")
+    if raw_id:
+        try:
+            profession_id = int(raw_id)
+        except ValueError:
+            return None, "profession_id: debe ser un número entero"
+        if profession_id not in profession_ids:
+            return None, f"Profesión no encontrada: {profession_id}"
+        return profession_id, None
+    name = data.get("profession_name")
+    if not name:
+        return None, "profession_name: la profesión es obligatoria"
+    profession_id = professions.get(name.upper())
+    if profession_id is None:
+        return None, f"Profesión no encontrada: {name}"
+    return profession_id, None
+
+
+def validate_records(records: Iterable[Tuple[int, Dict[str, Any]]], professions: Dict[str, int], today: date) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """
+    Valida registros (número de fila o línea, datos) con las reglas de PersonCreateRequest
+
+    professions es el mapa nombre -> id. Retorna (número, fila lista para insertar) de los
+    registros válidos y los errores ({"row": número, "errors": [...]}) de los inválidos.
+    """
+    profession_ids = set(professions.values())
+    valid, errors = [], []
+    for line, record in records:
+        data = {column: _cell(value) for column, value in record.items() if column}
+        messages = []
+        profession_id, profession_error = _resolve_profession(data, professions, profession_ids)
+        if profession_error:
+            messages.append(profession_error)
+        try:
+            person = PersonCreateRequest(
+                first_name=data.get("first_name", ""),
+                last_name=data.get("last_name", ""),
+                birth_date=data.get("birth_date", ""),
+                profession_id=profession_id or 0,
+                address=data.get("address", ""),
+                phone=data.get("phone", "")
+            )
+        except ValidationError as e:
+            messages.extend(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+            person = None
+        if messages:
+            errors.append({"row": line, "errors": messages})
+            continue
+        birth_date = datetime.strptime(person.birth_date, '%Y-%m-%d').date()
+        valid.append((line, {
+            "first_name": person.first_name,
+            "last_name": person.last_name,
+            "birth_date": birth_date,
+            "age": PersonRepository.calculate_age(birth_date, today),
+            "profession_id": person.profession_id,
+            "address": person.address,
+            "phone": person.phone,
+            "photo_url": None,
+        }))
+    return valid, errors
+
+
+def validate_chunk(columns: List[str], rows: List[Tuple[int, Sequence[Any]]], professions: Dict[str, int], today: date) -> Tuple[List[dict], List[dict], int]:
+    """
+    Valida un bloque de filas de un archivo (corre en el pool de procesos)
+
+    Retorna las filas listas para insertar, los errores por fila y la cantidad de filas procesadas.
+    """
+    valid, errors = validate_records(((line, dict(zip(columns, values))) for line, values in rows), professions, today)
+    return [row for _, row in valid], errors, len(rows)
+
+
+def validate_ndjson_lines(lines: List[Tuple[int, Optional[bytes]]], professions: Dict[str, int], today: date) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """
+    Decodifica y valida líneas NDJSON; una línea en None es una que superó el tamaño máximo
+    """
+    records, errors = [], []
+    for line, raw in lines:
+        if raw is None:
+            errors.append({"row": line, "errors": ["La línea supera el tamaño máximo permitido"]})
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            errors.append({"row": line, "errors": ["JSON inválido"]})
+            continue
+        if not isinstance(record, dict):
+            errors.append({"row": line, "errors": ["Cada línea debe ser un objeto JSON"]})
+            continue
+        records.append((line, record))
+    valid, invalid = validate_records(records, professions, today)
+    return valid, errors + invalid
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Separa un stream de bytes en líneas NDJSON (número de línea, contenido) sin acumular el cuerpo
+
+    Las líneas vacías se omiten; una línea más larga que max_line_bytes se descarta y se
+    entrega como None para reportarla.
+    """
+    buffer = bytearray()
+    line = 0
+    oversized = False
+    async for chunk in stream:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            line += 1
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield line, None
+            else:
+                buffer += chunk[start:end]
+                if buffer.strip():
+                    yield line, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                oversized = True
+                buffer.clear()
+    if oversized or buffer.strip():
+        yield line + 1, None if oversized else bytes(buffer)
+
+
+class ImportService:
+    """
+    Lectura de archivos CSV/XLSX de personas para las importaciones en segundo plano
+    """
+
+    def file_format(self, filename: Optional[str]) -> str:
+        extension = os.path.splitext(filename or "")[1].lower()
+        if extension not in IMPORT_FORMATS:
+            raise ValueError(f"Formato no soportado. Use uno de: {', '.join(IMPORT_FORMATS)}")
+        return IMPORT_FORMATS[extension]
+
+    def save_upload(self, source: BinaryIO, file_format: str) -> str:
+        """
+        Copia el archivo subido a un temporal por bloques, validando el tamaño máximo
+        """
+        max_size = settings.import_max_file_size
+        fd, path = tempfile.mkstemp(prefix="persons_import_", suffix=f".{file_format}")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                written = 0
+                while True:
+                    block = source.read(1024 * 1024)
+                    if not block:
+                        break
+                    written += len(block)
+                    if written > max_size:
+                        raise ValueError(f"El archivo es muy grande. Máximo {max_size // (1024 * 1024)}MB.")
+                    buffer.write(block)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
+
+    def count_rows(self, path: str, file_format: str) -> int:
+        """
+        Filas de datos del archivo (sin encabezado), para reportar el avance
+        """
+        if file_format == "xlsx":
+            workbook = self._open_workbook(path)
+            try:
+                return max((workbook.active.max_row or 1) - 1, 0)
+            finally:
+                workbook.close()
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            return max(sum(1 for row in csv.reader(source) if any(row)) - 1, 0)
+
+    def read_rows(self, path: str, file_format: str) -> Iterator[Tuple[int, Sequence[Any]]]:
+        """
+        Genera (número de fila, valores) en orden; la primera fila es el encabezado
+        """
+        if file_format == "xlsx":
+            workbook = self._open_workbook(path)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                for line, values in enumerate(rows, start=1):
+                    if any(value not in (None, "") for value in values):
+                        yield line, values
+            finally:
+                workbook.close()
+            return
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            for line, values in enumerate(csv.reader(source), start=1):
+                if any(values):
+                    yield line, values
+
+    @staticmethod
+    def chunks(rows: Iterator[Tuple[int, Sequence[Any]]], size: int) -> Iterator[List[Tuple[int, Sequence[Any]]]]:
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _open_workbook(path: str):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("La importación de archivos XLSX requiere openpyxl")
+        return load_workbook(path, read_only=True, data_only=True)
+
+    @staticmethod
+    def delete_upload(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
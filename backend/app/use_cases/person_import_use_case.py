@@ -0,0 +1,172 @@
+import json
+import os
+import uuid
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from fastapi import BackgroundTasks, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.import_job import ImportJob
+from app.repositories.import_job_repository import ImportJobRepository, MAX_REPORTED_ERRORS
+from app.repositories.person_repository import PersonRepository
+from app.repositories.async_person_repository import AsyncPersonRepository
+from app.schemas.person_request_response import PersonImportJobResponse
+from app.services.import_service import ImportService, get_process_pool, iter_ndjson_lines, missing_columns, normalize_header, validate_chunk, validate_ndjson_lines
+
+
+class PersonImportUseCase:
+    def __init__(self):
+        self.person_repository = PersonRepository()
+        self.async_repository = AsyncPersonRepository()
+        self.job_repository = ImportJobRepository()
+        self.import_service = ImportService()
+
+    async def start_import(self, db: AsyncSession, file: UploadFile, background_tasks: BackgroundTasks) -> PersonImportJobResponse:
+        """
+        Caso de uso para registrar una importación y procesarla en segundo plano
+
+        El archivo se copia a un temporal y la importación corre después de responder.
+        """
+        file_format = self.import_service.file_format(file.filename)
+        path = await run_in_threadpool(self.import_service.save_upload, file.file, file_format)
+        try:
+            job = await db.run_sync(self.job_repository.create, uuid.uuid4().hex, file.filename)
+        except Exception:
+            self.import_service.delete_upload(path)
+            raise
+        background_tasks.add_task(self.run_import, job.id, path, file_format)
+        return self._to_response(job)
+
+    def run_import(self, job_id: str, path: str, file_format: str) -> None:
+        """
+        Procesa la importación: valida bloques en el pool de procesos e inserta las filas válidas
+
+        Cada bloque se inserta y confirma por separado, en el orden del archivo, y el
+        progreso queda en import_jobs. Las filas inválidas se reportan sin detener la carga.
+        """
+        db = SessionLocal()
+        pending = deque()
+        try:
+            self.job_repository.start(db, job_id, self.import_service.count_rows(path, file_format))
+            rows = self.import_service.read_rows(path, file_format)
+            header = next(rows, None)
+            columns = normalize_header(header[1] if header else [])
+            missing = missing_columns(columns)
+            if missing:
+                raise ValueError(f"Columnas faltantes: {', '.join(missing)}")
+
+            professions = self.person_repository.profession_ids_by_name(db)
+            today = date.today()
+            pool = get_process_pool()
+            # Se mantienen algunos bloques en vuelo para que validar e insertar se solapen
+            window = (settings.import_workers or os.cpu_count() or 1) * 2
+            reported_errors = []
+            for chunk in self.import_service.chunks(rows, settings.import_chunk_size):
+                pending.append(pool.submit(validate_chunk, columns, chunk, professions, today))
+                if len(pending) >= window:
+                    self._load_chunk(db, job_id, pending.popleft().result(), reported_errors)
+            while pending:
+                self._load_chunk(db, job_id, pending.popleft().result(), reported_errors)
+            self.job_repository.finish(db, job_id, "completed")
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            db.rollback()
+            self.job_repository.finish(db, job_id, "failed", str(e))
+        finally:
+            db.close()
+            self.import_service.delete_upload(path)
+
+    async def ingest_ndjson(self, session_factory: Callable[[], AsyncSession], stream: AsyncIterator[bytes], report_created: bool = True) -> AsyncIterator[str]:
+        """
+        Caso de uso para ingerir personas desde un cuerpo NDJSON leído como stream
+
+        Las líneas se validan e insertan en bloques de INGEST_COMMIT_ROWS (un INSERT y un commit
+        por bloque) y se responde una línea NDJSON por cada línea recibida; con report_created
+        en False solo se reportan los errores y un avance por bloque. La última línea es el resumen.
+        """
+        totals = {"created": 0, "failed": 0}
+        last_line = 0
+        async with session_factory() as db:
+            professions = await self.async_repository.profession_ids_by_name(db)
+            today = date.today()
+            batch = []
+            async for line, raw in iter_ndjson_lines(stream, settings.ingest_max_line_bytes):
+                batch.append((line, raw))
+                last_line = line
+                if len(batch) >= settings.ingest_commit_rows:
+                    for result in await self._ingest_batch(db, batch, professions, today, totals, report_created):
+                        yield result
+                    batch = []
+            if batch:
+                for result in await self._ingest_batch(db, batch, professions, today, totals, report_created):
+                    yield result
+        yield json.dumps({"status": "done", "lines": last_line, **totals}) + "\n"
+
+    async def get_import_job(self, db: AsyncSession, job_id: str) -> Optional[PersonImportJobResponse]:
+        """
+        Caso de uso para consultar el estado de una importación
+        """
+        job = await db.run_sync(self.job_repository.get, job_id)
+        return self._to_response(job) if job else None
+
+    def _load_chunk(self, db: Session, job_id: str, result: Tuple[List[dict], List[dict], int], reported_errors: List[dict]) -> None:
+        valid, errors, processed = result
+        inserted = len(self.person_repository.insert_rows(db, valid))
+        # Solo se guardan los primeros MAX_REPORTED_ERRORS errores; error_count lleva el total
+        new_errors = errors[:MAX_REPORTED_ERRORS - len(reported_errors)]
+        reported_errors.extend(new_errors)
+        self.job_repository.record_chunk(db, job_id, processed, inserted, len(errors), reported_errors if new_errors else None)
+
+    async def _ingest_batch(self, db: AsyncSession, batch: List[Tuple[int, Optional[bytes]]], professions: Dict[str, int], today: date, totals: Dict[str, int], report_created: bool) -> List[str]:
+        # La validación corre en el threadpool para no retener el event loop
+        valid, errors = await run_in_threadpool(validate_ndjson_lines, batch, professions, today)
+        results = [{"line": error["row"], "status": "error", "errors": error["errors"]} for error in errors]
+        if valid:
+            try:
+                ids = await self.async_repository.insert_rows(db, [row for _, row in valid])
+            except Exception as e:
+                message = f"Error al guardar el bloque: {getattr(e, 'orig', None) or e}"
+                results.extend({"line": line, "status": "error", "errors": [message]} for line, _ in valid)
+            else:
+                totals["created"] += len(ids)
+                if report_created:
+                    results.extend({"line": line, "status": "created", "id": person_id} for (line, _), person_id in zip(valid, ids))
+        totals["failed"] += sum(1 for result in results if result["status"] == "error")
+        results.sort(key=lambda result: result["line"])
+        if not report_created:
+            results.append({"line": batch[-1][0], "status": "committed", **totals})
+        return [json.dumps(result, ensure_ascii=False) + "\n" for result in results]
+
+    def _to_response(self, job: ImportJob) -> PersonImportJobResponse:
+        rows_per_second = None
+        if job.started_at:
+            started_at = self._as_utc(job.started_at)
+            finished_at = self._as_utc(job.finished_at) if job.finished_at else datetime.now(timezone.utc)
+            elapsed = (finished_at - started_at).total_seconds()
+            if elapsed > 0:
+                rows_per_second = round(job.processed_rows / elapsed, 1)
+        return PersonImportJobResponse(
+            job_id=job.id,
+            filename=job.filename,
+            status=job.status,
+            total_rows=job.total_rows,
+            processed_rows=job.processed_rows,
+            inserted_rows=job.inserted_rows,
+            error_count=job.error_count,
+            errors=json.loads(job.errors),
+            rows_per_second=rows_per_second,
+            message=job.message,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at
+        )
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # SQLite no conserva la zona horaria; los valores se guardan en UTC
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -1,144 +1,201 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import UploadFile
+from fastapi import BackgroundTasks, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.models.person import Person
 from app.repositories.person_repository import PersonRepository
-from app.schemas.person_request_response import PersonCreateRequest, PersonUpdateRequest, PersonResponse
+from app.repositories.async_person_repository import AsyncPersonRepository
+from app.schemas.person_request_response import PersonCreateRequest, PersonResponse, PersonPageResponse, PersonListFilters, PersonBulkUpdateRequest, PERSON_RESPONSE_FIELDS
 from app.services.file_service import FileService
+from app.services.export_service import ExportService
+from app.services.image_service import photo_variant_urls
+from app.core.cache import CacheEntry, stats_cache, DASHBOARD_STATS_KEY
 
 
 class PersonUseCase:
     def __init__(self):
-        self.person_repository = PersonRepository()
+        self.person_repository = AsyncPersonRepository()
+        # La exportación corre en un hilo del threadpool con una sesión síncrona
+        self.stream_repository = PersonRepository()
         self.file_service = FileService()
+        self.export_service = ExportService()
 
-    async def create_person(self, db: Session, person_data: PersonCreateRequest, photo: Optional[UploadFile] = None) -> PersonResponse:
+    async def create_person(self, db: AsyncSession, person_data: PersonCreateRequest, photo: Optional[UploadFile] = None) -> int:
         """
-        Caso de uso para crear una nueva persona
+        Caso de uso para crear una nueva persona; retorna su id
         """
         photo_url = None
-        
+
         # Si hay foto, guardarla primero
         if photo:
             photo_url = await self.file_service.save_photo(photo)
-        
-        # Crear la persona
-        db_person = self.person_repository.create(db, person_data, photo_url)
-        
-        # Preparar respuesta
-        response_data = {
-            "id": db_person.id,
-            "first_name": db_person.first_name,
-            "last_name": db_person.last_name,
-            "birth_date": db_person.birth_date.isoformat(),
-            "age": db_person.age,
-            "profession_id": db_person.profession_id,
-            "profession_name": db_person.profession.name,
-            "address": db_person.address,
-            "phone": db_person.phone,
-            "photo_url": db_person.photo_url,
-            "created_at": db_person.created_at,
-            "updated_at": db_person.updated_at
-        }
-        
-        return PersonResponse(**response_data)
 
-    def get_person(self, db: Session, person_id: int) -> Optional[PersonResponse]:
+        # Crear la persona; si falla, la foto ya guardada queda huérfana y se elimina
+        try:
+            return await self.person_repository.create(db, person_data, photo_url)
+        except Exception:
+            if photo_url:
+                await run_in_threadpool(self.file_service.delete_photo, photo_url)
+            raise
+
+    async def create_persons(self, db: AsyncSession, persons_data: List[PersonCreateRequest], photos: Optional[List[UploadFile]] = None) -> List[PersonResponse]:
+        """
+        Caso de uso para crear varias personas en una sola transacción
+
+        La foto i corresponde a la persona i. Si la inserción falla se eliminan las fotos ya guardadas.
+        """
+        photo_urls = []
+        try:
+            for photo in (photos or [])[:len(persons_data)]:
+                photo_urls.append(await self.file_service.save_photo(photo))
+            db_persons = await self.person_repository.create_many(db, persons_data, photo_urls)
+        except Exception:
+            for photo_url in photo_urls:
+                await run_in_threadpool(self.file_service.delete_photo, photo_url)
+            raise
+        return [self._to_response(db_person) for db_person in db_persons]
+
+    async def get_person(self, db: AsyncSession, person_id: int, fields: Optional[List[str]] = None) -> Optional[Union[PersonResponse, Dict[str, Any]]]:
         """
         Caso de uso para obtener una persona por ID
+
+        Si se indican fields, se retorna un diccionario solo con esos campos.
         """
-        db_person = self.person_repository.get_by_id(db, person_id)
+        db_person = await self.person_repository.get_by_id(db, person_id, fields)
         if db_person:
-            response_data = {
-                "id": db_person.id,
-                "first_name": db_person.first_name,
-                "last_name": db_person.last_name,
-                "birth_date": db_person.birth_date.isoformat(),
-                "age": db_person.age,
-                "profession_id": db_person.profession_id,
-                "profession_name": db_person.profession.name,
-                "address": db_person.address,
-                "phone": db_person.phone,
-                "photo_url": db_person.photo_url,
-                "created_at": db_person.created_at,
-                "updated_at": db_person.updated_at
-            }
-            return PersonResponse(**response_data)
+            return self._to_partial(db_person, fields) if fields else self._to_response(db_person)
         return None
 
-    def get_all_persons(self, db: Session, skip: int = 0, limit: int = 100) -> List[PersonResponse]:
+    async def get_all_persons(self, db: AsyncSession, skip: int = 0, limit: int = 100, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> List[Union[PersonResponse, Dict[str, Any]]]:
         """
         Caso de uso para obtener todas las personas
         """
-        db_persons = self.person_repository.get_all(db, skip, limit)
-        responses = []
-        
-        for person in db_persons:
-            response_data = {
-                "id": person.id,
-                "first_name": person.first_name,
-                "last_name": person.last_name,
-                "birth_date": person.birth_date.isoformat(),
-                "age": person.age,
-                "profession_id": person.profession_id,
-                "profession_name": person.profession.name,
-                "address": person.address,
-                "phone": person.phone,
-                "photo_url": person.photo_url,
-                "created_at": person.created_at,
-                "updated_at": person.updated_at
+        db_persons = await self.person_repository.get_all(db, skip, limit, filters, fields)
+        if fields:
+            return [self._to_partial(row, fields) for row in db_persons]
+        return [self._to_response(person) for person in db_persons]
+
+    async def get_persons_page(self, db: AsyncSession, limit: int = 100, after: Optional[str] = None, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None) -> Union[PersonPageResponse, Dict[str, Any]]:
+        """
+        Caso de uso para obtener una página de personas usando paginación por cursor
+        """
+        db_persons, next_cursor = await self.person_repository.get_page(db, limit, after, filters, fields)
+        if fields:
+            return {
+                "data": [self._to_partial(row, fields) for row in db_persons],
+                "next_cursor": next_cursor,
+                "limit": limit,
+                "success": True
             }
-            responses.append(PersonResponse(**response_data))
-        
-        return responses
+        return PersonPageResponse(
+            data=[self._to_response(person) for person in db_persons],
+            next_cursor=next_cursor,
+            limit=limit
+        )
+
+    def export_persons(self, session_factory: Callable[[], Session], export_format: str, filters: Optional[PersonListFilters] = None, fields: Optional[List[str]] = None, compress: bool = False) -> Iterator[bytes]:
+        """
+        Caso de uso para exportar personas como stream CSV/NDJSON
+
+        La sesión se abre dentro del generador para que viva mientras dure la descarga.
+        """
+        fields = fields or list(PERSON_RESPONSE_FIELDS)
+        db = session_factory()
+        try:
+            rows = self.stream_repository.stream(db, fields, filters)
+            yield from self.export_service.stream(rows, fields, export_format, compress)
+        finally:
+            db.close()
 
-    async def update_person(self, db: Session, person_id: int, person_data: PersonUpdateRequest, photo: Optional[UploadFile] = None) -> Optional[PersonResponse]:
+    async def update_person(self, db: AsyncSession, person_id: int, values: dict, photo: Optional[UploadFile] = None) -> bool:
         """
         Caso de uso para actualizar una persona
+
+        values trae solo los campos a cambiar (todos en PUT, los enviados en PATCH). La foto
+        anterior se libera únicamente después de confirmar el reemplazo.
         """
-        # Obtener persona actual
-        db_person = self.person_repository.get_by_id(db, person_id)
-        if not db_person:
-            return None
+        photo_url = await self.file_service.save_photo(photo) if photo else None
+        try:
+            found, released_photo = await self.person_repository.update(db, person_id, values, photo_url)
+        except Exception:
+            if photo_url:
+                await run_in_threadpool(self.file_service.delete_photo, photo_url)
+            raise
+        if not found and photo_url:
+            await run_in_threadpool(self.file_service.delete_photo, photo_url)
+        if released_photo:
+            await run_in_threadpool(self.file_service.delete_photo, released_photo)
+        return found
 
-        photo_url = None
-        if photo:
-            # Eliminar foto anterior si existe
-            if db_person.photo_url:
-                self.file_service.delete_photo(db_person.photo_url)
-            
-            # Guardar nueva foto
-            photo_url = await self.file_service.save_photo(photo)
+    async def delete_person(self, db: AsyncSession, person_id: int) -> bool:
+        """
+        Caso de uso para eliminar una persona
 
-        # Actualizar datos
-        updated_person = self.person_repository.update(db, person_id, person_data, photo_url)
-        if not updated_person:
-            return None
+        El DELETE retorna la foto, que se elimina del disco una vez confirmado.
+        """
+        found, photo_url = await self.person_repository.delete(db, person_id)
+        if photo_url:
+            await run_in_threadpool(self.file_service.delete_photo, photo_url)
+        return found
 
-        # Preparar respuesta
-        response_data = {
-            "id": updated_person.id,
-            "first_name": updated_person.first_name,
-            "last_name": updated_person.last_name,
-            "birth_date": updated_person.birth_date.isoformat(),
-            "age": updated_person.age,
-            "profession_id": updated_person.profession_id,
-            "profession_name": updated_person.profession.name,
-            "address": updated_person.address,
-            "phone": updated_person.phone,
-            "photo_url": updated_person.photo_url,
-            "created_at": updated_person.created_at,
-            "updated_at": updated_person.updated_at
-        }
+    async def update_persons(self, db: AsyncSession, bulk_data: PersonBulkUpdateRequest) -> int:
+        """
+        Caso de uso para actualizar varias personas (por ids o por filtros) con un solo UPDATE
+        """
+        values = bulk_data.values.model_dump(exclude_none=True)
+        return await self.person_repository.update_many(db, values, bulk_data.ids, bulk_data.filters)
 
-        return PersonResponse(**response_data)
+    async def delete_persons(self, db: AsyncSession, person_ids: List[int], background_tasks: BackgroundTasks) -> int:
+        """
+        Caso de uso para eliminar varias personas con un solo DELETE
 
-    def delete_person(self, db: Session, person_id: int) -> bool:
+        Las fotos se borran del disco en segundo plano, después de responder.
         """
-        Caso de uso para eliminar una persona
+        photo_urls = await self.person_repository.delete_many(db, person_ids)
+        photos = [photo_url for photo_url in photo_urls if photo_url]
+        if photos:
+            background_tasks.add_task(self._delete_photos, photos)
+        return len(photo_urls)
+
+    async def get_dashboard_stats(self, db: AsyncSession) -> CacheEntry:
         """
-        # Obtener persona para eliminar su foto
-        db_person = self.person_repository.get_by_id(db, person_id)
-        if db_person and db_person.photo_url:
-            self.file_service.delete_photo(db_person.photo_url)
-        
-        return self.person_repository.delete(db, person_id)
+        Caso de uso para obtener las estadísticas del dashboard junto con su ETag
+
+        Si están en caché se responden sin usar la sesión de base de datos.
+        """
+        entry = stats_cache.get(DASHBOARD_STATS_KEY)
+        if entry is not None:
+            return entry
+        generation = stats_cache.generation
+        stats = await self.person_repository.get_stats(db)
+        return stats_cache.get(DASHBOARD_STATS_KEY) or stats_cache.set(DASHBOARD_STATS_KEY, stats, generation)
+
+    def _delete_photos(self, photo_urls: List[str]) -> None:
+        for photo_url in photo_urls:
+            self.file_service.delete_photo(photo_url)
+
+    def _to_response(self, db_person: Person) -> PersonResponse:
+        response_data = {
+            "id": db_person.id,
+            "first_name": db_person.first_name,
+            "last_name": db_person.last_name,
+            "birth_date": db_person.birth_date.isoformat(),
+            "age": db_person.age,
+            "profession_id": db_person.profession_id,
+            "profession_name": db_person.profession.name,
+            "address": db_person.address,
+            "phone": db_person.phone,
+            "photo_url": db_person.photo_url,
+            "photo_variants": photo_variant_urls(db_person.photo_url, db_person.photo_variant_sizes),
+            "created_at": db_person.created_at,
+            "updated_at": db_person.updated_at
+        }
+        return PersonResponse(**response_data)
+
+    def _to_partial(self, row: Any, fields: List[str]) -> Dict[str, Any]:
+        data = {field: getattr(row, field) for field in fields}
+        if data.get("birth_date") is not None:
+            data["birth_date"] = data["birth_date"].isoformat()
+        # Mismas claves que la respuesta completa (profession_name se publica como "profession.name")
+        return {PersonResponse.model_fields[field].alias or field: value for field, value in data.items()}
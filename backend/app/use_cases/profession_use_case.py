@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.profession_repository import ProfessionRepository
 from app.schemas.profession_request_response import (
     ProfessionCreate, 
@@ -12,7 +12,7 @@ from app.core.exceptions import NotFoundException, ConflictException
 import math
 
 class ProfessionUseCase:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.profession_repository = ProfessionRepository(db)
     
     async def get_profession_by_id(self, profession_id: int) -> ProfessionResponse:
@@ -60,10 +60,8 @@ class ProfessionUseCase:
         return True
     
     async def search_professions(self, query: str) -> List[ProfessionResponse]:
-        # Simple búsqueda por ahora, se puede mejorar con búsqueda full-text
-        professions = await self.profession_repository.get_all()
-        filtered = [p for p in professions if query.upper() in p.name.upper()]
-        return [ProfessionResponse.model_validate(p) for p in filtered]
+        professions = await self.profession_repository.search(query)
+        return [ProfessionResponse.model_validate(p) for p in professions]
     
     async def get_all_professions_for_selector(self) -> List[ProfessionResponse]:
         """Obtener todas las profesiones sin paginación para selectores."""
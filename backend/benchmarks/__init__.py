@@ -0,0 +1,7 @@
+"""
+Benchmarks de carga de extremo a extremo
+
+Siembra una base de datos con N personas, levanta la aplicación real (main.py) con
+uvicorn y la ejercita con clientes concurrentes. El resultado es un reporte JSON que
+puede compararse entre commits con `python -m benchmarks compare`.
+"""
@@ -0,0 +1,193 @@
+"""
+Generador de personas sintéticas para pruebas de capacidad
+
+Genera nombres con tildes, direcciones de ciudades colombianas, celulares válidos y
+fechas de nacimiento y de registro repartidas en varios años. La carga se hace por
+bloques en paralelo: COPY en PostgreSQL y executemany en el resto de motores.
+"""
+import csv
+import io
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from app.models.person import Person
+from app.models.profession import Profession
+from app.repositories.person_repository import PersonRepository
+from app.repositories.person_stats_repository import PersonStatsRepository
+
+MALE_NAMES = [
+    "Juan", "José", "Luis", "Carlos", "Andrés", "Jorge", "Sebastián", "Nicolás", "Julián", "Óscar",
+    "Iván", "Héctor", "Rubén", "Fabián", "Tomás", "Germán", "Felipe", "Ángel", "Esteban", "Camilo",
+]
+FEMALE_NAMES = [
+    "María", "Ana", "Sofía", "Valentina", "Camila", "Mariana", "Daniela", "Natalia", "Lucía", "Ángela",
+    "Mónica", "Verónica", "Inés", "Salomé", "Elena", "Andrea", "Isabel", "Fernanda", "Alejandra", "Paola",
+]
+LAST_NAMES = [
+    "Pérez", "García", "González", "López", "Rodríguez", "Silva", "Martínez", "Torres", "Hernández", "Cruz",
+    "Jiménez", "Morales", "Castro", "Vargas", "Ramos", "Delgado", "Aguilar", "Ruiz", "Castillo", "Gómez",
+    "Sánchez", "Ramírez", "Díaz", "Muñoz", "Rojas", "Ortiz", "Suárez", "Peña", "Ríos", "Guzmán",
+]
+CITIES = [
+    ("Bogotá", 30), ("Medellín", 10), ("Cali", 9), ("Barranquilla", 7), ("Cartagena", 5), ("Bucaramanga", 4),
+    ("Pereira", 3), ("Manizales", 3), ("Ibagué", 3), ("Santa Marta", 3), ("Cúcuta", 3), ("Villavicencio", 2),
+    ("Pasto", 2), ("Montería", 2), ("Neiva", 2), ("Popayán", 1), ("Tunja", 1), ("Armenia", 1),
+]
+STREET_TYPES = ["Calle", "Carrera", "Avenida", "Transversal", "Diagonal"]
+# Prefijos de celulares en Colombia (10 dígitos)
+MOBILE_PREFIXES = [str(prefix) for prefix in list(range(300, 306)) + list(range(310, 325)) + [350, 351]]
+PROFESSIONS = [
+    "INGENIERO DE SISTEMAS", "MÉDICO GENERAL", "ABOGADO", "ARQUITECTO", "DISEÑADOR GRÁFICO",
+    "ADMINISTRADOR DE EMPRESAS", "PSICÓLOGO", "PROFESOR", "VENDEDOR", "CHEF", "CONTADOR PÚBLICO",
+    "ENFERMERO", "ODONTÓLOGO", "INGENIERO CIVIL", "ECONOMISTA", "PERIODISTA", "FISIOTERAPEUTA",
+    "ELECTRICISTA", "MECÁNICO", "CONDUCTOR", "COMERCIANTE", "AGRÓNOMO", "VETERINARIO", "FARMACEUTA",
+]
+# Pesos por rango de edad (años): más adultos jóvenes que menores o mayores de 60
+AGE_BANDS = [((0, 17), 10), ((18, 35), 40), ((36, 60), 35), ((61, 90), 15)]
+
+COLUMNS = ("first_name", "last_name", "birth_date", "age", "profession_id", "address", "phone", "created_at")
+
+
+class PersonGenerator:
+    """
+    Genera filas de personas reproducibles a partir de una semilla
+
+    La edad se calcula con PersonRepository.calculate_age para que coincida con la que
+    asigna la API al crear o actualizar una persona.
+    """
+
+    def __init__(self, profession_ids: List[int], seed: int = 42, years: int = 5, today: Optional[date] = None, now: Optional[datetime] = None):
+        if not profession_ids:
+            raise ValueError("Se necesita al menos una profesión para generar personas")
+        self.profession_ids = profession_ids
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.now = now or datetime.now(timezone.utc)
+        self.registration_seconds = years * 365 * 24 * 3600
+        self._cities, self._city_weights = zip(*CITIES)
+        self._bands, self._band_weights = zip(*AGE_BANDS)
+
+    def rows(self, count: int) -> Iterator[Tuple]:
+        for _ in range(count):
+            yield self.row()
+
+    def row(self) -> Tuple:
+        rng = self.rng
+        names = MALE_NAMES if rng.random() < 0.5 else FEMALE_NAMES
+        first_name = rng.choice(names)
+        if rng.random() < 0.6:
+            # Nombre compuesto, como "María Elena" o "Juan Carlos"
+            second_name = rng.choice(names)
+            if second_name != first_name:
+                first_name = f"{first_name} {second_name}"
+        low, high = rng.choices(self._bands, self._band_weights)[0]
+        birth_date = self.today - timedelta(days=rng.randint(low * 365, high * 365 + 364))
+        # Más registros recientes que antiguos (crecimiento de la base)
+        created_at = self.now - timedelta(seconds=int(self.registration_seconds * (1 - rng.random() ** 0.5)))
+        return (
+            first_name,
+            f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+            birth_date,
+            PersonRepository.calculate_age(birth_date, self.today),
+            rng.choice(self.profession_ids),
+            f"{rng.choice(STREET_TYPES)} {rng.randint(1, 200)} #{rng.randint(1, 150)}-{rng.randint(1, 99):02d}, "
+            f"{rng.choices(self._cities, self._city_weights)[0]}",
+            f"{rng.choice(MOBILE_PREFIXES)}{rng.randint(0, 9999999):07d}",
+            created_at,
+        )
+
+
+def ensure_professions(engine: Engine, names: List[str] = PROFESSIONS) -> List[int]:
+    """
+    Inserta las profesiones que falten y retorna los ids de todas las existentes
+    """
+    with engine.begin() as conn:
+        existing = set(conn.scalars(select(Profession.name)))
+        missing = [{"name": name} for name in names if name not in existing]
+        if missing:
+            conn.execute(insert(Profession.__table__), missing)
+        return list(conn.scalars(select(Profession.id).order_by(Profession.id)))
+
+
+def rebuild_stats(engine: Engine) -> dict:
+    """
+    La carga masiva no pasa por PersonRepository: las tablas de resumen se recalculan al final
+    """
+    with Session(engine) as db:
+        return PersonStatsRepository().rebuild(db)
+
+
+def _copy_rows(engine: Engine, rows: Iterator[Tuple]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, (date, datetime)) else value for value in row)
+    buffer.seek(0)
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY persons ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _insert_rows(engine: Engine, rows: Iterator[Tuple]) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Person.__table__), [dict(zip(COLUMNS, row)) for row in rows])
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def _load_chunk(database_url: str, profession_ids: List[int], count: int, seed: int, years: int, today: date, now: datetime) -> int:
+    # Cada proceso del pool mantiene su propio motor
+    engine = _engines.get(database_url)
+    if engine is None:
+        engine = _engines[database_url] = create_engine(database_url)
+    rows = PersonGenerator(profession_ids, seed, years, today, now).rows(count)
+    if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2":
+        _copy_rows(engine, rows)
+    else:
+        _insert_rows(engine, rows)
+    return count
+
+
+def load_persons(database_url: str, persons: int, profession_ids: List[int], chunk_size: int = 50_000, workers: int = 4, seed: int = 42, years: int = 5) -> dict:
+    """
+    Genera y carga `persons` personas en bloques de `chunk_size`, con `workers` procesos
+
+    SQLite admite un solo escritor, así que en ese caso los bloques se cargan en serie.
+    """
+    start = time.perf_counter()
+    if make_url(database_url).get_backend_name() == "sqlite":
+        workers = 1
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    chunks = [min(chunk_size, persons - offset) for offset in range(0, persons, chunk_size)]
+    arguments = [(database_url, profession_ids, count, seed + index, years, today, now) for index, count in enumerate(chunks)]
+
+    loaded = 0
+    if workers <= 1:
+        for args in arguments:
+            loaded += _load_chunk(*args)
+        engine = _engines.pop(database_url, None)
+        if engine is not None:
+            engine.dispose()
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for count in executor.map(_load_chunk, *zip(*arguments)):
+                loaded += count
+    elapsed = time.perf_counter() - start
+    return {
+        "inserted": loaded,
+        "chunks": len(chunks),
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(loaded / elapsed) if elapsed > 0 else 0,
+    }
@@ -0,0 +1,144 @@
+"""
+Escenarios de carga y ejecución concurrente contra el servidor
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+
+API_PREFIX = "/api/v1"
+SEARCH_TERMS = ["ing", "méd", "abo", "prof", "con", "dis", "arq", "ero"]
+
+
+@dataclass
+class ScenarioContext:
+    """
+    Datos de la base sembrada que los escenarios usan para construir peticiones
+    """
+    person_id_range: List[int]
+    profession_ids: List[int]
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+    def person_id(self) -> int:
+        return self.rng.randint(*self.person_id_range)
+
+    def person_form(self) -> Dict[str, str]:
+        return {
+            "first_name": "Benchmark",
+            "last_name": "Carga",
+            "birth_date": f"{self.rng.randint(1950, 2004)}-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}",
+            "profession_id": str(self.rng.choice(self.profession_ids)),
+            "address": "Carrera 7 # 45-10, Bogotá",
+            "phone": f"3{self.rng.randint(0, 999999999):09d}",
+        }
+
+
+Request = Callable[[httpx.AsyncClient, ScenarioContext], Awaitable[httpx.Response]]
+
+
+async def _list(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    return await client.get(f"{API_PREFIX}/persons/", params={"skip": ctx.rng.randint(0, 1000), "limit": 50})
+
+
+async def _detail(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    return await client.get(f"{API_PREFIX}/persons/{ctx.person_id()}")
+
+
+async def _create(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    return await client.post(f"{API_PREFIX}/persons/", data=ctx.person_form())
+
+
+async def _batch(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    persons = [ctx.person_form() for _ in range(10)]
+    return await client.post(f"{API_PREFIX}/persons/batch", data={"persons_data": json.dumps(persons)})
+
+
+async def _professions_search(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    return await client.get(f"{API_PREFIX}/professions/search", params={"query": ctx.rng.choice(SEARCH_TERMS)})
+
+
+async def _dashboard(client: httpx.AsyncClient, ctx: ScenarioContext) -> httpx.Response:
+    return await client.get(f"{API_PREFIX}/persons/stats/dashboard")
+
+
+SCENARIOS: Dict[str, Request] = {
+    "list": _list,
+    "detail": _detail,
+    "create": _create,
+    "batch": _batch,
+    "professions_search": _professions_search,
+    "dashboard": _dashboard,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Percentil por rango más cercano sobre una lista ya ordenada
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    completed = len(values)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / completed * 1000, 3) if completed else 0.0,
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if completed else 0.0,
+        },
+    }
+
+
+async def run_scenario(base_url: str, request: Request, ctx: ScenarioContext, requests: int, concurrency: int, warmup: int = 0, timeout: float = 60.0) -> dict:
+    """
+    Ejecuta `requests` peticiones con `concurrency` clientes simultáneos
+
+    Las respuestas con estado >= 400 o con error de red cuentan como errores y no
+    entran en las latencias.
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        for _ in range(warmup):
+            await request(client, ctx)
+
+        latencies: List[float] = []
+        errors = 0
+        remaining = requests
+        last_error: Optional[str] = None
+
+        async def worker():
+            nonlocal remaining, errors, last_error
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    response = await request(client, ctx)
+                except httpx.HTTPError as e:
+                    errors += 1
+                    last_error = repr(e)
+                    continue
+                if response.status_code >= 400:
+                    errors += 1
+                    last_error = f"{response.status_code}: {response.text[:200]}"
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        summary = summarize(latencies, errors, time.perf_counter() - start)
+        if last_error is not None:
+            summary["last_error"] = last_error
+        return summary
@@ -0,0 +1,80 @@
+"""
+Construcción y comparación de reportes JSON de benchmark
+"""
+import platform
+import resource
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from benchmarks.server import BACKEND_DIR
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def client_peak_rss() -> int:
+    """
+    Pico de RSS del proceso de benchmark en bytes (ru_maxrss viene en KB en Linux y en bytes en macOS)
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_report(config: dict, seed: dict, scenarios: dict, server_peak_rss: Optional[int]) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": config,
+        "seed": {key: value for key, value in seed.items() if key != "profession_ids"},
+        "scenarios": scenarios,
+        "memory": {
+            "server_peak_rss_mb": round(server_peak_rss / 1024 / 1024, 1) if server_peak_rss else None,
+            "client_peak_rss_mb": round(client_peak_rss() / 1024 / 1024, 1),
+        },
+    }
+
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare_reports(base: dict, current: dict, max_regression: Optional[float] = None) -> Tuple[List[str], bool]:
+    """
+    Compara dos reportes escenario por escenario
+
+    Retorna las líneas a imprimir y si algún p95 empeoró más que `max_regression` por ciento.
+    """
+    lines = [
+        f"base: {base.get('git_commit')}  actual: {current.get('git_commit')}",
+        f"{'escenario':<20}{'rps base':>12}{'rps actual':>12}{'cambio':>10}{'p95 base':>12}{'p95 actual':>12}{'cambio':>10}",
+    ]
+    regressed = False
+    for name, new in current["scenarios"].items():
+        old = base["scenarios"].get(name)
+        if old is None:
+            lines.append(f"{name:<20}{'-':>12}{new['throughput_rps']:>12}{'nuevo':>10}")
+            continue
+        old_p95, new_p95 = old["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        lines.append(
+            f"{name:<20}{old['throughput_rps']:>12}{new['throughput_rps']:>12}{_change(old['throughput_rps'], new['throughput_rps']):>10}"
+            f"{old_p95:>12}{new_p95:>12}{_change(old_p95, new_p95):>10}"
+        )
+        if max_regression is not None and old_p95 and (new_p95 - old_p95) / old_p95 * 100 > max_regression:
+            regressed = True
+    old_rss = base.get("memory", {}).get("server_peak_rss_mb")
+    new_rss = current.get("memory", {}).get("server_peak_rss_mb")
+    lines.append(f"RSS pico del servidor (MB): {old_rss} -> {new_rss}")
+    return lines, regressed
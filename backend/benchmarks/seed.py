@@ -0,0 +1,41 @@
+"""
+Siembra de datos para los benchmarks
+"""
+import time
+from sqlalchemy import create_engine, func, select
+from app.db.database import Base
+from app.models.person import Person
+from benchmarks.datagen import PROFESSIONS, ensure_professions, load_persons, rebuild_stats
+
+
+def seed_database(database_url: str, persons: int, professions: int = 50, chunk_size: int = 10000, workers: int = 4, seed: int = 42) -> dict:
+    """
+    Crea el esquema si no existe y completa la base hasta tener `persons` personas
+    y al menos `professions` profesiones; las filas existentes se reutilizan entre corridas
+    """
+    start = time.perf_counter()
+    engine = create_engine(database_url)
+    try:
+        Base.metadata.create_all(engine)
+        names = PROFESSIONS + [f"PROFESION {i:04d}" for i in range(len(PROFESSIONS) + 1, professions + 1)]
+        profession_ids = ensure_professions(engine, names[:professions])
+
+        with engine.connect() as conn:
+            existing = conn.scalar(select(func.count()).select_from(Person.__table__))
+        missing = max(0, persons - existing)
+        if missing:
+            load_persons(database_url, missing, profession_ids, chunk_size, workers, seed + existing)
+            rebuild_stats(engine)
+
+        with engine.connect() as conn:
+            min_id, max_id = conn.execute(select(func.min(Person.id), func.max(Person.id))).one()
+        return {
+            "persons": existing + missing,
+            "professions": len(profession_ids),
+            "inserted": missing,
+            "person_id_range": [min_id, max_id],
+            "profession_ids": profession_ids,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+    finally:
+        engine.dispose()
@@ -0,0 +1,116 @@
+"""
+Arranque de la aplicación real con uvicorn y medición de su memoria
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    RSS en bytes del proceso y sus hijos (workers de uvicorn); None fuera de Linux
+    """
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            if current == pid:
+                return None
+            continue
+        pending.extend(_children(current))
+    return total
+
+
+class AppServer:
+    """
+    Levanta `uvicorn main:app` en un subproceso apuntando a la base indicada
+    """
+
+    def __init__(self, database_url: str, workers: int = 1, port: Optional[int] = None):
+        self.database_url = database_url
+        self.workers = workers
+        self.port = port or _free_port()
+        self.process: Optional[subprocess.Popen] = None
+        self.peak_rss = 0
+        self._sampler: Optional[asyncio.Task] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self, timeout: float = 60.0) -> None:
+        env = dict(os.environ, DATABASE_URL=self.database_url)
+        env.pop("DATABASE_READ_URL", None)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env
+        )
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            while True:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"El servidor terminó al arrancar (código {self.process.returncode})")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("El servidor no respondió /health a tiempo")
+                await asyncio.sleep(0.2)
+        self._sampler = asyncio.create_task(self._sample_rss())
+
+    async def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+    async def _sample_rss(self, interval: float = 0.2) -> None:
+        while True:
+            rss = process_tree_rss(self.process.pid)
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss, rss)
+            await asyncio.sleep(interval)
@@ -1,15 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.db.database import engine
+from app.core.loop_monitor import EventLoopMonitor, LoopMonitorMiddleware
+from app.core.photo_files import PhotoStaticFiles
+from app.core.metrics import MetricsMiddleware, install_sql_instrumentation, registry, render_gauges
+from app.db.database import engine, async_engine, read_engine, async_read_engine
+from app.db.read_your_writes import ReadYourWritesMiddleware
+from app.db.pool_metrics import pool_status
+from app.services.import_service import shutdown_process_pool
+from app.services.image_service import shutdown_image_pool
+from app.services.file_service import TEMP_DIR
 import os
 
+# Monitor del event loop (se activa con LOOP_MONITOR_ENABLED=true)
+loop_monitor = EventLoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    threshold=settings.loop_block_threshold_ms / 1000
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    yield
+    await loop_monitor.stop()
+    shutdown_process_pool()
+    shutdown_image_pool()
+
+
 app = FastAPI(
     title="Person Registration API",
     description="API para registro de personas y profesiones con arquitectura limpia",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -21,11 +48,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.loop_monitor_enabled:
+    app.add_middleware(LoopMonitorMiddleware, monitor=loop_monitor)
+
+# Con réplica de lectura, las lecturas de un cliente que acaba de escribir van al primario
+if read_engine is not engine:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Métricas por ruta (latencia, tamaño de respuesta, sentencias SQL y tiempo en base de datos)
+app.add_middleware(MetricsMiddleware)
+for instrumented_engine in {engine, async_engine.sync_engine, read_engine, async_read_engine.sync_engine}:
+    install_sql_instrumentation(instrumented_engine)
+
 # Crear directorio de uploads si no existe
 os.makedirs("uploads", exist_ok=True)
 
-# Servir archivos estáticos (fotos)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Servir las fotos con caché inmutable, ETag y Range; las subidas en curso no se publican
+app.mount("/uploads", PhotoStaticFiles(directory="uploads", private_dirs=(TEMP_DIR,)), name="uploads")
 
 # Incluir rutas de la API
 app.include_router(api_router, prefix="/api/v1")
@@ -39,3 +78,52 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/event-loop")
+def event_loop_health():
+    return loop_monitor.snapshot()
+
+
+@app.get("/health/db-pool")
+def db_pool_health():
+    status = {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+    }
+    if read_engine is not engine:
+        status["read_sync"] = pool_status(read_engine)
+        status["read_async"] = pool_status(async_read_engine.sync_engine)
+    return status
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Métricas en formato de texto de Prometheus
+    """
+    output = registry.render()
+
+    loop = loop_monitor.snapshot()
+    output += render_gauges("event_loop_lag_seconds", "Lag del event loop", [
+        ({"stat": "last"}, loop["lag_ms_last"] / 1000),
+        ({"stat": "p99"}, loop["lag_ms_p99"] / 1000),
+        ({"stat": "max"}, loop["lag_ms_max"] / 1000),
+    ])
+    output += render_gauges("event_loop_blocked_total", "Veces que el event loop superó el umbral de bloqueo", [
+        ({}, loop["blocked_total"]),
+    ])
+
+    pools = db_pool_health()
+    for metric, key, documentation in (
+        ("db_pool_checked_out", "checked_out", "Conexiones del pool en uso"),
+        ("db_pool_overflow", "overflow", "Conexiones de overflow abiertas"),
+        ("db_pool_size", "size", "Tamaño configurado del pool"),
+    ):
+        output += render_gauges(metric, documentation, [
+            ({"pool": name}, status[key]) for name, status in pools.items() if key in status
+        ])
+    output += render_gauges("db_pool_wait_timeouts_total", "Timeouts esperando una conexión del pool", [
+        ({"pool": name}, status["wait"]["timeouts"]) for name, status in pools.items() if "wait" in status
+    ])
+    return output
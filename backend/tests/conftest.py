@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# La base de datos de pruebas debe configurarse antes de importar la aplicación.
+# Por defecto SQLite en un directorio temporal; TEST_DATABASE_URL permite usar PostgreSQL.
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+_tmp_dir = tempfile.mkdtemp(prefix="persons_tests_")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_tmp_dir}/test.db")
+os.environ.pop("DATABASE_READ_URL", None)
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.database import Base, SessionLocal, engine, async_engine
+from app.models.person import Person
+from app.models.profession import Profession
+from app.repositories.person_stats_repository import PersonStatsRepository
+from main import app
+
+SEED_PROFESSIONS = 5
+SEED_PERSONS = 30
+
+
+class QueryRecorder:
+    """
+    Registra las sentencias SQL ejecutadas en los motores síncrono y asíncrono
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @contextmanager
+    def record(self):
+        engines = {engine, async_engine.sync_engine}
+        self.statements = []
+        for target in engines:
+            event.listen(target, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            for target in engines:
+                event.remove(target, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {i + 1}. {' '.join(statement.split())}" for i, statement in enumerate(self.statements))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        professions = [Profession(name=f"PROFESION {i}") for i in range(1, SEED_PROFESSIONS + 1)]
+        db.add_all(professions)
+        db.flush()
+        today = date.today()
+        for i in range(SEED_PERSONS):
+            birth_date = today - timedelta(days=365 * (15 + i * 2) + i)
+            db.add(Person(
+                first_name=f"Nombre{i}",
+                last_name=f"Apellido{i}",
+                birth_date=birth_date,
+                age=(today - birth_date).days // 365,
+                profession_id=professions[i % SEED_PROFESSIONS].id,
+                address=f"Calle {i} # 10-20, Bogotá",
+                phone="3001234567"
+            ))
+        db.commit()
+        PersonStatsRepository().rebuild(db)
+    finally:
+        db.close()
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def queries():
+    return QueryRecorder()
@@ -0,0 +1,78 @@
+"""
+Generador de personas sintéticas de los benchmarks: filas válidas, reproducibles y cargables
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.db.database import Base
+from app.models.person import Person
+from app.repositories.person_repository import PersonRepository
+from app.schemas.person_request_response import PersonCreateRequest
+from benchmarks.datagen import COLUMNS, MOBILE_PREFIXES, PersonGenerator, ensure_professions, load_persons, rebuild_stats
+
+TODAY = date(2024, 2, 29)
+NOW = datetime(2024, 2, 29, 12, 0, tzinfo=timezone.utc)
+
+
+def generated(count: int = 500, seed: int = 7, profession_ids=(3, 5, 8)) -> list:
+    generator = PersonGenerator(list(profession_ids), seed=seed, years=2, today=TODAY, now=NOW)
+    return [dict(zip(COLUMNS, row)) for row in generator.rows(count)]
+
+
+def test_rows_pass_api_validation():
+    for row in generated():
+        request = PersonCreateRequest(
+            first_name=row["first_name"], last_name=row["last_name"], birth_date=row["birth_date"].isoformat(),
+            profession_id=row["profession_id"], address=row["address"], phone=row["phone"]
+        )
+        # La API no cambiaría los datos generados
+        assert (request.first_name, request.last_name, request.address) == (row["first_name"], row["last_name"], row["address"])
+
+
+def test_phones_are_colombian_mobiles():
+    for row in generated():
+        assert len(row["phone"]) == 10 and row["phone"].isdigit()
+        assert row["phone"][:3] in MOBILE_PREFIXES
+
+
+def test_ages_match_calculate_age():
+    rows = generated()
+    for row in rows:
+        assert row["age"] == PersonRepository.calculate_age(row["birth_date"], TODAY)
+        assert row["birth_date"] <= TODAY
+        assert 0 <= row["age"] <= 90
+    assert {row["profession_id"] for row in rows} == {3, 5, 8}
+
+
+def test_registrations_fall_in_the_requested_years():
+    for row in generated():
+        assert NOW - timedelta(days=2 * 365) <= row["created_at"] <= NOW
+
+
+def test_rows_are_reproducible_by_seed():
+    assert generated(seed=11) == generated(seed=11)
+    assert generated(seed=11) != generated(seed=12)
+
+
+def test_requires_professions():
+    with pytest.raises(ValueError, match="al menos una profesión"):
+        PersonGenerator([])
+
+
+def test_load_persons_into_sqlite(tmp_path):
+    url = f"sqlite:///{tmp_path}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    try:
+        profession_ids = ensure_professions(engine, ["UNO", "DOS"])
+        assert ensure_professions(engine, ["UNO", "DOS", "TRES"]) == profession_ids + [profession_ids[-1] + 1]
+
+        result = load_persons(url, 120, profession_ids, chunk_size=50, workers=4)
+        assert (result["inserted"], result["chunks"], result["workers"]) == (120, 3, 1)
+        with engine.connect() as conn:
+            assert conn.scalar(select(func.count(Person.id))) == 120
+        assert rebuild_stats(engine)["person_stats_profession"] == 2
+    finally:
+        engine.dispose()
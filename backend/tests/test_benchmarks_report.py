@@ -0,0 +1,73 @@
+"""
+Reportes de benchmark: percentiles de latencia y comparación contra un reporte base
+"""
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.load import percentile, summarize
+from benchmarks.report import compare_reports
+
+
+@pytest.mark.parametrize("values,pct,expected", [
+    ([], 95, 0.0),
+    ([0.5], 0, 0.5),
+    ([0.5], 99, 0.5),
+    ([1, 2, 3], 50, 2),
+    ([1, 2, 3], 95, 3),
+    ([1, 2, 3], 0, 1),
+    (list(range(1, 101)), 50, 50),
+    (list(range(1, 101)), 95, 95),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 101)), 100, 100),
+])
+def test_percentile_nearest_rank(values, pct, expected):
+    assert percentile(values, pct) == expected
+
+
+def test_summarize_without_completed_requests():
+    summary = summarize([], errors=3, elapsed=0)
+    assert (summary["requests"], summary["errors"], summary["throughput_rps"]) == (3, 3, 0.0)
+    assert set(summary["latency_ms"].values()) == {0.0}
+
+
+def report(commit: str, **p95) -> dict:
+    return {
+        "git_commit": commit,
+        "scenarios": {name: {"throughput_rps": 100.0, "latency_ms": {"p95": value}} for name, value in p95.items()},
+        "memory": {"server_peak_rss_mb": 80.5},
+    }
+
+
+@pytest.mark.parametrize("new_p95,max_regression,regressed", [
+    (110.0, 10, False),
+    (110.1, 10, True),
+    (90.0, 0, False),
+    (500.0, None, False),
+])
+def test_compare_regression_threshold(new_p95, max_regression, regressed):
+    lines, result = compare_reports(report("base", list=100.0), report("actual", list=new_p95), max_regression)
+    assert result is regressed
+    assert lines[0] == "base: base  actual: actual"
+    assert lines[-1] == "RSS pico del servidor (MB): 80.5 -> 80.5"
+
+
+def test_compare_ignores_new_scenarios_and_zero_baselines():
+    lines, regressed = compare_reports(report("base", list=0.0), report("actual", list=50.0, create=900.0), max_regression=1)
+    assert not regressed
+    assert "n/a" in lines[2]
+    assert lines[3].split()[0] == "create" and "nuevo" in lines[3]
+
+
+def test_compare_command_exit_code(tmp_path, monkeypatch, capsys):
+    base, current = tmp_path / "base.json", tmp_path / "actual.json"
+    base.write_text(json.dumps(report("base", list=100.0, detail=20.0)))
+    current.write_text(json.dumps(report("actual", list=104.0, detail=30.0)))
+
+    monkeypatch.setattr("sys.argv", ["benchmarks", "compare", str(base), str(current), "--max-regression", "60"])
+    assert main() == 0
+    monkeypatch.setattr("sys.argv", ["benchmarks", "compare", str(base), str(current), "--max-regression", "10"])
+    assert main() == 1
+    output = capsys.readouterr().out
+    assert "+50.0%" in output and "+4.0%" in output
@@ -0,0 +1,124 @@
+"""
+Caché de las estadísticas del dashboard: ETag, 304 e invalidación por escrituras
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import stats_cache
+from app.db import database
+from app.db.database import Base, create_async_engine_for
+from app.models.person import Person
+from main import app
+
+DASHBOARD_URL = "/api/v1/persons/stats/dashboard"
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+def test_dashboard_cache_revalidation(client, queries):
+    etag = client.get(DASHBOARD_URL).headers["etag"]
+
+    # En caché: 304 sin tocar la base de datos
+    with queries.record():
+        response = client.get(DASHBOARD_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert queries.count == 0, queries.report()
+
+    # Una escritura invalida la caché y cambia el ETag
+    person_id = client.post("/api/v1/persons/", data=PERSON_FORM).json()["id"]
+    try:
+        with queries.record():
+            response = client.get(DASHBOARD_URL, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert queries.count == 3, queries.report()
+        assert response.headers["etag"] != etag
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+
+
+@pytest.fixture
+def profession(client):
+    response = client.post("/api/v1/professions/", json={"name": "PROFESION DASHBOARD"})
+    assert response.status_code == 201
+    profession = response.json()
+    yield profession
+    client.delete(f"/api/v1/professions/{profession['id']}")
+
+
+def test_profession_writes_invalidate_dashboard(client, profession):
+    stats = client.get(DASHBOARD_URL).json()
+    total = stats["total_professions"]
+
+    # Renombrar cambia las etiquetas de la distribución por profesión
+    response = client.post("/api/v1/persons/", data={**PERSON_FORM, "profession_id": str(profession["id"])})
+    person_id = response.json()["id"]
+    try:
+        client.get(DASHBOARD_URL)
+        assert client.put(f"/api/v1/professions/{profession['id']}", json={"name": "PROFESION RENOMBRADA"}).status_code == 200
+        names = [item["profession_name"] for item in client.get(DASHBOARD_URL).json()["profession_distribution"]]
+        assert "PROFESION RENOMBRADA" in names
+        assert "PROFESION DASHBOARD" not in names
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+
+    client.get(DASHBOARD_URL)
+    assert client.delete(f"/api/v1/professions/{profession['id']}").status_code == 204
+    assert client.get(DASHBOARD_URL).json()["total_professions"] == total - 1
+
+    created = client.post("/api/v1/professions/", json={"name": "PROFESION NUEVA"}).json()
+    try:
+        assert client.get(DASHBOARD_URL).json()["total_professions"] == total
+    finally:
+        client.delete(f"/api/v1/professions/{created['id']}")
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """
+    Réplica vacía (solo el esquema) en otro archivo SQLite, como una réplica muy atrasada
+    """
+    url = f"sqlite:///{tmp_path}/replica.db"
+    read_engine = create_engine(url)
+    Base.metadata.create_all(read_engine)
+    async_read_engine = create_async_engine_for(url)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=read_engine))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(bind=async_read_engine, class_=AsyncSession, expire_on_commit=False))
+    yield
+    read_engine.dispose()
+    async_read_engine.sync_engine.dispose()
+
+
+def primary_total() -> int:
+    db = database.SessionLocal()
+    try:
+        return db.query(Person).count()
+    finally:
+        db.close()
+
+
+def test_dashboard_cache_is_filled_from_primary(client, replica):
+    # Sin la cookie de escritura reciente las lecturas de este cliente irían a la réplica
+    reader = TestClient(app)
+    stats_cache.invalidate()
+    total = reader.get(DASHBOARD_URL).json()["total_persons"]
+    # La réplica está vacía: el total solo puede venir del primario
+    assert total == primary_total() > 0
+
+    person_id = client.post("/api/v1/persons/", data=PERSON_FORM).json()["id"]
+    try:
+        # La escritura invalida la caché; quien la vuelve a llenar no es quien escribió
+        assert reader.get(DASHBOARD_URL).json()["total_persons"] == total + 1
+        assert client.get(DASHBOARD_URL).json()["total_persons"] == total + 1
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+    assert reader.get(DASHBOARD_URL).json()["total_persons"] == total
@@ -0,0 +1,108 @@
+"""
+Estadísticas del dashboard calculadas sobre persons (compute_stats) con una fecha fija
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.models.person import Person
+from app.models.profession import Profession
+from app.repositories.person_repository import PersonRepository
+from app.repositories.person_stats_repository import AGE_RANGES, last_month_starts, month_label
+
+# Día bisiesto: los límites de edad caen en 28 de febrero, 29 de febrero y 1 de marzo
+TODAY = date(2024, 2, 29)
+
+# (fecha de nacimiento, rango esperado a TODAY, profesión, created_at)
+PERSONS = [
+    (date(2024, 2, 29), "0-18", "A", datetime(2023, 2, 28, 12, 0)),
+    (date(2005, 3, 1), "0-18", "A", datetime(2023, 3, 1, 0, 0)),
+    (date(2005, 2, 28), "19-35", "C", datetime(2023, 7, 15, 10, 0)),
+    (date(1988, 3, 1), "19-35", "C", datetime(2023, 7, 31, 23, 59)),
+    (date(1988, 2, 29), "36-60", "C", datetime(2023, 12, 1, 0, 0)),
+    (date(1963, 3, 1), "36-60", "C", datetime(2024, 2, 29, 23, 0)),
+    (date(1963, 2, 28), "60+", "C", datetime(2024, 3, 1, 8, 0)),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Base vacía en otro archivo SQLite para que los conteos no dependan de las demás pruebas
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/stats.db")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_persons(db, persons) -> None:
+    professions = {name: Profession(name=name) for name in ("A", "B", "C")}
+    db.add_all(professions.values())
+    db.flush()
+    for i, (birth_date, _, profession, created_at) in enumerate(persons):
+        db.add(Person(
+            first_name=f"Persona{i}", last_name="Estadística", birth_date=birth_date,
+            age=PersonRepository.calculate_age(birth_date, TODAY), profession_id=professions[profession].id,
+            address="Calle 1 # 2-3, Cali", phone="3000000000", created_at=created_at
+        ))
+    db.commit()
+
+
+def age_range(age: int) -> str:
+    return "0-18" if age <= 18 else "19-35" if age <= 35 else "36-60" if age <= 60 else "60+"
+
+
+def test_compute_stats_values(db):
+    add_persons(db, PERSONS)
+    stats = PersonRepository().compute_stats(db, TODAY)
+
+    assert (stats["total_persons"], stats["total_professions"]) == (7, 3)
+    assert stats["profession_distribution"] == [
+        {"profession_name": "A", "count": 2},
+        {"profession_name": "B", "count": 0},
+        {"profession_name": "C", "count": 5},
+    ]
+    assert stats["age_distribution"] == [
+        {"range": "0-18", "count": 2},
+        {"range": "19-35", "count": 2},
+        {"range": "36-60", "count": 2},
+        {"range": "60+", "count": 1},
+    ]
+    # Cada límite coincide con la edad en años cumplidos
+    assert [age_range(PersonRepository.calculate_age(birth_date, TODAY)) for birth_date, *_ in PERSONS] == [person[1] for person in PERSONS]
+
+    # Marzo 2023 a febrero 2024; los registros fuera de la ventana no cuentan y los meses vacíos van en cero
+    counts = {"March 2023": 1, "July 2023": 2, "December 2023": 1, "February 2024": 1}
+    assert stats["monthly_registrations"] == [
+        {"month": month_label(start), "count": counts.get(month_label(start), 0)}
+        for start in last_month_starts(TODAY)
+    ]
+    assert [entry["month"] for entry in stats["monthly_registrations"]][::11] == ["March 2023", "February 2024"]
+
+
+@pytest.mark.parametrize("today,expected", [(date(2023, 2, 28), "0-18"), (date(2023, 3, 1), "19-35")])
+def test_leap_day_birth_changes_range_on_march_first(db, today, expected):
+    # Nacido el 29 de febrero de 2004: en 2023 (no bisiesto) cumple 19 el 1 de marzo
+    add_persons(db, [(date(2004, 2, 29), expected, "A", datetime(2023, 1, 1))])
+    stats = PersonRepository().compute_stats(db, today)
+    assert [entry["range"] for entry in stats["age_distribution"] if entry["count"]] == [expected]
+
+
+def test_compute_stats_matches_rollups(db):
+    add_persons(db, PERSONS)
+    repository = PersonRepository()
+    repository.stats_repository.rebuild(db)
+    assert repository.stats_repository.get_stats(db, TODAY) == repository.compute_stats(db, TODAY)
+
+
+def test_compute_stats_without_persons(db):
+    stats = PersonRepository().compute_stats(db, TODAY)
+    assert (stats["total_persons"], stats["total_professions"], stats["profession_distribution"]) == (0, 0, [])
+    assert stats["age_distribution"] == [{"range": range_name, "count": 0} for range_name in AGE_RANGES]
+    assert [entry["count"] for entry in stats["monthly_registrations"]] == [0] * 12
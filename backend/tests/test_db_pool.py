@@ -0,0 +1,81 @@
+"""
+Pool de conexiones: opciones desde Settings, histograma de espera y /health/db-pool
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+
+import main
+from app.core.config import settings
+from app.db.database import get_engine_options
+from app.db.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, WaitHistogram, pool_status
+
+
+def test_engine_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 7)
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 1500)
+    sync_options = get_engine_options("postgresql://u:p@localhost/db")
+    async_options = get_engine_options("postgresql+asyncpg://u:p@localhost/db", use_async=True)
+
+    assert sync_options["poolclass"] is TimedQueuePool
+    assert async_options["poolclass"] is TimedAsyncAdaptedQueuePool
+    assert sync_options["pool_size"] == async_options["pool_size"] == 7
+    assert sync_options["connect_args"]["options"] == "-c statement_timeout=1500"
+    assert async_options["connect_args"]["server_settings"] == {"statement_timeout": "1500"}
+    assert get_engine_options("sqlite:///test.db") == {}
+
+
+def test_wait_histogram_buckets_are_cumulative():
+    histogram = WaitHistogram()
+    for elapsed_ms in (0.5, 3, 3, 80, 9000):
+        histogram.observe(elapsed_ms)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["max_ms"] == 9000
+    assert snapshot["buckets_ms"]["1"] == 1
+    assert snapshot["buckets_ms"]["5"] == 3
+    assert snapshot["buckets_ms"]["100"] == 4
+    assert snapshot["buckets_ms"]["5000"] == 4
+    assert snapshot["buckets_ms"]["+Inf"] == 5
+
+
+def test_pool_status_counts_checkouts_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=2, max_overflow=1, pool_timeout=0.05)
+    connections = [engine.connect() for _ in range(3)]
+    try:
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        status = pool_status(engine)
+        assert status["pool_class"] == "TimedQueuePool"
+        assert status["size"] == 2
+        assert status["checked_out"] == 3
+        assert status["overflow"] == 1
+        assert status["max_overflow"] == 1
+        assert status["wait"]["count"] == 4
+        assert status["wait"]["timeouts"] == 1
+        assert status["wait"]["max_ms"] >= 50
+    finally:
+        for connection in connections:
+            connection.close()
+        engine.dispose()
+    assert pool_status(engine)["checked_out"] == 0
+
+
+def test_db_pool_health_payload(client):
+    payload = client.get("/health/db-pool").json()
+    assert set(payload) == {"sync", "async"}
+    assert payload["sync"] == pool_status(main.engine)
+    assert payload["async"]["pool_class"] == type(main.async_engine.pool).__name__
+
+
+def test_db_pool_health_includes_replica_pools(client, monkeypatch):
+    read_engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=3)
+    monkeypatch.setattr(main, "read_engine", read_engine)
+    monkeypatch.setattr(main, "async_read_engine", main.async_engine)
+    try:
+        payload = client.get("/health/db-pool").json()
+    finally:
+        read_engine.dispose()
+    assert set(payload) == {"sync", "async", "read_sync", "read_async"}
+    assert payload["read_sync"]["pool_class"] == "TimedQueuePool"
+    assert payload["read_sync"]["size"] == 3
+    assert payload["read_sync"]["wait"]["count"] == 0
@@ -0,0 +1,140 @@
+"""
+Importación de personas: trabajos CSV/XLSX en segundo plano e ingesta NDJSON por stream
+"""
+import io
+import json
+from datetime import datetime
+
+from openpyxl import Workbook
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.person import Person
+
+HEADER = "first_name,last_name,birth_date,profession,address,phone"
+
+
+def persons_named(last_name: str) -> list:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(select(Person).where(Person.last_name == last_name).order_by(Person.id)))
+    finally:
+        db.close()
+
+
+def run_import(client, filename: str, content: bytes, content_type: str = "text/csv") -> dict:
+    # El cliente de pruebas ejecuta la tarea en segundo plano antes de retornar la respuesta
+    response = client.post("/api/v1/persons/import", files={"file": (filename, content, content_type)})
+    assert response.status_code == 202, response.text
+    assert response.json()["status"] == "pending"
+    response = client.get(f"/api/v1/persons/import/{response.json()['job_id']}")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_csv_import_inserts_valid_rows_and_reports_errors(client):
+    lines = [
+        HEADER,
+        "Ana,Importcsv,1990-01-15,profesion 2,Calle 1 # 2-3,3001112233",
+        "Luis,Importcsv,1985-07-01,PROFESION 3,Calle 4 # 5-6,3004445566",
+        "Sin,Importcsv,1985-07-01,NO EXISTE,Calle 4 # 5-6,3004445566",
+        "Mal,Importcsv,1985-13-01,profesion 1,Calle 4 # 5-6,123",
+    ]
+    job = run_import(client, "personas.csv", "\n".join(lines).encode("utf-8"))
+
+    assert (job["status"], job["total_rows"], job["processed_rows"]) == ("completed", 4, 4)
+    assert (job["inserted_rows"], job["error_count"]) == (2, 2)
+    assert [error["row"] for error in job["errors"]] == [4, 5]
+    assert job["errors"][0]["errors"] == ["Profesión no encontrada: NO EXISTE"]
+    assert {message.split(":")[0] for message in job["errors"][1]["errors"]} == {"birth_date", "phone"}
+
+    persons = persons_named("Importcsv")
+    assert [(person.first_name, person.profession_id, person.photo_url) for person in persons] == [
+        ("Ana", 2, None), ("Luis", 3, None)
+    ]
+    assert persons[0].age == client.get(f"/api/v1/persons/{persons[0].id}").json()["age"]
+
+
+def test_xlsx_import_accepts_typed_cells(client):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["First Name", "Last Name", "Birth Date", "profession_id", "Address", "Phone"])
+    sheet.append(["Eva", "Importxlsx", datetime(1992, 3, 4), 4, "Calle 7 # 8-9", 3012223344])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    job = run_import(client, "personas.xlsx", buffer.getvalue(),
+                     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    assert (job["status"], job["inserted_rows"], job["error_count"]) == ("completed", 1, 0)
+    person = persons_named("Importxlsx")[0]
+    assert (person.birth_date.isoformat(), person.profession_id, person.phone) == ("1992-03-04", 4, "3012223344")
+
+
+def test_import_with_missing_columns_fails(client):
+    job = run_import(client, "personas.csv", b"first_name,last_name\nAna,Sola")
+    assert job["status"] == "failed"
+    assert job["inserted_rows"] == 0
+    assert "Columnas faltantes" in job["message"]
+    assert "profession_name o profession_id" in job["message"]
+
+
+def test_import_rejects_unsupported_format(client):
+    response = client.post("/api/v1/persons/import", files={"file": ("personas.txt", b"x", "text/plain")})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Formato no soportado")
+
+
+def test_unknown_import_job(client):
+    assert client.get("/api/v1/persons/import/no-existe").status_code == 404
+
+
+def ingest_body(*records) -> bytes:
+    return "\n".join(record if isinstance(record, str) else json.dumps(record) for record in records).encode("utf-8")
+
+
+PERSON = {
+    "first_name": "Ingesta",
+    "last_name": "Ndjsontest",
+    "birth_date": "1991-05-06",
+    "profession_id": 1,
+    "address": "Calle 10 # 11-12",
+    "phone": "3005556677",
+}
+
+
+def test_ingest_reports_every_line(client):
+    body = ingest_body(PERSON, "{no es json", dict(PERSON, phone="1"), "[1, 2]", dict(PERSON, first_name="Segunda"))
+    response = client.post("/api/v1/persons/ingest", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [(result["line"], result["status"]) for result in results[:-1]] == [
+        (1, "created"), (2, "error"), (3, "error"), (4, "error"), (5, "created")
+    ]
+    assert results[1]["errors"] == ["JSON inválido"]
+    assert results[3]["errors"] == ["Cada línea debe ser un objeto JSON"]
+    assert results[-1] == {"status": "done", "lines": 5, "created": 2, "failed": 3}
+    created = [person.id for person in persons_named("Ndjsontest")]
+    assert [results[0]["id"], results[4]["id"]] == created[-2:]
+
+
+def test_ingest_errors_report_commits_by_chunk(client, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_commit_rows", 2)
+    body = ingest_body(*(dict(PERSON, last_name="Ndjsonchunks") for _ in range(4)), dict(PERSON, birth_date="x"))
+    response = client.post("/api/v1/persons/ingest?report=errors", content=body)
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [result["status"] for result in results] == ["committed", "committed", "error", "committed", "done"]
+    assert results[1] == {"line": 4, "status": "committed", "created": 4, "failed": 0}
+    assert results[2]["line"] == 5
+    assert results[-1] == {"status": "done", "lines": 5, "created": 4, "failed": 1}
+    assert len(persons_named("Ndjsonchunks")) == 4
+
+
+def test_ingest_rejects_oversized_lines(client, monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_line_bytes", 256)
+    body = ingest_body(dict(PERSON, address="x" * 300), dict(PERSON, last_name="Ndjsonlong"))
+    results = [json.loads(line) for line in client.post("/api/v1/persons/ingest", content=body).text.splitlines()]
+    assert results[0] == {"line": 1, "status": "error", "errors": ["La línea supera el tamaño máximo permitido"]}
+    assert results[1]["status"] == "created"
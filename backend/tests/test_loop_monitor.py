@@ -0,0 +1,56 @@
+"""
+Monitor del event loop: activación por configuración, medición del lag y detección de bloqueos
+"""
+import asyncio
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from app.core.config import settings
+from app.core.loop_monitor import EventLoopMonitor
+
+
+def test_monitor_disabled_by_default():
+    assert settings.loop_monitor_enabled is False
+    with TestClient(main.app) as client:
+        snapshot = client.get("/health/event-loop").json()
+    assert snapshot["enabled"] is False
+    assert snapshot["samples"] == 0
+
+
+def test_monitor_runs_during_lifespan_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "loop_monitor_enabled", True)
+    with TestClient(main.app) as client:
+        time.sleep(main.loop_monitor.interval * 3)
+        snapshot = client.get("/health/event-loop").json()
+    assert snapshot["enabled"] is True
+    assert snapshot["samples"] > 0
+    assert main.loop_monitor.running is False
+
+
+def test_monitor_measures_lag_and_reports_blocking_route(caplog):
+    monitor = EventLoopMonitor(interval=0.02, threshold=0.1)
+
+    async def block_the_loop():
+        monitor.start()
+        monitor.track_request("GET /ruta-lenta")
+        await asyncio.sleep(0.1)
+        time.sleep(0.3)
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="app.loop_monitor"):
+        asyncio.run(block_the_loop())
+
+    snapshot = monitor.snapshot()
+    assert snapshot["enabled"] is False
+    assert snapshot["samples"] > 1
+    assert snapshot["lag_ms_max"] >= 250
+    assert snapshot["blocked_ms_max"] >= 250
+    assert snapshot["blocked_total"] == 1
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "GET /ruta-lenta" in message
+    assert "block_the_loop" in message
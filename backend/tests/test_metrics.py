@@ -0,0 +1,63 @@
+"""
+/metrics: formato de Prometheus y etiquetas de ruta por plantilla
+"""
+import re
+
+from app.core.metrics import Counter, Histogram, render_gauges
+
+
+def sample(output: str, series: str) -> float:
+    """
+    Valor de una serie exacta (nombre y etiquetas) en la salida de /metrics, 0 si no existe
+    """
+    match = re.search(rf"^{re.escape(series)} (\S+)$", output, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_route_labels_use_path_templates(client):
+    series = 'http_requests_total{method="GET",route="/api/v1/persons/{person_id}",status="200"}'
+    before = sample(client.get("/metrics").text, series)
+    for person_id in (1, 2, 3):
+        assert client.get(f"/api/v1/persons/{person_id}").status_code == 200
+    output = client.get("/metrics").text
+
+    assert sample(output, series) == before + 3
+    assert 'route="/api/v1/persons/1"' not in output
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/persons/{person_id}"}' in output
+    assert sample(output, 'db_statements_total{route="/api/v1/persons/{person_id}"}') >= 3
+
+
+def test_unmatched_and_mounted_routes(client):
+    client.get("/no-existe/42")
+    client.get("/uploads/no-existe.jpg")
+    output = client.get("/metrics").text
+    assert sample(output, 'http_requests_total{method="GET",route="unmatched",status="404"}') >= 1
+    assert sample(output, 'http_requests_total{method="GET",route="/uploads/{path}",status="404"}') >= 1
+    assert "/no-existe" not in output
+
+
+def test_metrics_include_loop_and_pool_gauges(client):
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    output = response.text
+    assert "# TYPE event_loop_lag_seconds gauge" in output
+    assert 'event_loop_lag_seconds{stat="p99"}' in output
+    assert re.search(r'^db_pool_size\{pool="sync"\} \d+$', output, re.MULTILINE)
+
+
+def test_histogram_and_counter_rendering():
+    histogram = Histogram("latency_seconds", "Latencia", (0.1, 1.0), ("route",))
+    for value in (0.05, 0.5, 3.0):
+        histogram.observe(value, "/x")
+    counter = Counter("requests_total", "Peticiones", ("route",))
+    counter.inc('/a"b')
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/x",le="0.1"} 1',
+        'latency_seconds_bucket{route="/x",le="1"} 2',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 3',
+        'latency_seconds_sum{route="/x"} 3.55',
+        'latency_seconds_count{route="/x"} 3',
+    ]
+    assert counter.render()[2] == 'requests_total{route="/a\\"b"} 1'
+    assert render_gauges("up", "Arriba", [({}, 1)]) == "# HELP up Arriba\n# TYPE up gauge\nup 1\n"
@@ -0,0 +1,187 @@
+"""
+Tablas de resumen del dashboard: cada escritura de personas las mantiene al día y rebuild las repara
+"""
+import json
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.jobs import rebuild_person_stats
+from app.jobs.rebuild_person_stats import find_drift
+from app.models.person_stats import PersonStatsBirthDate, PersonStatsMonth, PersonStatsProfession
+from app.repositories.person_repository import PersonRepository
+from app.repositories.person_stats_repository import ROLLUP_MODELS
+
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+def rollup_rows(db) -> dict:
+    return {
+        model.__tablename__: sorted((row[0], row[1]) for row in db.query(*model.__table__.c) if row[1])
+        for model in ROLLUP_MODELS
+    }
+
+
+@pytest.fixture
+def repository():
+    """
+    Resumen reconstruido antes de la prueba para que solo cuenten las escrituras de la prueba
+    """
+    repository = PersonRepository()
+    db = SessionLocal()
+    try:
+        repository.stats_repository.rebuild(db)
+    finally:
+        db.close()
+    return repository
+
+
+def assert_consistent(repository: PersonRepository) -> None:
+    db = SessionLocal()
+    try:
+        assert find_drift(db, repository) == []
+        # Además de las estadísticas servidas, las filas deben ser las mismas que daría rebuild
+        maintained = rollup_rows(db)
+        db.rollback()
+        repository.stats_repository.rebuild(db)
+        assert rollup_rows(db) == maintained
+    finally:
+        db.close()
+
+
+def create_person(client, **values) -> int:
+    response = client.post("/api/v1/persons/", data=dict(PERSON_FORM, **values))
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def create_batch(client, count: int) -> list:
+    batch = [dict(PERSON_FORM, first_name=f"Resumen{i}", profession_id=i % 3 + 1, birth_date=f"19{50 + i}-06-0{i % 9 + 1}") for i in range(count)]
+    response = client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(batch)})
+    assert response.status_code == 200, response.text
+    return [person["id"] for person in response.json()]
+
+
+def write_create(client):
+    create_person(client, birth_date="2012-01-20", profession_id="2")
+
+
+def write_put(client):
+    person_id = create_person(client)
+    response = client.put(f"/api/v1/persons/{person_id}", data=dict(PERSON_FORM, profession_id="3", birth_date="2010-10-10"))
+    assert response.status_code == 200, response.text
+
+
+def write_patch_profession(client):
+    person_id = create_person(client)
+    assert client.patch(f"/api/v1/persons/{person_id}", data={"profession_id": "4"}).status_code == 200
+
+
+def write_patch_birth_date(client):
+    person_id = create_person(client)
+    assert client.patch(f"/api/v1/persons/{person_id}", data={"birth_date": "1950-02-02"}).status_code == 200
+
+
+def write_delete(client):
+    person_id = create_person(client, profession_id="5")
+    assert client.delete(f"/api/v1/persons/{person_id}").status_code == 200
+
+
+def write_batch(client):
+    create_batch(client, 6)
+
+
+def write_bulk_update(client):
+    ids = create_batch(client, 5)
+    response = client.post("/api/v1/persons/bulk/update", json={"ids": ids, "values": {"profession_id": 2, "birth_date": "1999-09-09"}})
+    assert response.json()["affected"] == 5
+
+
+def write_bulk_update_by_filters(client):
+    create_batch(client, 4)
+    response = client.post("/api/v1/persons/bulk/update", json={
+        "filters": {"birth_date_from": "1950-01-01", "birth_date_to": "1953-12-31"}, "values": {"profession_id": 5}
+    })
+    assert response.json()["affected"] >= 4
+
+
+def write_bulk_delete(client):
+    ids = create_batch(client, 5)
+    assert client.post("/api/v1/persons/bulk/delete", json={"ids": ids[1:]}).json()["affected"] == 4
+
+
+def write_import(client):
+    lines = ["first_name,last_name,birth_date,profession,address,phone"]
+    lines += [f"Resumen{i},Importado,19{70 + i}-03-1{i},profesion {i % 3 + 1},Calle {i} # 4-5,3201234567" for i in range(4)]
+    lines.append("Mal,Importado,1970-13-01,profesion 1,Calle 1 # 4-5,3201234567")
+    response = client.post("/api/v1/persons/import", files={"file": ("personas.csv", "\n".join(lines).encode("utf-8"), "text/csv")})
+    assert response.status_code == 202
+    assert client.get(f"/api/v1/persons/import/{response.json()['job_id']}").json()["inserted_rows"] == 4
+
+
+def write_ingest(client):
+    lines = [json.dumps(dict(PERSON_FORM, first_name=f"Ingesta{i}", profession_id=i % 5 + 1, birth_date=f"20{10 + i}-07-07")) for i in range(5)]
+    lines.append(json.dumps(dict(PERSON_FORM, phone="1")))
+    response = client.post("/api/v1/persons/ingest", content="\n".join(lines).encode("utf-8"))
+    assert json.loads(response.text.splitlines()[-1])["created"] == 5
+
+
+WRITES = [
+    write_create, write_put, write_patch_profession, write_patch_birth_date, write_delete, write_batch,
+    write_bulk_update, write_bulk_update_by_filters, write_bulk_delete, write_import, write_ingest,
+]
+
+
+@pytest.mark.parametrize("write", WRITES, ids=[write.__name__[len("write_"):] for write in WRITES])
+def test_writes_keep_rollups_consistent(client, repository, write):
+    write(client)
+    assert_consistent(repository)
+
+
+def test_rebuild_repairs_corrupted_rollups(repository):
+    db = SessionLocal()
+    try:
+        expected = rollup_rows(db)
+        db.query(PersonStatsProfession).filter(PersonStatsProfession.profession_id == 1).update({"count": PersonStatsProfession.count + 7})
+        db.query(PersonStatsBirthDate).delete()
+        db.query(PersonStatsMonth).update({"count": 0})
+        db.commit()
+        drift = find_drift(db, repository)
+        assert {line.split(":")[0] for line in drift} == {"total_persons", "profession_distribution", "age_distribution", "monthly_registrations"}
+
+        db.rollback()
+        repository.stats_repository.rebuild(db)
+        assert find_drift(db, repository) == []
+        assert rollup_rows(db) == expected
+    finally:
+        db.close()
+
+
+def test_check_exits_non_zero_on_drift(repository, monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["rebuild_person_stats", "--check"])
+    assert rebuild_person_stats.main() == 0
+    assert "Resumen consistente" in capsys.readouterr().out
+
+    db = SessionLocal()
+    try:
+        db.query(PersonStatsProfession).filter(PersonStatsProfession.profession_id == 2).update({"count": PersonStatsProfession.count - 1})
+        db.commit()
+    finally:
+        db.close()
+    assert rebuild_person_stats.main() == 1
+    output = capsys.readouterr().out
+    assert "Diferencia en total_persons" in output and "2 diferencias encontradas" in output
+
+    # Sin --check reporta y reconstruye
+    monkeypatch.setattr("sys.argv", ["rebuild_person_stats"])
+    assert rebuild_person_stats.main() == 0
+    assert "Resumen reconstruido" in capsys.readouterr().out
+    monkeypatch.setattr("sys.argv", ["rebuild_person_stats", "--check"])
+    assert rebuild_person_stats.main() == 0
@@ -0,0 +1,141 @@
+"""
+Creación en lote (/persons/batch): todo o nada, también para las fotos
+"""
+import hashlib
+import io
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from app.db.database import SessionLocal
+from app.models.photo_file import PhotoFile
+
+UPLOAD_DIR = "uploads"
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+def image_bytes(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def stored_files() -> set:
+    return {os.path.join(directory, name) for directory, _, names in os.walk(UPLOAD_DIR) for name in names}
+
+
+def ref_count(content: bytes):
+    db = SessionLocal()
+    try:
+        photo = db.get(PhotoFile, hashlib.sha256(content).hexdigest())
+        return photo.ref_count if photo is not None else None
+    finally:
+        db.close()
+
+
+def post_batch(client, persons, photos=()):
+    files = [("photos", (f"foto{i}.png", content, "image/png")) for i, content in enumerate(photos)]
+    return client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(persons)}, files=files or None)
+
+
+@pytest.fixture
+def total(client):
+    """
+    Cuenta las personas registradas (para comprobar que un lote rechazado no inserta nada)
+    """
+    return lambda: len(client.get("/api/v1/persons/?limit=1000").json())
+
+
+def test_batch_creates_every_person_with_its_photo(client):
+    photos = [image_bytes((40, 50, 60)), image_bytes((60, 50, 40))]
+    persons = [dict(PERSON_FORM, first_name=f"Lote{i}", profession_id=i + 2) for i in range(3)]
+    response = post_batch(client, persons, photos)
+    assert response.status_code == 200, response.text
+    created = response.json()
+    try:
+        assert [(person["first_name"], person["profession_id"]) for person in created] == [("Lote0", 2), ("Lote1", 3), ("Lote2", 4)]
+        assert [person["photo_url"] is not None for person in created] == [True, True, False]
+        assert [ref_count(content) for content in photos] == [1, 1]
+    finally:
+        client.post("/api/v1/persons/bulk/delete", json={"ids": [person["id"] for person in created]})
+
+
+def test_unknown_profession_rejects_whole_batch(client, total):
+    before = total()
+    persons = [dict(PERSON_FORM, first_name="Valida"), dict(PERSON_FORM, profession_id=9999), dict(PERSON_FORM, profession_id=8888)]
+    response = post_batch(client, persons)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Profesión no encontrada: 8888, 9999"
+    assert total() == before
+
+
+def test_failed_batch_deletes_its_photos(client, total):
+    before, files = total(), stored_files()
+    photos = [image_bytes((70, 80, 90)), image_bytes((90, 80, 70))]
+    response = post_batch(client, [dict(PERSON_FORM), dict(PERSON_FORM, profession_id=9999)], photos)
+    assert response.status_code == 400
+    assert total() == before
+    assert stored_files() == files
+    assert [ref_count(content) for content in photos] == [None, None]
+
+
+def test_failed_batch_keeps_photos_shared_with_existing_persons(client):
+    content = image_bytes((15, 25, 35))
+    person_id = client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.png", content, "image/png")}).json()["id"]
+    try:
+        files = stored_files()
+        response = post_batch(client, [dict(PERSON_FORM, profession_id=9999)], [content])
+        assert response.status_code == 400
+        # La foto ya existía: se libera solo la referencia del lote
+        assert stored_files() == files
+        assert ref_count(content) == 1
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+
+
+def test_invalid_photo_deletes_photos_already_saved(client, total):
+    before, files = total(), stored_files()
+    valid = image_bytes((100, 110, 120))
+    response = post_batch(client, [dict(PERSON_FORM), dict(PERSON_FORM)], [valid, b"no es una imagen"])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "El contenido del archivo no es una imagen válida."
+    assert total() == before
+    assert stored_files() == files
+    assert ref_count(valid) is None
+
+
+def test_invalid_rows_list_every_error(client, total):
+    before = total()
+    persons = [
+        dict(PERSON_FORM),
+        dict(PERSON_FORM, phone="12ab"),
+        "no es un objeto",
+        dict(PERSON_FORM, first_name="A", birth_date="1990-02-30"),
+    ]
+    response = post_batch(client, persons)
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert [message.split(":")[0] for message in detail] == ["Persona 2", "Persona 3", "Persona 4"]
+    assert detail[0].startswith("Persona 2: phone:")
+    assert detail[1] == "Persona 3: debe ser un objeto"
+    assert "first_name:" in detail[2] and "birth_date:" in detail[2]
+    assert total() == before
+
+
+@pytest.mark.parametrize("persons_data,detail", [
+    ("[{", "Formato JSON inválido en persons_data"),
+    ('{"first_name": "Laura"}', "persons_data debe ser una lista de personas"),
+])
+def test_batch_rejects_malformed_payload(client, persons_data, detail):
+    response = client.post("/api/v1/persons/batch", data={"persons_data": persons_data})
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
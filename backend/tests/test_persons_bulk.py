@@ -0,0 +1,147 @@
+"""
+Operaciones masivas: actualización por ids o por filtros y eliminación por ids
+"""
+import io
+import json
+import os
+from datetime import date
+
+import pytest
+from PIL import Image
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.jobs.rebuild_person_stats import find_drift
+from app.models.person import Person
+from app.repositories.person_repository import PersonRepository
+from app.schemas.person_request_response import PersonListFilters
+
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+@pytest.fixture(autouse=True)
+def rollups():
+    """
+    Resumen del dashboard reconstruido antes de cada prueba; al terminar debe seguir cuadrando con persons
+    """
+    repository = PersonRepository()
+    db = SessionLocal()
+    try:
+        repository.stats_repository.rebuild(db)
+        yield
+        db.rollback()
+        assert find_drift(db, repository) == []
+    finally:
+        db.close()
+
+
+def create_batch(client, *persons) -> list:
+    response = client.post("/api/v1/persons/batch", data={"persons_data": json.dumps([dict(PERSON_FORM, **person) for person in persons])})
+    assert response.status_code == 200, response.text
+    return [person["id"] for person in response.json()]
+
+
+def stored(ids: list) -> dict:
+    db = SessionLocal()
+    try:
+        return {person.id: person for person in db.scalars(select(Person).where(Person.id.in_(ids)))}
+    finally:
+        db.close()
+
+
+def test_bulk_update_by_ids_writes_values(client):
+    ids = create_batch(client, {"first_name": "Masiva"}, {"first_name": "Masiva"}, {"first_name": "Fuera"})
+    response = client.post("/api/v1/persons/bulk/update", json={
+        "ids": ids[:2], "values": {"profession_id": 4, "birth_date": "1980-06-15", "phone": "3119998877"}
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == 2
+
+    persons = stored(ids)
+    expected_age = PersonRepository.calculate_age(date(1980, 6, 15))
+    for person_id in ids[:2]:
+        person = persons[person_id]
+        assert (person.profession_id, person.birth_date, person.age, person.phone) == (4, date(1980, 6, 15), expected_age, "3119998877")
+    outside = persons[ids[2]]
+    assert (outside.profession_id, outside.birth_date.isoformat(), outside.phone) == (1, "1990-04-12", "3109876543")
+
+
+def test_bulk_update_by_filters_selects_only_matching_rows(client):
+    inside = create_batch(client, {"birth_date": "1927-02-10"}, {"birth_date": "1927-11-30", "profession_id": 2})
+    outside = create_batch(client, {"birth_date": "1928-01-01"}, {"birth_date": "1926-12-31"})
+    response = client.post("/api/v1/persons/bulk/update", json={
+        "filters": {"birth_date_from": "1927-01-01", "birth_date_to": "1927-12-31"},
+        "values": {"profession_id": 5, "address": "Calle masiva # 1-2"},
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == 2
+
+    persons = stored(inside + outside)
+    assert [(persons[i].profession_id, persons[i].address) for i in inside] == [(5, "Calle masiva # 1-2")] * 2
+    assert [(persons[i].profession_id, persons[i].address) for i in outside] == [(1, PERSON_FORM["address"])] * 2
+
+
+@pytest.mark.parametrize("filters", [{}, {"sort": "-age"}, {"profession_id": None}])
+def test_bulk_update_rejects_empty_filters(client, filters):
+    total = len(client.get("/api/v1/persons/?limit=1000").json())
+    response = client.post("/api/v1/persons/bulk/update", json={"filters": filters, "values": {"address": "Calle de todos # 1-1"}})
+    assert response.status_code == 422
+    assert "Indique al menos un filtro en filters" in response.text
+    persons = client.get("/api/v1/persons/?limit=1000").json()
+    assert len(persons) == total
+    assert all(person["address"] != "Calle de todos # 1-1" for person in persons)
+
+
+def test_update_many_requires_ids_or_filters():
+    db = SessionLocal()
+    try:
+        with pytest.raises(ValueError, match="Indique al menos un filtro"):
+            PersonRepository().update_many(db, {"address": "Calle de todos # 1-1"}, filters=PersonListFilters())
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("target", [
+    lambda ids: {"ids": ids},
+    lambda ids: {"filters": {"birth_date_from": "1929-05-05", "birth_date_to": "1929-05-05"}},
+], ids=["ids", "filters"])
+def test_bulk_update_rejects_unknown_profession(client, target):
+    ids = create_batch(client, {"birth_date": "1929-05-05"}, {"birth_date": "1929-05-05", "profession_id": 3})
+    response = client.post("/api/v1/persons/bulk/update", json={**target(ids), "values": {"profession_id": 9999, "phone": "3112223344"}})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Profesión no encontrada: 9999"
+    persons = stored(ids)
+    assert [(persons[i].profession_id, persons[i].phone) for i in ids] == [(1, "3109876543"), (3, "3109876543")]
+    client.post("/api/v1/persons/bulk/delete", json={"ids": ids})
+
+
+def photo_bytes(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_bulk_delete_removes_rows_and_photos(client):
+    ids = [
+        client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.png", photo_bytes(color), "image/png")}).json()["id"]
+        for color in ((11, 22, 33), (33, 22, 11))
+    ]
+    ids += create_batch(client, {"first_name": "Sinfoto"})
+    photos = [client.get(f"/api/v1/persons/{person_id}").json() for person_id in ids[:2]]
+    files = [person["photo_url"].lstrip("/") for person in photos]
+    files += [url.lstrip("/") for person in photos for url in person["photo_variants"].values()]
+    assert all(os.path.exists(path) for path in files)
+
+    response = client.post("/api/v1/persons/bulk/delete", json={"ids": ids + [999999]})
+    assert response.status_code == 200
+    assert response.json()["affected"] == 3
+    assert stored(ids) == {}
+    assert all(client.get(f"/api/v1/persons/{person_id}").status_code == 404 for person_id in ids)
+    assert not any(os.path.exists(path) for path in files)
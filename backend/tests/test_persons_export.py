@@ -0,0 +1,82 @@
+"""
+Exportación de personas en CSV y NDJSON (con y sin gzip)
+"""
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.db.database import SessionLocal
+from app.models.person import Person
+from app.schemas.person_request_response import PERSON_RESPONSE_FIELDS
+
+
+def expected_rows(profession_id=None) -> dict:
+    """
+    Filas esperadas por id, con los valores como texto igual que en el CSV
+    """
+    db = SessionLocal()
+    try:
+        query = select(Person).options(joinedload(Person.profession)).order_by(Person.id)
+        if profession_id is not None:
+            query = query.where(Person.profession_id == profession_id)
+        rows = {}
+        for person in db.scalars(query):
+            rows[person.id] = {
+                "id": person.id,
+                "first_name": person.first_name,
+                "last_name": person.last_name,
+                "birth_date": person.birth_date.isoformat(),
+                "age": person.age,
+                "profession_id": person.profession_id,
+                "profession_name": person.profession.name,
+                "address": person.address,
+                "phone": person.phone,
+                "photo_url": person.photo_url,
+            }
+        return rows
+    finally:
+        db.close()
+
+
+def test_csv_export_body(client):
+    response = client.get("/api/v1/persons/export?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="persons.csv"'
+
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert tuple(reader.fieldnames) == PERSON_RESPONSE_FIELDS
+    rows = {int(row["id"]): row for row in reader}
+    expected = expected_rows()
+    assert rows.keys() == expected.keys()
+    for person_id, row in expected.items():
+        for field in ("first_name", "last_name", "birth_date", "profession_name", "address", "phone"):
+            assert rows[person_id][field] == row[field]
+        assert int(rows[person_id]["age"]) == row["age"]
+
+
+def test_gzip_ndjson_export_body_with_filters_and_fields(client):
+    response = client.get("/api/v1/persons/export?format=ndjson&gzip=true&profession_id=2&fields=id,first_name,profession_name")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="persons.ndjson.gz"'
+
+    # El cliente de pruebas no descomprime: el cuerpo es el stream gzip tal como se envía
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    expected = expected_rows(profession_id=2)
+    assert expected
+    assert records == [
+        {"id": row["id"], "first_name": row["first_name"], "profession_name": row["profession_name"]}
+        for row in expected.values()
+    ]
+
+
+@pytest.mark.parametrize("query", ["format=xml", "fields=password", "sort=phone"])
+def test_export_rejects_invalid_parameters(client, query):
+    assert client.get(f"/api/v1/persons/export?{query}").status_code in (400, 422)
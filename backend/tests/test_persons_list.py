@@ -0,0 +1,220 @@
+"""
+Listado de personas: paginación por cursor, filtros, ordenamiento y proyección de campos
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.db.database import SessionLocal
+from app.models.person import Person
+from app.repositories.person_repository import PersonRepository
+from app.repositories.person_stats_repository import years_before
+from app.schemas.person_request_response import PERSON_SORT_FIELDS
+
+SORTS = [prefix + field for field in PERSON_SORT_FIELDS for prefix in ("", "-")]
+
+
+@pytest.fixture
+def persons_without_created_at():
+    # Filas con created_at NULL (la columna lo permite) para cubrir su posición en el cursor
+    db = SessionLocal()
+    try:
+        persons = [
+            Person(first_name=f"SinFecha{i}", last_name="Prueba", birth_date=date(1980 + i, 5, 5), age=40,
+                   profession_id=1, address="Calle 1 # 2-3, Cali", phone="3000000000")
+            for i in range(3)
+        ]
+        db.add_all(persons)
+        db.flush()
+        ids = [person.id for person in persons]
+        # Con None el INSERT omite la columna y aplica el valor por defecto; se anula después
+        db.execute(update(Person).where(Person.id.in_(ids)).values(created_at=None))
+        db.commit()
+    finally:
+        db.close()
+    yield ids
+    db = SessionLocal()
+    try:
+        db.execute(delete(Person).where(Person.id.in_(ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def all_person_ids() -> list:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(select(Person.id)))
+    finally:
+        db.close()
+
+
+def walk_pages(client, sort: str, limit: int = 7) -> list:
+    ids, after = [], None
+    for _ in range(100):
+        url = f"/api/v1/persons/?cursor=true&limit={limit}&sort={sort}" + (f"&after={after}" if after else "")
+        response = client.get(url)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids.extend(person["id"] for person in body["data"])
+        after = body["next_cursor"]
+        if after is None:
+            return ids
+    pytest.fail(f"La paginación con sort={sort} no terminó")
+
+
+@pytest.mark.parametrize("sort", SORTS)
+def test_cursor_walks_every_row_once(client, persons_without_created_at, sort):
+    # Las filas sembradas comparten created_at, así que el desempate por id también queda cubierto
+    ids = walk_pages(client, sort)
+    assert len(ids) == len(set(ids)), "La paginación repitió filas"
+    assert sorted(ids) == sorted(all_person_ids()), "La paginación omitió filas"
+
+
+@pytest.mark.parametrize("sort", ["created_at", "-created_at", "first_name", "-age"])
+def test_cursor_order_matches_offset_listing(client, persons_without_created_at, sort):
+    expected = [person["id"] for person in client.get(f"/api/v1/persons/?limit=1000&sort={sort}").json()]
+    assert walk_pages(client, sort, limit=4) == expected
+
+
+def test_cursor_rejects_other_sort(client):
+    after = client.get("/api/v1/persons/?cursor=true&limit=2&sort=first_name").json()["next_cursor"]
+    response = client.get(f"/api/v1/persons/?cursor=true&limit=2&sort=last_name&after={after}")
+    assert response.status_code == 400
+
+
+def test_cursor_rejects_garbage(client):
+    assert client.get("/api/v1/persons/?cursor=true&after=no-es-un-cursor").status_code == 400
+
+
+@pytest.fixture
+def birthday_persons():
+    # Una persona que cumple 30 hoy y otra que los cumple mañana, para los bordes de min_age/max_age
+    today = date.today()
+    turns_today = years_before(today, 30)
+    turns_tomorrow = years_before(today + timedelta(days=1), 30)
+    db = SessionLocal()
+    try:
+        persons = [
+            Person(first_name=name, last_name="Borde", birth_date=birth_date, age=0, profession_id=2,
+                   address="Calle 1 # 2-3, Cali", phone="3000000000")
+            for name, birth_date in (("CumpleHoy", turns_today), ("CumpleManana", turns_tomorrow))
+        ]
+        db.add_all(persons)
+        db.commit()
+        ids = {person.first_name: person.id for person in persons}
+    finally:
+        db.close()
+    yield ids
+    db = SessionLocal()
+    try:
+        db.execute(delete(Person).where(Person.id.in_(ids.values())))
+        db.commit()
+    finally:
+        db.close()
+
+
+def all_persons() -> list:
+    db = SessionLocal()
+    try:
+        return list(db.scalars(select(Person)))
+    finally:
+        db.close()
+
+
+def listed_ids(client, query: str) -> set:
+    response = client.get(f"/api/v1/persons/?limit=1000&{query}")
+    assert response.status_code == 200, response.text
+    return {person["id"] for person in response.json()}
+
+
+def test_profession_filter(client):
+    expected = {person.id for person in all_persons() if person.profession_id == 3}
+    assert expected
+    assert listed_ids(client, "profession_id=3") == expected
+
+
+@pytest.mark.parametrize("min_age,max_age", [(30, None), (None, 29), (20, 40), (30, 30)])
+def test_age_filters_map_to_birth_date_ranges(client, birthday_persons, min_age, max_age):
+    # La edad se calcula con la fecha de nacimiento, no con la columna age (que en las filas de borde es 0)
+    query = "&".join(f"{name}={value}" for name, value in (("min_age", min_age), ("max_age", max_age)) if value is not None)
+    expected = {
+        person.id for person in all_persons()
+        if (min_age is None or PersonRepository.calculate_age(person.birth_date) >= min_age)
+        and (max_age is None or PersonRepository.calculate_age(person.birth_date) <= max_age)
+    }
+    ids = listed_ids(client, query)
+    assert ids == expected
+    turns_30 = min_age is None or min_age <= 30
+    turns_30 = turns_30 and (max_age is None or max_age >= 30)
+    assert (birthday_persons["CumpleHoy"] in ids) == turns_30
+    assert (birthday_persons["CumpleManana"] in ids) == (min_age is None or min_age <= 29) and (max_age is None or max_age >= 29)
+
+
+def test_birth_date_filters_are_inclusive(client):
+    persons = sorted(all_persons(), key=lambda person: person.birth_date)
+    start, end = persons[5].birth_date, persons[15].birth_date
+    expected = {person.id for person in persons if start <= person.birth_date <= end}
+    assert listed_ids(client, f"birth_date_from={start}&birth_date_to={end}") == expected
+
+
+def test_created_filters(client):
+    persons = all_persons()
+    created = max(person.created_at for person in persons if person.created_at)
+    assert listed_ids(client, f"created_from={created.isoformat()}") == {
+        person.id for person in persons if person.created_at and person.created_at >= created
+    }
+    assert listed_ids(client, f"created_to={created.isoformat()}") == {
+        person.id for person in persons if person.created_at and person.created_at < created
+    }
+
+
+@pytest.mark.parametrize("sort,key,reverse", [
+    ("-birth_date", "birth_date", True),
+    ("age", "birth_date", True),
+    ("-age", "birth_date", False),
+    ("last_name", "last_name", False),
+])
+def test_sort_order(client, sort, key, reverse):
+    persons = client.get(f"/api/v1/persons/?limit=1000&sort={sort}").json()
+    values = [person[key] for person in persons]
+    assert values == sorted(values, reverse=reverse)
+
+
+@pytest.mark.parametrize("query", ["sort=phone", "sort=-address", "min_age=40&max_age=30", "min_age=-1"])
+def test_invalid_filters_return_400(client, query):
+    response = client.get(f"/api/v1/persons/?{query}")
+    assert response.status_code == 400, response.text
+
+
+def test_fields_projection_returns_only_requested_keys(client):
+    response = client.get("/api/v1/persons/?limit=5&fields=first_name,age")
+    assert response.status_code == 200, response.text
+    assert [set(person) for person in response.json()] == [{"first_name", "age"}] * 5
+
+
+def test_fields_use_the_same_keys_as_the_full_response(client):
+    person = client.get("/api/v1/persons/1").json()
+    partial = client.get("/api/v1/persons/1?fields=id,profession_name,birth_date").json()
+    assert partial == {key: person[key] for key in ("id", "profession.name", "birth_date")}
+    assert client.get("/api/v1/persons/1?fields=profession.name").json() == {"profession.name": person["profession.name"]}
+    page = client.get("/api/v1/persons/?cursor=true&limit=3&fields=profession_name").json()
+    assert all(set(row) == {"profession.name"} for row in page["data"])
+
+
+@pytest.mark.parametrize("fields,joins", [("first_name,last_name", False), ("first_name,profession_name", True)])
+def test_fields_projection_joins_profession_only_when_requested(client, queries, fields, joins):
+    with queries.record():
+        response = client.get(f"/api/v1/persons/?limit=5&fields={fields}")
+    assert response.status_code == 200, response.text
+    selects = [statement for statement in queries.statements if statement.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1, queries.report()
+    assert ("professions" in selects[0]) == joins, queries.report()
+    assert "birth_date" not in selects[0] and "address" not in selects[0], queries.report()
+
+
+def test_fields_rejects_unknown_field(client):
+    response = client.get("/api/v1/persons/?fields=first_name,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
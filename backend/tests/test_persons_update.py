@@ -0,0 +1,73 @@
+"""
+Actualización de personas (PUT y PATCH): validación de la profesión
+"""
+from datetime import date
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.person import Person
+
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+@pytest.fixture
+def person_id():
+    db = SessionLocal()
+    try:
+        person = Person(
+            first_name="Temporal", last_name="Prueba", birth_date=date(1985, 1, 1), age=40,
+            profession_id=1, address="Calle 1 # 2-3, Cali", phone="3000000000"
+        )
+        db.add(person)
+        db.commit()
+        person_id = person.id
+    finally:
+        db.close()
+    yield person_id
+    db = SessionLocal()
+    try:
+        person = db.get(Person, person_id)
+        if person is not None:
+            db.delete(person)
+            db.commit()
+    finally:
+        db.close()
+
+
+def stored(person_id: int) -> Person:
+    db = SessionLocal()
+    try:
+        return db.get(Person, person_id)
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("method,data", [
+    ("put", {**PERSON_FORM, "profession_id": "9999"}),
+    ("patch", {"profession_id": "9999"}),
+    ("patch", {"profession_id": "9999", "phone": "3111111111"}),
+])
+def test_update_rejects_unknown_profession(client, person_id, method, data):
+    response = getattr(client, method)(f"/api/v1/persons/{person_id}", data=data)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Profesión no encontrada: 9999"
+    person = stored(person_id)
+    assert (person.profession_id, person.phone, person.first_name) == (1, "3000000000", "Temporal")
+
+
+@pytest.mark.parametrize("method,data", [
+    ("put", {**PERSON_FORM, "profession_id": "2"}),
+    ("patch", {"profession_id": "2"}),
+])
+def test_update_changes_to_existing_profession(client, person_id, method, data):
+    response = getattr(client, method)(f"/api/v1/persons/{person_id}", data=data)
+    assert response.status_code == 200, response.text
+    assert stored(person_id).profession_id == 2
@@ -0,0 +1,149 @@
+"""
+Servicio de fotos en /uploads: caché inmutable, ETag fuerte, 304 y peticiones Range
+"""
+import hashlib
+import io
+import os
+import uuid
+
+import pytest
+from PIL import Image
+
+from app.core.photo_files import PHOTO_CACHE_CONTROL, parse_byte_range
+from app.services.file_service import TEMP_DIR
+
+UPLOAD_DIR = "uploads"
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+@pytest.fixture
+def photo(client):
+    """
+    (URL, contenido) de una foto subida con una persona
+    """
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), (90, 20, 160)).save(buffer, "PNG")
+    content = buffer.getvalue()
+    person_id = client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.png", content, "image/png")}).json()["id"]
+    yield client.get(f"/api/v1/persons/{person_id}").json()["photo_url"], content
+    client.delete(f"/api/v1/persons/{person_id}")
+
+
+def test_full_response_headers(client, photo):
+    url, content = photo
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["cache-control"] == PHOTO_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{hashlib.sha256(content).hexdigest()}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(content))
+    assert "last-modified" in response.headers
+
+
+@pytest.mark.parametrize("if_none_match,status", [
+    (lambda etag: etag, 304),
+    (lambda etag: f"W/{etag}", 304),
+    (lambda etag: f'"otro", {etag}', 304),
+    (lambda etag: "*", 304),
+    (lambda etag: '"otro"', 200),
+])
+def test_conditional_get(client, photo, if_none_match, status):
+    url, _ = photo
+    etag = client.get(url).headers["etag"]
+    response = client.get(url, headers={"If-None-Match": if_none_match(etag)})
+    assert response.status_code == status
+    if status == 304:
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == PHOTO_CACHE_CONTROL
+
+
+@pytest.mark.parametrize("header,start,end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=10-", 10, None),
+    ("bytes=-16", -16, None),
+    ("bytes=5-999999", 5, None),
+])
+def test_range_requests(client, photo, header, start, end):
+    url, content = photo
+    response = client.get(url, headers={"Range": header})
+    expected = content[start:end + 1 if end is not None else None]
+    first = start if start >= 0 else len(content) + start
+    assert response.status_code == 206
+    assert response.content == expected
+    assert response.headers["content-length"] == str(len(expected))
+    assert response.headers["content-range"] == f"bytes {first}-{first + len(expected) - 1}/{len(content)}"
+
+
+@pytest.mark.parametrize("header", ["bytes=0-1,4-5", "bytes=9-2", "items=0-1", "bytes=-"])
+def test_unsupported_ranges_return_full_file(client, photo, header):
+    url, content = photo
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 200
+    assert response.content == content
+
+
+def test_unsatisfiable_range(client, photo):
+    url, content = photo
+    response = client.get(url, headers={"Range": f"bytes={len(content)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+
+def test_if_range_with_stale_etag_returns_full_file(client, photo):
+    url, content = photo
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"anterior"'})
+    assert response.status_code == 200
+    assert response.content == content
+
+
+def test_head_returns_headers_only(client, photo):
+    url, content = photo
+    response = client.head(url)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(content))
+
+
+def test_legacy_photo_etag_uses_mtime_and_size(client):
+    name = f"{uuid.uuid4().hex}.png"
+    path = os.path.join(UPLOAD_DIR, name)
+    with open(path, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n" + b"0" * 32)
+    try:
+        stat_result = os.stat(path)
+        etag = client.get(f"/uploads/{name}").headers["etag"]
+        assert etag == f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    finally:
+        os.remove(path)
+
+
+def test_temporary_uploads_are_not_served(client):
+    name = uuid.uuid4().hex
+    path = os.path.join(UPLOAD_DIR, TEMP_DIR, name)
+    with open(path, "wb") as file:
+        file.write(b"subida en curso")
+    try:
+        assert client.get(f"/uploads/{TEMP_DIR}/{name}").status_code == 404
+    finally:
+        os.remove(path)
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("bytes=0-0", 10) == (0, 0)
+    assert parse_byte_range("bytes=-0", 10) == (10, 10)
+    assert parse_byte_range("bytes=-20", 10) == (0, 9)
+    assert parse_byte_range("bytes=12-", 10)[0] >= 10
+    assert parse_byte_range(" bytes=3-4 ", 10) == (3, 4)
+    assert parse_byte_range("bytes=a-b", 10) is None
+    assert parse_byte_range("bytes=0-1, 3-4", 10) is None
@@ -0,0 +1,225 @@
+"""
+Subida de fotos: validación por firma y tamaño, derivadas WebP y almacenamiento por contenido
+"""
+import hashlib
+import io
+import os
+import uuid
+from datetime import date
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.jobs.generate_photo_variants import generate_photo_variants
+from app.models.person import Person
+from app.models.photo_file import PhotoFile
+from app.services.file_service import TEMP_DIR
+
+UPLOAD_DIR = "uploads"
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+def image_bytes(image_format: str, size=(300, 200), color=(30, 120, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def create_with_photo(client, content: bytes, filename: str = "foto.png", content_type: str = "image/png"):
+    return client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": (filename, content, content_type)})
+
+
+@pytest.fixture
+def temp_files():
+    """
+    Archivos en uploads/tmp antes de la prueba; ninguna subida debe dejar temporales
+    """
+    before = set(os.listdir(os.path.join(UPLOAD_DIR, TEMP_DIR)))
+    yield before
+    assert set(os.listdir(os.path.join(UPLOAD_DIR, TEMP_DIR))) == before
+
+
+@pytest.mark.parametrize("image_format,extension", [("JPEG", ".jpg"), ("PNG", ".png"), ("WEBP", ".webp")])
+def test_extension_comes_from_content_signature(client, temp_files, image_format, extension):
+    # El nombre y el tipo declarado no deciden la extensión: se usa la firma del contenido
+    content = image_bytes(image_format, color=(len(extension), 40, 80))
+    response = create_with_photo(client, content, filename="foto.gif", content_type="image/jpeg")
+    assert response.status_code == 200, response.text
+    person = client.get(f"/api/v1/persons/{response.json()['id']}").json()
+    try:
+        assert person["photo_url"].endswith(extension)
+        with open(person["photo_url"].lstrip("/"), "rb") as stored:
+            assert stored.read() == content
+    finally:
+        client.delete(f"/api/v1/persons/{person['id']}")
+
+
+@pytest.mark.parametrize("content,content_type,detail", [
+    (b"GIF89a" + b"\x00" * 100, "image/png", "El contenido del archivo no es una imagen válida."),
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", "image/webp", "El contenido del archivo no es una imagen válida."),
+    (b"<svg xmlns='http://www.w3.org/2000/svg'/>", "image/png", "El contenido del archivo no es una imagen válida."),
+    (b"", "image/png", "El contenido del archivo no es una imagen válida."),
+    (b"\x89PNG\r\n\x1a\n", "application/pdf", "Tipo de archivo no permitido. Solo se permiten imágenes."),
+], ids=["gif", "riff-no-webp", "svg", "empty", "content-type"])
+def test_rejects_content_without_allowed_signature(client, temp_files, content, content_type, detail):
+    total = len(client.get("/api/v1/persons/?limit=1000").json())
+    response = create_with_photo(client, content, content_type=content_type)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert len(client.get("/api/v1/persons/?limit=1000").json()) == total
+
+
+def test_rejects_oversized_photo_while_copying(client, temp_files, monkeypatch):
+    # La firma es válida; el límite se aplica al copiar aunque el cliente no declare el tamaño
+    monkeypatch.setattr(settings, "max_file_size", 64 * 1024)
+    response = create_with_photo(client, b"\xff\xd8\xff" + b"0" * (64 * 1024 + 1), content_type="image/jpeg")
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("El archivo es muy grande.")
+
+
+def test_upload_generates_webp_variants(client):
+    response = create_with_photo(client, image_bytes("PNG", size=(600, 400), color=(10, 200, 90)))
+    person = client.get(f"/api/v1/persons/{response.json()['id']}").json()
+    try:
+        assert set(person["photo_variants"]) == {str(size) for size in settings.photo_variant_sizes}
+        for size, url in person["photo_variants"].items():
+            variant = client.get(url)
+            assert variant.headers["content-type"] == "image/webp"
+            with Image.open(io.BytesIO(variant.content)) as image:
+                # Conserva la proporción y el lado mayor no supera el tamaño (ni el original)
+                assert max(image.size) == min(int(size), 600)
+                assert abs(image.size[0] / image.size[1] - 1.5) < 0.05
+    finally:
+        client.delete(f"/api/v1/persons/{person['id']}")
+
+
+def test_reupload_generates_variants_for_new_sizes(client, monkeypatch):
+    content = image_bytes("PNG", color=(200, 10, 90))
+    first = create_with_photo(client, content).json()
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(settings, "photo_variant_sizes_raw", "64,128")
+            second = create_with_photo(client, content).json()
+            person = client.get(f"/api/v1/persons/{second['id']}").json()
+            client.delete(f"/api/v1/persons/{second['id']}")
+        assert set(person["photo_variants"]) == {"64", "128"}
+        variant = person["photo_variants"]["128"].lstrip("/")
+        assert os.path.exists(variant)
+        os.remove(variant)
+    finally:
+        client.delete(f"/api/v1/persons/{first['id']}")
+
+
+@pytest.fixture
+def legacy_photo_person():
+    """
+    Persona con una foto anterior a las derivadas (uploads/<uuid>.png, sin tamaños registrados)
+    """
+    name = f"{uuid.uuid4().hex}.png"
+    with open(os.path.join(UPLOAD_DIR, name), "wb") as file:
+        file.write(image_bytes("PNG", color=(5, 5, 250)))
+    db = SessionLocal()
+    try:
+        person = Person(
+            first_name="Antigua", last_name="Foto", birth_date=date(1980, 2, 2), age=45, profession_id=1,
+            address="Calle 1 # 2-3, Cali", phone="3000000000", photo_url=f"/uploads/{name}"
+        )
+        db.add(person)
+        db.commit()
+        return person.id
+    finally:
+        db.close()
+
+
+def test_variants_published_only_after_generation(client, legacy_photo_person):
+    person = client.get(f"/api/v1/persons/{legacy_photo_person}").json()
+    try:
+        assert person["photo_variants"] is None
+        assert client.get(person["photo_url"]).status_code == 200
+
+        db = SessionLocal()
+        try:
+            result = generate_photo_variants(db, UPLOAD_DIR)
+        finally:
+            db.close()
+        assert result["failed"] == []
+
+        person = client.get(f"/api/v1/persons/{legacy_photo_person}").json()
+        assert set(person["photo_variants"]) == {str(size) for size in settings.photo_variant_sizes}
+        assert all(client.get(url).status_code == 200 for url in person["photo_variants"].values())
+    finally:
+        client.delete(f"/api/v1/persons/{legacy_photo_person}")
+    assert client.get(person["photo_url"]).status_code == 404
+
+
+def ref_count(sha256: str):
+    db = SessionLocal()
+    try:
+        photo = db.get(PhotoFile, sha256)
+        return photo.ref_count if photo is not None else None
+    finally:
+        db.close()
+
+
+def test_photo_stored_by_sha256_in_sharded_directories(client):
+    content = image_bytes("PNG", color=(1, 2, 3))
+    sha256 = hashlib.sha256(content).hexdigest()
+    person_id = create_with_photo(client, content).json()["id"]
+    try:
+        photo_url = client.get(f"/api/v1/persons/{person_id}").json()["photo_url"]
+        assert photo_url == f"/uploads/{sha256[:2]}/{sha256[2:4]}/{sha256}.png"
+        assert ref_count(sha256) == 1
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+    assert ref_count(sha256) is None
+
+
+def test_duplicate_photos_share_one_file_until_last_reference(client):
+    content = image_bytes("PNG", color=(4, 5, 6))
+    sha256 = hashlib.sha256(content).hexdigest()
+    ids = [create_with_photo(client, content, filename=f"copia{i}.png").json()["id"] for i in range(3)]
+    persons = [client.get(f"/api/v1/persons/{person_id}").json() for person_id in ids]
+    path = persons[0]["photo_url"].lstrip("/")
+    variants = [url.lstrip("/") for url in persons[0]["photo_variants"].values()]
+
+    assert {person["photo_url"] for person in persons} == {persons[0]["photo_url"]}
+    assert ref_count(sha256) == 3
+    assert len([name for name in os.listdir(os.path.dirname(path)) if name.startswith(sha256)]) == 1
+
+    client.delete(f"/api/v1/persons/{ids[0]}")
+    assert client.post("/api/v1/persons/bulk/delete", json={"ids": ids[1:2]}).json()["affected"] == 1
+    assert ref_count(sha256) == 1
+    assert os.path.exists(path) and all(os.path.exists(variant) for variant in variants)
+
+    client.delete(f"/api/v1/persons/{ids[2]}")
+    assert ref_count(sha256) is None
+    assert not os.path.exists(path)
+    assert not any(os.path.exists(variant) for variant in variants)
+
+
+def test_replacing_a_photo_releases_the_previous_reference(client):
+    old_content, new_content = image_bytes("PNG", color=(7, 8, 9)), image_bytes("JPEG", color=(9, 8, 7))
+    old_sha, new_sha = hashlib.sha256(old_content).hexdigest(), hashlib.sha256(new_content).hexdigest()
+    person_id = create_with_photo(client, old_content).json()["id"]
+    try:
+        # Subir otra vez la misma foto no suma referencias
+        response = client.patch(f"/api/v1/persons/{person_id}", files={"photo": ("igual.png", old_content, "image/png")})
+        assert response.status_code == 200, response.text
+        assert ref_count(old_sha) == 1
+
+        response = client.patch(f"/api/v1/persons/{person_id}", files={"photo": ("nueva.jpg", new_content, "image/jpeg")})
+        assert response.status_code == 200, response.text
+        assert (ref_count(old_sha), ref_count(new_sha)) == (None, 1)
+        assert client.get(f"/api/v1/persons/{person_id}").json()["photo_url"].endswith(f"{new_sha}.jpg")
+    finally:
+        client.delete(f"/api/v1/persons/{person_id}")
+    assert ref_count(new_sha) is None
@@ -0,0 +1,256 @@
+"""
+Presupuestos de consultas SQL por endpoint
+
+Cada caso ejecuta un endpoint contra la base sembrada y falla si emite más sentencias
+que su presupuesto, listando las sentencias ejecutadas. Si un cambio reduce las consultas,
+baje el presupuesto; si las aumenta a propósito, súbalo de forma explícita en este archivo.
+"""
+import io
+import json
+from datetime import date
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.person import Person
+from app.models.profession import Profession
+
+PERSON_FORM = {
+    "first_name": "Laura",
+    "last_name": "Gómez",
+    "birth_date": "1990-04-12",
+    "profession_id": "1",
+    "address": "Carrera 7 # 45-10, Bogotá",
+    "phone": "3109876543",
+}
+
+
+def create_person() -> int:
+    db = SessionLocal()
+    try:
+        person = Person(
+            first_name="Temporal", last_name="Prueba", birth_date=date(1985, 1, 1), age=40,
+            profession_id=1, address="Calle 1 # 2-3, Cali", phone="3000000000"
+        )
+        db.add(person)
+        db.commit()
+        return person.id
+    finally:
+        db.close()
+
+
+def create_profession(name: str) -> int:
+    db = SessionLocal()
+    try:
+        profession = Profession(name=name)
+        db.add(profession)
+        db.commit()
+        return profession.id
+    finally:
+        db.close()
+
+
+def assert_budget(queries, budget: int, response, expected_status: int = 200):
+    assert response.status_code == expected_status, response.text
+    assert queries.count <= budget, (
+        f"Se ejecutaron {queries.count} sentencias SQL, el presupuesto es {budget}:\n{queries.report()}"
+    )
+
+
+READ_BUDGETS = [
+    ("persons_list", "/api/v1/persons/?limit=20", 1),
+    ("persons_list_filtered", "/api/v1/persons/?profession_id=2&min_age=20&max_age=60&sort=-birth_date", 1),
+    ("persons_list_cursor", "/api/v1/persons/?cursor=true&limit=10", 1),
+    ("persons_list_fields", "/api/v1/persons/?fields=first_name,age", 1),
+    ("persons_detail", "/api/v1/persons/1", 1),
+    ("persons_detail_fields", "/api/v1/persons/1?fields=first_name,profession_name", 1),
+    ("persons_export_csv", "/api/v1/persons/export?format=csv", 1),
+    ("persons_dashboard", "/api/v1/persons/stats/dashboard", 3),
+    ("professions_list", "/api/v1/professions/", 2),
+    ("professions_all", "/api/v1/professions/all", 1),
+    ("professions_search", "/api/v1/professions/search?query=prof", 1),
+    ("professions_detail", "/api/v1/professions/1", 1),
+]
+
+
+@pytest.mark.parametrize("name,url,budget", READ_BUDGETS, ids=[case[0] for case in READ_BUDGETS])
+def test_read_endpoint_query_budget(client, queries, name, url, budget):
+    with queries.record():
+        response = client.get(url)
+    assert_budget(queries, budget, response)
+
+
+def test_list_does_not_grow_with_page_size(client, queries):
+    # Detecta N+1: la cantidad de consultas no debe depender del número de filas
+    with queries.record():
+        small = client.get("/api/v1/persons/?limit=2")
+    small_count = queries.count
+    with queries.record():
+        large = client.get("/api/v1/persons/?limit=30")
+    assert small.status_code == large.status_code == 200
+    assert queries.count == small_count, queries.report()
+
+
+def test_create_person_query_budget(client, queries):
+    # INSERT ... RETURNING y tres upserts de resumen
+    with queries.record():
+        response = client.post("/api/v1/persons/", data=PERSON_FORM)
+    assert_budget(queries, 4, response)
+
+
+def test_update_person_query_budget(client, queries):
+    # Cambia la fecha de nacimiento: lectura con bloqueo, UPDATE y ajuste del resumen
+    person_id = create_person()
+    with queries.record():
+        response = client.put(f"/api/v1/persons/{person_id}", data=PERSON_FORM)
+    assert_budget(queries, 4, response)
+
+
+def test_patch_person_query_budget(client, queries):
+    # Sin cambios en profesión ni fecha de nacimiento basta un solo UPDATE condicionado
+    person_id = create_person()
+    with queries.record():
+        response = client.patch(f"/api/v1/persons/{person_id}", data={"phone": "3111111111"})
+    assert_budget(queries, 1, response)
+
+
+def test_patch_person_without_changes_query_budget(client, queries):
+    # UPDATE condicionado que no afecta filas y la lectura que confirma que no hay cambios
+    person_id = create_person()
+    with queries.record():
+        response = client.patch(f"/api/v1/persons/{person_id}", data={"phone": "3000000000"})
+    assert_budget(queries, 2, response)
+
+
+def test_create_person_with_photo_query_budget(client, queries):
+    # Una referencia en photo_files más la creación; las derivadas WebP se generan en el pool de procesos
+    photo = io.BytesIO()
+    Image.new("RGB", (600, 400), (30, 120, 200)).save(photo, "PNG")
+    with queries.record():
+        response = client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.png", photo.getvalue(), "image/png")})
+    assert_budget(queries, 5, response)
+    client.delete(f"/api/v1/persons/{response.json()['id']}")
+
+
+def test_photo_serving_query_budget(client, queries):
+    # Las fotos se sirven desde disco sin consultas, también las respuestas 304 y Range
+    photo = io.BytesIO()
+    Image.new("RGB", (300, 200), (90, 20, 160)).save(photo, "PNG")
+    person = client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.png", photo.getvalue(), "image/png")}).json()
+    photo_url = client.get(f"/api/v1/persons/{person['id']}").json()["photo_url"]
+
+    with queries.record():
+        full = client.get(photo_url)
+        not_modified = client.get(photo_url, headers={"If-None-Match": full.headers["etag"]})
+        partial = client.get(photo_url, headers={"Range": "bytes=0-9"})
+    assert [full.status_code, not_modified.status_code, partial.status_code] == [200, 304, 206]
+    assert queries.count == 0, queries.report()
+    client.delete(f"/api/v1/persons/{person['id']}")
+
+
+@pytest.mark.parametrize("content", [b"no es una imagen", b"\xff\xd8\xff" + b"0" * (64 * 1024 + 1)], ids=["invalid", "oversized"])
+def test_rejected_photo_query_budget(client, queries, monkeypatch, content):
+    # La foto se valida al copiarla (firma y tamaño) antes de tocar la base de datos
+    monkeypatch.setattr(settings, "max_file_size", 64 * 1024)
+    with queries.record():
+        response = client.post("/api/v1/persons/", data=PERSON_FORM, files={"photo": ("foto.jpg", content, "image/jpeg")})
+    assert_budget(queries, 0, response, expected_status=400)
+
+
+def test_delete_person_query_budget(client, queries):
+    person_id = create_person()
+    with queries.record():
+        response = client.delete(f"/api/v1/persons/{person_id}")
+    assert_budget(queries, 4, response)
+
+
+@pytest.mark.parametrize("size", [5, 500])
+def test_batch_create_query_budget(client, queries, size):
+    # Profesiones, un INSERT ... RETURNING de varias filas y tres upserts de resumen, sin importar el tamaño
+    batch = [dict(PERSON_FORM, first_name=f"Lote{i}", profession_id=i % 3 + 1) for i in range(size)]
+    with queries.record():
+        response = client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(batch)})
+    assert_budget(queries, 5, response)
+    assert len(response.json()) == size
+
+
+def test_batch_create_rejects_invalid_rows_without_queries(client, queries):
+    batch = [PERSON_FORM, dict(PERSON_FORM, phone="123")]
+    with queries.record():
+        response = client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(batch)})
+    assert_budget(queries, 0, response, expected_status=400)
+
+
+def test_create_profession_query_budget(client, queries):
+    with queries.record():
+        response = client.post("/api/v1/professions/", json={"name": "Bacteriólogo"})
+    assert_budget(queries, 3, response, expected_status=201)
+
+
+def test_update_profession_query_budget(client, queries):
+    profession_id = create_profession("TEMPORAL ACTUALIZAR")
+    with queries.record():
+        response = client.put(f"/api/v1/professions/{profession_id}", json={"name": "Temporal Actualizada"})
+    assert_budget(queries, 4, response)
+
+
+def test_delete_profession_query_budget(client, queries):
+    profession_id = create_profession("TEMPORAL ELIMINAR")
+    with queries.record():
+        response = client.delete(f"/api/v1/professions/{profession_id}")
+    assert_budget(queries, 3, response, expected_status=204)
+
+
+def import_csv(rows: int) -> bytes:
+    lines = ["first_name,last_name,birth_date,profession,address,phone"]
+    lines += [f"Importada{i},Prueba,1992-03-{i % 28 + 1:02d},profesion {i % 3 + 1},Calle {i} # 4-5,3201234567" for i in range(rows)]
+    lines.append("X,Prueba,1992-13-01,SIN PROFESION,Calle 1 # 4-5,3201234567")
+    return "\n".join(lines).encode("utf-8")
+
+
+@pytest.mark.parametrize("rows", [5, 500])
+def test_import_query_budget(client, queries, rows):
+    # El cliente de pruebas ejecuta la importación antes de retornar: registro, inicio, mapa de
+    # profesiones, por bloque un INSERT ... RETURNING, tres upserts de resumen y el avance, y el cierre
+    with queries.record():
+        response = client.post("/api/v1/persons/import", files={"file": ("personas.csv", import_csv(rows), "text/csv")})
+    assert_budget(queries, 9, response, expected_status=202)
+
+    with queries.record():
+        response = client.get(f"/api/v1/persons/import/{response.json()['job_id']}")
+    assert_budget(queries, 1, response)
+
+
+@pytest.mark.parametrize("rows", [5, 500])
+def test_ingest_query_budget(client, queries, rows):
+    # Mapa de profesiones y, por bloque de INGEST_COMMIT_ROWS líneas, un INSERT ... RETURNING y tres upserts de resumen
+    lines = [json.dumps(dict(PERSON_FORM, first_name=f"Ingesta{i}", profession_id=i % 3 + 1)) for i in range(rows)]
+    lines.append(json.dumps(dict(PERSON_FORM, phone="123")))
+    with queries.record():
+        response = client.post("/api/v1/persons/ingest", content="\n".join(lines).encode("utf-8"),
+                               headers={"Content-Type": "application/x-ndjson"})
+    assert_budget(queries, 5, response)
+
+
+@pytest.mark.parametrize("size", [5, 500])
+def test_bulk_update_query_budget(client, queries, size):
+    # Profesión, conteo agrupado con bloqueo, un UPDATE y el upsert del resumen por profesión, sin importar el tamaño
+    batch = [dict(PERSON_FORM, first_name=f"Masivo{i}", profession_id=i % 3 + 1) for i in range(size)]
+    ids = [person["id"] for person in client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(batch)}).json()]
+    with queries.record():
+        response = client.post("/api/v1/persons/bulk/update", json={"ids": ids, "values": {"profession_id": 4}})
+    assert_budget(queries, 4, response)
+    assert response.json()["affected"] == size
+
+
+@pytest.mark.parametrize("size", [5, 500])
+def test_bulk_delete_query_budget(client, queries, size):
+    # Un DELETE ... RETURNING y tres upserts de resumen, sin importar el tamaño
+    batch = [dict(PERSON_FORM, first_name=f"Borrar{i}") for i in range(size)]
+    ids = [person["id"] for person in client.post("/api/v1/persons/batch", data={"persons_data": json.dumps(batch)}).json()]
+    with queries.record():
+        response = client.post("/api/v1/persons/bulk/delete", json={"ids": ids})
+    assert_budget(queries, 4, response)
+    assert response.json()["affected"] == size
@@ -0,0 +1,92 @@
+"""
+Réplica de lectura: enrutamiento de las lecturas y cookie read-your-writes
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db import database
+from app.db.database import Base, create_async_engine_for
+from app.db.read_your_writes import LAST_WRITE_COOKIE, ReadYourWritesMiddleware, has_recent_write
+from main import app
+
+
+def make_request(cookie: str = None) -> Request:
+    headers = [(b"cookie", f"{LAST_WRITE_COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """
+    Réplica vacía (solo el esquema) en otro archivo SQLite: lo que se lee de ella no ve las escrituras
+    """
+    url = f"sqlite:///{tmp_path}/replica.db"
+    read_engine = create_engine(url)
+    Base.metadata.create_all(read_engine)
+    async_read_engine = create_async_engine_for(url)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=read_engine))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(bind=async_read_engine, class_=AsyncSession, expire_on_commit=False))
+    yield read_engine
+    read_engine.dispose()
+    async_read_engine.sync_engine.dispose()
+
+
+@pytest.mark.parametrize("cookie,expected", [
+    (None, False),
+    ("basura", False),
+    (lambda: f"{time.time():.3f}", True),
+    (lambda: f"{time.time() - settings.read_your_writes_seconds - 1:.3f}", False),
+])
+def test_has_recent_write(cookie, expected):
+    value = cookie() if callable(cookie) else cookie
+    assert has_recent_write(make_request(value)) is expected
+
+
+def test_reads_use_primary_without_replica():
+    assert database.read_engine is database.engine
+    assert database.get_read_session_factory(make_request()) is database.SessionLocal
+
+
+def test_read_session_factory_routes_to_replica_unless_recent_write(replica):
+    assert database.get_read_session_factory(make_request()) is database.ReadSessionLocal
+    assert database.get_read_session_factory(make_request(f"{time.time():.3f}")) is database.SessionLocal
+
+
+def test_reads_go_to_replica_until_client_writes(replica):
+    client = TestClient(ReadYourWritesMiddleware(app))
+    # Las personas sembradas solo existen en el primario
+    assert client.get("/api/v1/persons/1").status_code == 404
+
+    response = client.post("/api/v1/professions/", json={"name": "PROFESION REPLICA"})
+    assert response.status_code == 201
+    assert LAST_WRITE_COOKIE in response.cookies
+    profession_id = response.json()["id"]
+    try:
+        # Con la cookie vigente la lectura va al primario y ve la escritura
+        assert client.get(f"/api/v1/professions/{profession_id}").status_code == 200
+        assert client.get("/api/v1/persons/1").status_code == 200
+
+        client.cookies.clear()
+        assert client.get(f"/api/v1/professions/{profession_id}").status_code == 404
+    finally:
+        client.delete(f"/api/v1/professions/{profession_id}")
+
+
+@pytest.mark.parametrize("method,path,status", [
+    ("GET", "/api/v1/persons/1", 200),
+    ("POST", "/api/v1/professions/", 422),
+    ("GET", "/health", 200),
+])
+def test_cookie_only_set_on_successful_api_writes(method, path, status):
+    client = TestClient(ReadYourWritesMiddleware(app))
+    response = client.request(method, path, json={})
+    assert response.status_code == status
+    assert LAST_WRITE_COOKIE not in response.cookies
@@ -0,0 +1,151 @@
+"""
+Tarea diaria de edades: fechas de cumpleaños por revisar y UPDATE solo de las edades desactualizadas
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.jobs.recompute_ages import JOB_NAME, birthday_windows, recompute_ages
+from app.models.job_run import JobRun
+from app.models.person import Person
+from app.repositories.person_repository import PersonRepository
+
+TODAY = date(2024, 3, 10)
+
+
+def month_days(windows) -> list:
+    return [(month, day) for month, day, _ in windows]
+
+
+def test_first_run_covers_every_date_of_the_year():
+    windows = birthday_windows(None, TODAY)
+    assert len(windows) == 366
+    assert len(set(month_days(windows))) == 366
+    # Cumpleaños ya cumplidos este año usan este año; los que faltan, el anterior
+    assert (3, 10, 2024) in windows and (3, 11, 2023) in windows and (1, 1, 2024) in windows and (12, 31, 2023) in windows
+
+
+@pytest.mark.parametrize("last_run", [date(2023, 3, 10), date(2022, 1, 1)])
+def test_gap_of_a_year_or_more_covers_every_date(last_run):
+    assert birthday_windows(last_run, TODAY) == birthday_windows(None, TODAY)
+
+
+def test_window_since_last_run():
+    assert birthday_windows(date(2024, 3, 7), TODAY) == [(3, 8, 2024), (3, 9, 2024), (3, 10, 2024)]
+    assert birthday_windows(TODAY, TODAY) == []
+
+
+def test_window_crossing_the_year_boundary():
+    assert birthday_windows(date(2023, 12, 29), date(2024, 1, 2)) == [
+        (1, 1, 2024), (1, 2, 2024), (12, 30, 2023), (12, 31, 2023)
+    ]
+
+
+@pytest.mark.parametrize("last_run,today,expected", [
+    # Año bisiesto: el 29 de febrero es su propio día
+    (date(2024, 2, 28), date(2024, 2, 29), [(2, 29, 2024)]),
+    (date(2024, 2, 29), date(2024, 3, 1), [(3, 1, 2024)]),
+    # Año no bisiesto: los nacidos el 29 de febrero cumplen el 1 de marzo
+    (date(2023, 2, 27), date(2023, 2, 28), [(2, 28, 2023)]),
+    (date(2023, 2, 28), date(2023, 3, 1), [(2, 29, 2023), (3, 1, 2023)]),
+])
+def test_leap_day_birthdays(last_run, today, expected):
+    assert birthday_windows(last_run, today) == expected
+
+
+@pytest.mark.parametrize("today", [date(2023, 2, 28), date(2023, 3, 1), date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)])
+def test_leap_day_reference_year_matches_calculate_age(today):
+    reference_year = {(month, day): year for month, day, year in birthday_windows(None, today)}[(2, 29)]
+    assert reference_year - 2000 == PersonRepository.calculate_age(date(2000, 2, 29), today)
+
+
+@pytest.fixture
+def job_state():
+    """
+    Sin registro previo de la tarea; al terminar se eliminan el registro y las personas creadas
+
+    Las pruebas usan una fecha fija, así que al final las edades se recalculan a la fecha real.
+    """
+    db = SessionLocal()
+    db.query(JobRun).delete()
+    db.commit()
+    created = []
+    yield db, created
+    db.rollback()
+    db.query(Person).filter(Person.id.in_(created)).delete(synchronize_session=False)
+    db.commit()
+    recompute_ages(db, full=True)
+    db.query(JobRun).delete()
+    db.commit()
+    db.close()
+
+
+def add_person(db, created: list, birth_date: date, age: int) -> int:
+    person = Person(
+        first_name="Cumple", last_name="Prueba", birth_date=birth_date, age=age,
+        profession_id=1, address="Calle 1 # 2-3, Cali", phone="3000000000"
+    )
+    db.add(person)
+    db.commit()
+    created.append(person.id)
+    return person.id
+
+
+def set_last_run(db, last_run: date) -> None:
+    db.merge(JobRun(name=JOB_NAME, last_run_date=last_run))
+    db.commit()
+
+
+def test_recompute_ages_updates_only_stale_rows(job_state):
+    db, created = job_state
+    # Primero se ponen al día las demás personas que cumplen en la misma fecha
+    set_last_run(db, TODAY - timedelta(days=1))
+    recompute_ages(db, TODAY)
+
+    stale = [add_person(db, created, date(2000, 3, 10), 20), add_person(db, created, date(1990, 3, 10), 1)]
+    current = add_person(db, created, date(2001, 3, 10), 23)
+    not_today = add_person(db, created, date(2000, 3, 11), 5)
+    updated_at = {person.id: person.updated_at for person in db.query(Person).filter(Person.id.in_(created))}
+
+    set_last_run(db, TODAY - timedelta(days=1))
+    result = recompute_ages(db, TODAY, chunk_size=1)
+    assert (result["since"], result["today"], result["birthday_windows"], result["updated"]) == ("2024-03-09", "2024-03-10", 1, 2)
+
+    db.expire_all()
+    persons = {person.id: person for person in db.query(Person).filter(Person.id.in_(created))}
+    assert [persons[person_id].age for person_id in stale + [current, not_today]] == [24, 34, 23, 5]
+    # No es una edición del usuario: updated_at se conserva
+    assert {person_id: person.updated_at for person_id, person in persons.items()} == updated_at
+    assert db.get(JobRun, JOB_NAME).last_run_date == TODAY
+
+
+def test_recompute_ages_rerun_writes_nothing(job_state):
+    db, created = job_state
+    add_person(db, created, date(2000, 3, 10), 20)
+    set_last_run(db, TODAY - timedelta(days=1))
+    assert recompute_ages(db, TODAY)["updated"] >= 1
+
+    # La misma fecha otra vez: ninguna edad distinta
+    assert recompute_ages(db, TODAY)["birthday_windows"] == 0
+    set_last_run(db, TODAY - timedelta(days=1))
+    assert recompute_ages(db, TODAY)["updated"] == 0
+
+
+def test_full_run_ignores_last_run(job_state):
+    db, _ = job_state
+    set_last_run(db, TODAY - timedelta(days=1))
+    result = recompute_ages(db, TODAY, full=True)
+    assert (result["since"], result["birthday_windows"]) == (None, 366)
+
+
+def test_recompute_ages_records_job_run(job_state):
+    db, _ = job_state
+    result = recompute_ages(db, TODAY)
+    assert (result["since"], result["birthday_windows"]) == (None, 366)
+    assert db.get(JobRun, JOB_NAME).last_run_date == TODAY
+
+    result = recompute_ages(db, TODAY + timedelta(days=2))
+    assert (result["since"], result["birthday_windows"]) == ("2024-03-10", 2)
+    db.expire_all()
+    assert db.get(JobRun, JOB_NAME).last_run_date == TODAY + timedelta(days=2)
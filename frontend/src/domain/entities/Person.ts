@@ -22,6 +22,7 @@ export interface Person {
   address: string;
   phone: string;
   photo_url?: string;
+  photo_variants?: Record<string, string>;
   created_at?: string;
   updated_at?: string;
 }
@@ -32,6 +32,23 @@ import { Person } from "../../../domain/entities/Person";
 import { usePersons } from "../../../infrastructure/hooks/usePersons";
 import CustomTablePagination from "../../components/common/CustomTablePagination";
 
+// Uses the 64px WebP variant when available and falls back to the original photo if it fails to load
+const PersonPhotoAvatar: React.FC<{ person: Person }> = ({ person }) => {
+  const [failedVariant, setFailedVariant] = useState<string | null>(null);
+  const variant = person.photo_variants?.['64'];
+  const path = variant && variant !== failedVariant ? variant : person.photo_url;
+
+  return (
+    <Avatar
+      src={path ? `http://localhost:8000${path}` : undefined}
+      imgProps={{ onError: () => { if (variant && path === variant) setFailedVariant(variant); } }}
+      sx={{ width: 40, height: 40 }}
+    >
+      {!person.photo_url && <PersonIcon />}
+    </Avatar>
+  );
+};
+
 const PersonsListPage: React.FC = () => {
   const navigate = useNavigate();
   const { data: persons, isLoading, error, deletePerson, refetch } = usePersons();
@@ -269,16 +286,7 @@ const PersonsListPage: React.FC = () => {
               {paginatedPersons?.map((person: Person) => (
                 <TableRow key={person.id} hover>
                   <TableCell>
-                    <Avatar
-                      src={
-                        person.photo_url
-                          ? `http://localhost:8000${person.photo_url}`
-                          : undefined
-                      }
-                      sx={{ width: 40, height: 40 }}
-                    >
-                      {!person.photo_url && <PersonIcon />}
-                    </Avatar>
+                    <PersonPhotoAvatar person={person} />
                   </TableCell>
                   <TableCell>
                     <Typography variant="body2" fontWeight="medium">